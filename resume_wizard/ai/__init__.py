@@ -9,6 +9,14 @@ from .chains import (
     extract_education
 )
 from .tools import _ResumeParsingTools, _ResumeParserHelper
+from .tool_loop import (
+    ToolLoopResult,
+    arun_tool_loop,
+    final_text,
+    format_tool_event,
+    print_tool_event,
+    run_tool_loop
+)
 
 __all__ = [
     "create_contact_info_chain", 
@@ -20,5 +28,11 @@ __all__ = [
     "create_education_chain",
     "extract_education",
     "_ResumeParsingTools", 
-    "_ResumeParserHelper"
+    "_ResumeParserHelper",
+    "ToolLoopResult",
+    "arun_tool_loop",
+    "final_text",
+    "format_tool_event",
+    "print_tool_event",
+    "run_tool_loop"
 ]
\ No newline at end of file
@@ -4,6 +4,7 @@ from .skills.chain import create_skills_chain, extract_skills
 from .education.chain import create_education_chain, extract_education
 from .experience.chain import create_experience_chain, extract_experience
 from .projects.chain import create_projects_chain, extract_projects
+from .consolidated.chain import create_consolidated_chain, extract_all_sections
 
 __all__ = [
     'extract_contact_info',
@@ -17,5 +18,7 @@ __all__ = [
     'create_experience_chain',
     'extract_experience',
     'create_projects_chain',
-    'extract_projects'
+    'extract_projects',
+    'create_consolidated_chain',
+    'extract_all_sections'
 ]
\ No newline at end of file
@@ -0,0 +1,5 @@
+"""Model settings shared by the section extraction chains."""
+
+# Changing either of these invalidates cached extractions (see resume_wizard.wizard.cache).
+CLAUDE_MODEL = "claude-3-5-sonnet-20241022"
+CLAUDE_MAX_TOKENS = 4096
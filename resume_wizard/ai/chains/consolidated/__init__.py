@@ -0,0 +1,3 @@
+from .chain import create_consolidated_chain, extract_all_sections, aextract_all_sections
+
+__all__ = ["create_consolidated_chain", "extract_all_sections", "aextract_all_sections"] 
@@ -0,0 +1,103 @@
+"""Chain for extracting every resume section in a single conversation."""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from langchain_anthropic.chat_models import ChatAnthropic
+from langchain_core.runnables import RunnablePassthrough
+
+from .._settings import CLAUDE_MODEL, CLAUDE_MAX_TOKENS
+from .tools import create_consolidated_tools, create_consolidated_handlers
+from resume_wizard.ai_helpers.concrete_tools.res_parser import _ResumeParsingTools
+from resume_wizard.ai.tool_loop import ToolEventHook, arun_tool_loop, final_text, run_tool_loop
+
+
+CONSOLIDATED_PROMPT = """You are an expert at analyzing resumes and extracting structured information from them.
+
+Your task is to extract every section of the resume in this one conversation using the provided tools.
+
+Sections and the tools to use:
+1. Contact information
+   - set_contact_info for name, email and phone
+   - set_social_links for LinkedIn and GitHub URLs
+2. Career objective or professional summary
+   - set_objective with the complete objective/summary text
+3. Skills, looking in every section of the resume
+   - add_programming_languages for programming languages
+   - add_technical_skills with skill_type "frameworks", "dev_tools", "databases", "libraries", "cloud_platforms", "methodologies" or "other"
+   - add_soft_skills for soft skills
+4. Education, for each institution
+   - add_education for institution, degree, location, dates and GPA
+   - add_education_details for minors, honors, relevant coursework and other details
+5. Work experience, for each position (most recent first)
+   - add_experience for position, company, description, location, dates and whether it is ongoing
+   - add_experience_details for type, industry, achievements, keywords and technologies
+6. Projects, for each project
+   - add_project for name, description, URL and timeframe
+   - add_project_details for role, team size, status, technologies and keywords
+
+Guidelines:
+- Extract information exactly as it appears in the resume
+- Do not make assumptions or add information that is not explicitly stated
+- Skip a section or field that the resume does not contain
+- Always add an entry's core details before its additional details
+- Call several tools in the same turn whenever they don't depend on each other
+
+Important: Keep calling tools until every section has been saved, then give a brief final summary of what was extracted."""
+
+
+def create_consolidated_chain(
+    api_key: str,
+    parser_tools: _ResumeParsingTools,
+) -> RunnablePassthrough:
+    """Create a chain with every section's tools bound to a single model."""
+    # Create the tools
+    tools = create_consolidated_tools(parser_tools)
+
+    llm = ChatAnthropic(
+        model=CLAUDE_MODEL,
+        anthropic_api_key=api_key,
+        max_tokens=CLAUDE_MAX_TOKENS,
+    )
+
+    # Bind tools to the LLM
+    return llm.bind_tools(tools)
+
+
+def _initial_messages(resume_text: str) -> list[Dict[str, Any]]:
+    return [
+        {"role": "system", "content": CONSOLIDATED_PROMPT},
+        {"role": "user", "content": f"Please extract all information from this resume:\n\n{resume_text}"}
+    ]
+
+
+def extract_all_sections(
+    chain: RunnablePassthrough,
+    resume_text: str,
+    parser_tools: _ResumeParsingTools,
+    on_event: ToolEventHook | None = None
+) -> str:
+    """Extract every resume section from one conversation with the model."""
+    result = run_tool_loop(
+        chain,
+        _initial_messages(resume_text),
+        create_consolidated_handlers(parser_tools),
+        on_event=on_event
+    )
+    return final_text(result, "Consolidated extraction")
+
+
+async def aextract_all_sections(
+    chain: RunnablePassthrough,
+    resume_text: str,
+    parser_tools: _ResumeParsingTools,
+    on_event: ToolEventHook | None = None
+) -> str:
+    """Async version of `extract_all_sections`."""
+    result = await arun_tool_loop(
+        chain,
+        _initial_messages(resume_text),
+        create_consolidated_handlers(parser_tools),
+        on_event=on_event
+    )
+    return final_text(result, "Consolidated extraction")
@@ -0,0 +1,47 @@
+"""Union of every section's tools for single-pass resume extraction."""
+from typing import Dict, Any
+
+from resume_wizard.ai_helpers.concrete_tools.res_parser import _ResumeParsingTools
+from resume_wizard.ai.tool_loop import ToolHandler
+from ..contact_info.tools import create_contact_info_tools, create_contact_info_handlers
+from ..objective.tools import create_objective_tools, create_objective_handlers
+from ..skills.tools import create_skills_tools, create_skills_handlers
+from ..education.tools import create_education_tools, create_education_handlers
+from ..experience.tools import create_experience_tools, create_experience_handlers
+from ..projects.tools import create_project_tools, create_project_handlers
+
+def create_consolidated_tools(parser_tools: _ResumeParsingTools) -> list[Dict[str, Any]]:
+    """Create the combined Claude tools for extracting every section at once.
+    
+    Args:
+        parser_tools: The resume parsing tools instance
+        
+    Returns:
+        list[Dict[str, Any]]: Every section's tool definitions, in section order
+    """
+    return [
+        *create_contact_info_tools(parser_tools),
+        *create_objective_tools(parser_tools),
+        *create_skills_tools(parser_tools),
+        *create_education_tools(parser_tools),
+        *create_experience_tools(parser_tools),
+        *create_project_tools(parser_tools),
+    ]
+
+def create_consolidated_handlers(parser_tools: _ResumeParsingTools) -> Dict[str, ToolHandler]:
+    """Map every section's tool names to the parser tool methods that execute them.
+    
+    Args:
+        parser_tools: The resume parsing tools instance
+        
+    Returns:
+        Dict[str, ToolHandler]: Tool handlers keyed by tool name
+    """
+    return {
+        **create_contact_info_handlers(parser_tools),
+        **create_objective_handlers(parser_tools),
+        **create_skills_handlers(parser_tools),
+        **create_education_handlers(parser_tools),
+        **create_experience_handlers(parser_tools),
+        **create_project_handlers(parser_tools),
+    }
@@ -1,3 +1,3 @@
-from .chain import create_contact_info_chain, extract_contact_info
+from .chain import create_contact_info_chain, extract_contact_info, aextract_contact_info
 
-__all__ = ["create_contact_info_chain", "extract_contact_info"] 
\ No newline at end of file
+__all__ = ["create_contact_info_chain", "extract_contact_info", "aextract_contact_info"] 
\ No newline at end of file
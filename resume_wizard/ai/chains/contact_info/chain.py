@@ -1,15 +1,17 @@
 """Chain for extracting contact information from resumes."""
 from __future__ import annotations
 
-from typing import Any, TYPE_CHECKING
+from typing import Any, TYPE_CHECKING, Dict
 
 from langchain_anthropic.chat_models import ChatAnthropic
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import SystemMessage
 from langchain_core.runnables import RunnablePassthrough
 
-from .tools import create_contact_info_tools
+from .._settings import CLAUDE_MODEL, CLAUDE_MAX_TOKENS
+from .tools import create_contact_info_tools, create_contact_info_handlers
 from resume_wizard.ai_helpers.concrete_tools.res_parser import _ResumeParsingTools
+from resume_wizard.ai.tool_loop import ToolEventHook, arun_tool_loop, final_text, run_tool_loop
 
 
 CONTACT_INFO_PROMPT = """You are an expert at extracting contact information from resumes.
@@ -45,9 +47,9 @@ def create_contact_info_chain(
     
     # Initialize Claude without tools
     llm = ChatAnthropic(
-        model="claude-3-5-sonnet-20241022",
+        model=CLAUDE_MODEL,
         anthropic_api_key=api_key,
-        max_tokens=4096,
+        max_tokens=CLAUDE_MAX_TOKENS,
     )
     
     # Bind tools to the LLM
@@ -60,105 +62,37 @@ def create_contact_info_chain(
     
     return llm_with_tools
 
+def _initial_messages(resume_text: str) -> list[Dict[str, Any]]:
+    return [
+        {"role": "user", "content": f"Please extract contact information from this resume:\n\n{resume_text}"}
+    ]
+
 def extract_contact_info(
     chain: RunnablePassthrough,
     resume_text: str,
-    parser_tools: _ResumeParsingTools
+    parser_tools: _ResumeParsingTools,
+    on_event: ToolEventHook | None = None
 ) -> str:
     """Extract contact information from a resume text."""
-    print("\n=== Starting Contact Info Extraction ===")
-    
-    messages = [
-        {"role": "user", "content": f"Please extract contact information from this resume:\n\n{resume_text}"}
-    ]
-    
-    print("\n=== Initial Message History ===")
-    for msg in messages:
-        print(f"{msg['role'].upper()}: {msg['content'][:100]}...")
-    
-    while True:
-        print("\n=== Getting Next Response ===")
-        response = chain.invoke(messages)
-        
-        print("\n=== Response Details ===")
-        print(f"Stop Reason: {response.response_metadata.get('stop_reason')}")
-        print(f"Content Type: {type(response.content)}")
-        if isinstance(response.content, list):
-            for block in response.content:
-                print(f"Block Type: {block.get('type')}")
-                if block.get('type') == 'text':
-                    print(f"Text: {block['text']}")
-                elif block.get('type') == 'tool_use':
-                    print(f"Tool: {block['name']}")
-                    print(f"Input: {block['input']}")
-                    print(f"Tool Use ID: {block['id']}")
-        
-        # Add assistant's response to messages
-        messages.append({"role": "assistant", "content": response.content})
-        
-        print("\n=== Current Message History ===")
-        for msg in messages:
-            print(f"{msg['role'].upper()}: {str(msg['content'])[:100]}...")
-        
-        # If no more tool calls, we're done
-        if response.response_metadata.get('stop_reason') != "tool_use":
-            print("\n=== Conversation Complete ===")
-            break
-            
-        # Get all tool use blocks
-        tool_uses = [block for block in response.content if block.get('type') == "tool_use"]
-        
-        # Process each tool use
-        for tool_use in tool_uses:
-            print(f"\nTool Use ID from block: {tool_use['id']}")
-            
-            print("\n=== Executing Tool ===")
-            print(f"Tool Name: {tool_use['name']}")
-            print(f"Tool Input: {tool_use['input']}")
-            
-            # Actually execute the tool
-            tool_name = tool_use['name']
-            tool_args = tool_use['input']
-            
-            if tool_name == 'set_contact_info':
-                print("Calling set_contact_info...")
-                # Ensure phone has a default value of None
-                if 'phone' not in tool_args:
-                    tool_args['phone'] = None
-                result = parser_tools.set_contact_info(**tool_args)
-            elif tool_name == 'set_social_links':
-                print("Calling set_social_links...")
-                result = parser_tools.set_social_links(**tool_args)
-            else:
-                result = f"Unknown tool: {tool_name}"
-                
-            print(f"Tool Result: {result}")
-            
-            # Add tool result to messages
-            tool_message = {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "tool_result",
-                        "tool_use_id": tool_use['id'],
-                        "content": result
-                    }
-                ]
-            }
-            messages.append(tool_message)
-            
-            print("\n=== Added Tool Result ===")
-            print(f"Tool Result Message: {tool_message}")
-            print(f"Tool Use ID in result: {tool_message['content'][0]['tool_use_id']}")
-    
-    print("\n=== Final Response ===")
-    if isinstance(response.content, str):
-        print(f"String Content: {response.content}")
-        return response.content
-    else:
-        final_text = next(
-            (block['text'] for block in response.content if block.get('type') == 'text'),
-            None
-        )
-        print(f"Block Content: {final_text}")
-        return final_text
\ No newline at end of file
+    result = run_tool_loop(
+        chain,
+        _initial_messages(resume_text),
+        create_contact_info_handlers(parser_tools),
+        on_event=on_event
+    )
+    return final_text(result, "Contact info extraction")
+
+async def aextract_contact_info(
+    chain: RunnablePassthrough,
+    resume_text: str,
+    parser_tools: _ResumeParsingTools,
+    on_event: ToolEventHook | None = None
+) -> str:
+    """Async version of `extract_contact_info`."""
+    result = await arun_tool_loop(
+        chain,
+        _initial_messages(resume_text),
+        create_contact_info_handlers(parser_tools),
+        on_event=on_event
+    )
+    return final_text(result, "Contact info extraction")
@@ -5,6 +5,7 @@ from langchain_anthropic.chat_models import AnthropicTool
 from pydantic import BaseModel, Field
 
 from resume_wizard.ai_helpers.concrete_tools.res_parser import _ResumeParsingTools
+from resume_wizard.ai.tool_loop import ToolHandler
 
 class ContactInfoInput(BaseModel):
     """Input schema for contact information."""
@@ -58,4 +59,22 @@ def create_contact_info_tools(parser_tools: _ResumeParsingTools) -> list[Dict[st
             "description": "Save the person's LinkedIn and GitHub URLs found in the resume",
             "input_schema": social_schema
         }
-    ]
\ No newline at end of file
+    ]
+
+def create_contact_info_handlers(parser_tools: _ResumeParsingTools) -> Dict[str, ToolHandler]:
+    """Map each contact info tool name to the parser tool method that executes it.
+    
+    Args:
+        parser_tools: The resume parsing tools instance
+        
+    Returns:
+        Dict[str, ToolHandler]: Tool handlers keyed by tool name
+    """
+    def set_contact_info(phone: Optional[str] = None, **kwargs: Any) -> str:
+        # Claude may leave out phone when the resume has none
+        return parser_tools.set_contact_info(phone=phone, **kwargs)
+
+    return {
+        "set_contact_info": set_contact_info,
+        "set_social_links": parser_tools.set_social_links,
+    }
@@ -1,3 +1,3 @@
-from .chain import create_education_chain, extract_education
+from .chain import create_education_chain, extract_education, aextract_education
 
-__all__ = ["create_education_chain", "extract_education"] 
\ No newline at end of file
+__all__ = ["create_education_chain", "extract_education", "aextract_education"] 
\ No newline at end of file
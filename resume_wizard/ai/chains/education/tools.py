@@ -5,6 +5,7 @@ from langchain_anthropic.chat_models import AnthropicTool
 from pydantic import BaseModel, Field
 
 from resume_wizard.ai_helpers.concrete_tools.res_parser import _ResumeParsingTools
+from resume_wizard.ai.tool_loop import ToolHandler
 
 class CoreEducationInput(BaseModel):
     """Input schema for core education details."""
@@ -56,4 +57,18 @@ def create_education_tools(parser_tools: _ResumeParsingTools) -> list[Dict[str,
             "description": "Add additional education details (minors, honors, coursework, etc.)",
             "input_schema": details_schema
         }
-    ] 
\ No newline at end of file
+    ]
+
+def create_education_handlers(parser_tools: _ResumeParsingTools) -> Dict[str, ToolHandler]:
+    """Map each education tool name to the parser tool method that executes it.
+    
+    Args:
+        parser_tools: The resume parsing tools instance
+        
+    Returns:
+        Dict[str, ToolHandler]: Tool handlers keyed by tool name
+    """
+    return {
+        "add_education": parser_tools.add_education,
+        "add_education_details": parser_tools.add_education_details,
+    }
@@ -1,6 +1,7 @@
-from .chain import create_experience_chain, extract_experience
+from .chain import create_experience_chain, extract_experience, aextract_experience
 
 __all__ = [
     'create_experience_chain',
-    'extract_experience'
+    'extract_experience',
+    'aextract_experience'
 ] 
\ No newline at end of file
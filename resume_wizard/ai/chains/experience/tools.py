@@ -1,6 +1,7 @@
 """Tools for extracting experience information from resumes."""
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field
+from resume_wizard.ai.tool_loop import ToolHandler
 
 class CoreExperienceInput(BaseModel):
     """Input schema for core experience details."""
@@ -112,4 +113,18 @@ def create_experience_tools(tools: Any) -> List[Dict[str, Any]]:
                 }
             }
         }
-    ] 
\ No newline at end of file
+    ]
+
+def create_experience_handlers(parser_tools: Any) -> Dict[str, ToolHandler]:
+    """Map each experience tool name to the parser tool method that executes it.
+    
+    Args:
+        parser_tools: The resume parsing tools instance
+        
+    Returns:
+        Dict[str, ToolHandler]: Tool handlers keyed by tool name
+    """
+    return {
+        "add_experience": parser_tools.add_experience,
+        "add_experience_details": parser_tools.add_experience_details,
+    }
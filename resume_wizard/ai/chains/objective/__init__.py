@@ -1,3 +1,3 @@
-from .chain import create_objective_chain, extract_objective
+from .chain import create_objective_chain, extract_objective, aextract_objective
 
-__all__ = ["create_objective_chain", "extract_objective"] 
\ No newline at end of file
+__all__ = ["create_objective_chain", "extract_objective", "aextract_objective"] 
\ No newline at end of file
@@ -5,6 +5,7 @@ from langchain_anthropic.chat_models import AnthropicTool
 from pydantic import BaseModel, Field
 
 from resume_wizard.ai_helpers.concrete_tools.res_parser import _ResumeParsingTools
+from resume_wizard.ai.tool_loop import ToolHandler
 
 class ObjectiveInput(BaseModel):
     """Input schema for objective extraction."""
@@ -35,4 +36,17 @@ def create_objective_tools(parser_tools: _ResumeParsingTools) -> list[Dict[str,
             "description": "Save the career objective or professional summary found in the resume",
             "input_schema": objective_schema
         }
-    ] 
\ No newline at end of file
+    ]
+
+def create_objective_handlers(parser_tools: _ResumeParsingTools) -> Dict[str, ToolHandler]:
+    """Map each objective tool name to the parser tool method that executes it.
+    
+    Args:
+        parser_tools: The resume parsing tools instance
+        
+    Returns:
+        Dict[str, ToolHandler]: Tool handlers keyed by tool name
+    """
+    return {
+        "set_objective": parser_tools.set_objective,
+    }
@@ -1,3 +1,3 @@
-from .chain import create_projects_chain, extract_projects
+from .chain import create_projects_chain, extract_projects, aextract_projects
 
-__all__ = ["create_projects_chain", "extract_projects"] 
\ No newline at end of file
+__all__ = ["create_projects_chain", "extract_projects", "aextract_projects"] 
\ No newline at end of file
@@ -4,6 +4,7 @@ from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field
 
 from resume_wizard.ai_helpers.concrete_tools.res_parser import _ResumeParsingTools
+from resume_wizard.ai.tool_loop import ToolHandler
 
 class CoreProjectInput(BaseModel):
     """Input schema for core project details."""
@@ -83,4 +84,18 @@ def create_project_tools(tools: Any) -> List[Dict[str, Any]]:
                 "parameters": details_schema
             }
         }
-    ] 
\ No newline at end of file
+    ]
+
+def create_project_handlers(parser_tools: Any) -> Dict[str, ToolHandler]:
+    """Map each project tool name to the parser tool method that executes it.
+    
+    Args:
+        parser_tools: The resume parsing tools instance
+        
+    Returns:
+        Dict[str, ToolHandler]: Tool handlers keyed by tool name
+    """
+    return {
+        "add_project": parser_tools.add_project,
+        "add_project_details": parser_tools.add_project_details,
+    }
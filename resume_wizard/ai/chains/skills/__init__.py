@@ -1,3 +1,3 @@
-from .chain import create_skills_chain, extract_skills
+from .chain import create_skills_chain, extract_skills, aextract_skills
 
-__all__ = ["create_skills_chain", "extract_skills"] 
\ No newline at end of file
+__all__ = ["create_skills_chain", "extract_skills", "aextract_skills"] 
\ No newline at end of file
@@ -5,6 +5,7 @@ from langchain_anthropic.chat_models import AnthropicTool
 from pydantic import BaseModel, Field
 
 from resume_wizard.ai_helpers.concrete_tools.res_parser import _ResumeParsingTools
+from resume_wizard.ai.tool_loop import ToolHandler
 
 class LanguagesInput(BaseModel):
     """Input schema for languages extraction."""
@@ -58,4 +59,19 @@ def create_skills_tools(parser_tools: _ResumeParsingTools) -> list[Dict[str, Any
             "description": "Save soft skills found in the resume",
             "input_schema": soft_skills_schema
         }
-    ] 
\ No newline at end of file
+    ]
+
+def create_skills_handlers(parser_tools: _ResumeParsingTools) -> Dict[str, ToolHandler]:
+    """Map each skills tool name to the parser tool method that executes it.
+    
+    Args:
+        parser_tools: The resume parsing tools instance
+        
+    Returns:
+        Dict[str, ToolHandler]: Tool handlers keyed by tool name
+    """
+    return {
+        "add_programming_languages": parser_tools.add_programming_languages,
+        "add_technical_skills": parser_tools.add_technical_skills,
+        "add_soft_skills": parser_tools.add_soft_skills,
+    }
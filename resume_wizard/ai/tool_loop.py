@@ -0,0 +1,209 @@
+"""Reusable Claude tool-use loop shared by every extraction and tailoring chain."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+# A tool handler receives the tool_use block's input as keyword arguments and
+# returns the text sent back to the model as the tool_result.
+ToolHandler = Callable[..., str]
+
+# Called as on_event(event, data) for "response", "tool_call", "tool_result"
+# and "complete" events.
+ToolEventHook = Callable[[str, Dict[str, Any]], None]
+
+DEFAULT_MAX_TURNS = 25
+
+
+@dataclass
+class ToolLoopResult:
+    """Outcome of a tool-use conversation."""
+    final_text: Optional[str]
+    messages: List[Any]
+    turns: int = 0
+    tool_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    hit_max_turns: bool = False
+    errors: List[str] = field(default_factory=list)
+
+
+def format_tool_event(event: str, data: Dict[str, Any]) -> str:
+    """Return a short human-readable line (or lines) describing a tool-loop event."""
+    if event == "response":
+        lines = [f"\nTurn {data['turn']}: stop reason {data['stop_reason']}"]
+        lines.extend(f"Text: {text}" for text in data["text"])
+        return "\n".join(lines)
+    if event == "tool_call":
+        return f"Tool: {data['name']}\nInput: {data['input']}"
+    if event == "tool_result":
+        return f"Tool Result: {data['result']}"
+    if event == "complete":
+        return f"\n=== Conversation Complete ({data['turns']} turns, {data['tool_calls']} tool calls) ==="
+    return f"{event}: {data}"
+
+
+def print_tool_event(event: str, data: Dict[str, Any]) -> None:
+    """Event hook that prints a one-line summary of each event."""
+    print(format_tool_event(event, data))
+
+
+def final_text(result: ToolLoopResult, task: str) -> str:
+    """The loop's final text, or "" if it ended without one.
+
+    A loop cut off at ``max_turns`` usually ends on a tool_use turn with no
+    text. Its tool calls have already updated the parser, so the partial
+    extraction is kept and a warning is printed.
+
+    Args:
+        result: Outcome of `run_tool_loop` or `arun_tool_loop`
+        task: What the loop was doing, for the warning, e.g. "Skills extraction"
+    """
+    if result.hit_max_turns:
+        print(
+            f"Warning: {task} stopped after {result.turns} turns without finishing; "
+            "keeping what was extracted so far"
+        )
+    return result.final_text or ""
+
+
+def run_tool_loop(
+    chain: Any,
+    messages: List[Any],
+    tools: Mapping[str, ToolHandler],
+    *,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    on_event: Optional[ToolEventHook] = None,
+) -> ToolLoopResult:
+    """Invoke ``chain`` until the model stops asking for tools.
+
+    Every tool_use block in a response is dispatched through ``tools`` in the
+    order the model sent them, and all of their results go back to the model in
+    a single user message.
+
+    Args:
+        chain: A tool-bound chat model (anything with ``invoke(messages)``)
+        messages: The conversation so far. Appended to in place.
+        tools: Map of tool name to the handler that executes it
+        max_turns: Maximum number of model calls before giving up
+        on_event: Optional hook called with progress events, e.g. `print_tool_event`
+
+    Returns:
+        ToolLoopResult: The final text, conversation and usage counters
+    """
+    result = ToolLoopResult(final_text=None, messages=messages)
+    while result.turns < max_turns:
+        response = chain.invoke(messages)
+        if not _handle_response(response, tools, result, on_event):
+            break
+    else:
+        result.hit_max_turns = True
+
+    if on_event:
+        on_event("complete", {
+            "turns": result.turns,
+            "tool_calls": result.tool_calls,
+            "hit_max_turns": result.hit_max_turns,
+        })
+    return result
+
+
+async def arun_tool_loop(
+    chain: Any,
+    messages: List[Any],
+    tools: Mapping[str, ToolHandler],
+    *,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    on_event: Optional[ToolEventHook] = None,
+) -> ToolLoopResult:
+    """Async version of `run_tool_loop` that awaits ``chain.ainvoke``.
+
+    Tool handlers are still called synchronously; they only update in-memory
+    parsing state.
+    """
+    result = ToolLoopResult(final_text=None, messages=messages)
+    while result.turns < max_turns:
+        response = await chain.ainvoke(messages)
+        if not _handle_response(response, tools, result, on_event):
+            break
+    else:
+        result.hit_max_turns = True
+
+    if on_event:
+        on_event("complete", {
+            "turns": result.turns,
+            "tool_calls": result.tool_calls,
+            "hit_max_turns": result.hit_max_turns,
+        })
+    return result
+
+
+def _handle_response(
+    response: Any,
+    tools: Mapping[str, ToolHandler],
+    result: ToolLoopResult,
+    on_event: Optional[ToolEventHook],
+) -> bool:
+    """Record a model response, run its tool calls and report whether to continue."""
+    result.turns += 1
+    usage = getattr(response, "usage_metadata", None) or {}
+    result.input_tokens += usage.get("input_tokens", 0)
+    result.output_tokens += usage.get("output_tokens", 0)
+
+    content = response.content
+    blocks = content if isinstance(content, list) else []
+    stop_reason = response.response_metadata.get("stop_reason")
+    result.final_text = content if isinstance(content, str) else next(
+        (block["text"] for block in blocks if block.get("type") == "text"),
+        None
+    )
+    if on_event:
+        on_event("response", {
+            "turn": result.turns,
+            "stop_reason": stop_reason,
+            "text": [block["text"] for block in blocks if block.get("type") == "text"],
+        })
+
+    result.messages.append({"role": "assistant", "content": content})
+
+    tool_uses = [block for block in blocks if block.get("type") == "tool_use"]
+    if stop_reason != "tool_use" or not tool_uses:
+        return False
+
+    tool_results = []
+    for tool_use in tool_uses:
+        tool_results.append({
+            "type": "tool_result",
+            "tool_use_id": tool_use["id"],
+            "content": _call_tool(tool_use, tools, result, on_event),
+        })
+    result.messages.append({"role": "user", "content": tool_results})
+    return True
+
+
+def _call_tool(
+    tool_use: Dict[str, Any],
+    tools: Mapping[str, ToolHandler],
+    result: ToolLoopResult,
+    on_event: Optional[ToolEventHook],
+) -> str:
+    name = tool_use["name"]
+    tool_args = tool_use.get("input") or {}
+    result.tool_calls += 1
+    if on_event:
+        on_event("tool_call", {"name": name, "input": tool_args})
+
+    handler = tools.get(name)
+    if handler is None:
+        output = f"Unknown tool: {name}"
+        result.errors.append(output)
+    else:
+        try:
+            output = str(handler(**tool_args))
+        except Exception as e:
+            output = f"Error: {str(e)}"
+            result.errors.append(f"{name}: {e}")
+
+    if on_event:
+        on_event("tool_result", {"name": name, "result": output})
+    return output
@@ -114,6 +114,24 @@ class _ResumeParserHelper(BaseModel):
         """Add soft skills."""
         self.skills["soft_skills"].extend(skills)
     
+    def merge(self, other: '_ResumeParserHelper') -> None:
+        """Fold the data collected by another helper into this one.
+
+        Used to combine sections that were extracted with their own helpers.
+        """
+        if other.contact_info:
+            self.contact_info = {**self.contact_info, **other.contact_info}
+        for site, url in other.social_links.items():
+            if url:
+                self.social_links[site] = url
+        if other.objective is not None:
+            self.objective = other.objective
+        self.education_entries.extend(other.education_entries)
+        self.experience_entries.extend(other.experience_entries)
+        self.project_entries.extend(other.project_entries)
+        for skill_type, skills in other.skills.items():
+            self.skills.setdefault(skill_type, []).extend(skills)
+
     def build_resume_schema(self) -> ResumeAnalysisSchema:
         """Construct the final ResumeAnalysisSchema from collected data.
         
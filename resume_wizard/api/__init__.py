@@ -1,4 +1,6 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 from dotenv import load_dotenv
 from fastapi import FastAPI
@@ -6,13 +8,29 @@ from fastapi.middleware.cors import CORSMiddleware
 from langchain_openai import OpenAIEmbeddings
 
 from resume_wizard.vectordb.searcher import VectorDBSearcher
+from resume_wizard.vectordb.embedding_cache import CachedEmbeddings
 from resume_wizard.vectordb.manager import VECTOR_DB_DIR, VECTOR_DB_NAME
-from .dependencies import set_searcher
+from resume_wizard.wizard.cache import get_extraction_cache
+from .dependencies import set_searcher, set_ingestion_queue, set_response_cache
+from .jobs import IngestionQueue
+from .response_cache import SearchResponseCache
 from .routes import router
 
 load_dotenv()
 
-app = FastAPI(title="Resume Search API")
+openai_api_key = os.getenv("OPENAI_API_KEY")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the extraction cache before the first upload rather than during it
+    await asyncio.to_thread(get_extraction_cache)
+    await ingestion_queue.start()
+    try:
+        yield
+    finally:
+        await ingestion_queue.stop()
+
+app = FastAPI(title="Resume Search API", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -24,8 +42,7 @@ app.add_middleware(
 )
 
 # Initialize VectorDBSearcher with the same paths used in the manager
-openai_api_key = os.getenv("OPENAI_API_KEY")
-embeddings = OpenAIEmbeddings(api_key=openai_api_key)
+embeddings = CachedEmbeddings(OpenAIEmbeddings(api_key=openai_api_key))
 
 # Use the same path from manager
 searcher = VectorDBSearcher(VECTOR_DB_DIR, VECTOR_DB_NAME, embeddings)
@@ -33,6 +50,14 @@ searcher = VectorDBSearcher(VECTOR_DB_DIR, VECTOR_DB_NAME, embeddings)
 # Set the global searcher instance
 set_searcher(searcher)
 
+# Uploads are ingested by a bounded pool of background workers, which hand
+# each new resume's documents to the searcher so it can be found right away
+ingestion_queue = IngestionQueue(openai_api_key, on_indexed=searcher.add_embedded_documents)
+set_ingestion_queue(ingestion_queue)
+
+# Serialized /search responses, dropped whenever an upload changes the index
+set_response_cache(SearchResponseCache())
+
 # Include router
 app.include_router(
     router,
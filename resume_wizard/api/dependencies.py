@@ -1,9 +1,17 @@
 """Dependencies for FastAPI routes."""
 from resume_wizard.vectordb.searcher import VectorDBSearcher
+from .jobs import IngestionQueue
+from .response_cache import SearchResponseCache
 
 # Global searcher instance
 _searcher: VectorDBSearcher | None = None
 
+# Global ingestion queue instance
+_ingestion_queue: IngestionQueue | None = None
+
+# Global search response cache instance
+_response_cache: SearchResponseCache | None = None
+
 def set_searcher(searcher: VectorDBSearcher):
     """Set the global searcher instance."""
     global _searcher
@@ -13,4 +21,26 @@ async def get_searcher() -> VectorDBSearcher:
     """Dependency to get VectorDBSearcher instance."""
     if _searcher is None:
         raise RuntimeError("Searcher not initialized")
-    return _searcher 
\ No newline at end of file
+    return _searcher
+
+def set_ingestion_queue(queue: IngestionQueue):
+    """Set the global ingestion queue instance."""
+    global _ingestion_queue
+    _ingestion_queue = queue
+
+async def get_ingestion_queue() -> IngestionQueue:
+    """Dependency to get the IngestionQueue instance."""
+    if _ingestion_queue is None:
+        raise RuntimeError("Ingestion queue not initialized")
+    return _ingestion_queue
+
+def set_response_cache(cache: SearchResponseCache):
+    """Set the global search response cache instance."""
+    global _response_cache
+    _response_cache = cache
+
+async def get_response_cache() -> SearchResponseCache:
+    """Dependency to get the SearchResponseCache instance."""
+    if _response_cache is None:
+        raise RuntimeError("Response cache not initialized")
+    return _response_cache
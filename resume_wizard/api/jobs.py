@@ -0,0 +1,350 @@
+"""Background queue that ingests uploaded resumes outside the request cycle.
+
+`/api/upload` stages the PDF (see `stage_upload`), enqueues an
+`IngestionJob` and returns its id. A fixed number of worker tasks run the
+async resume wizard on the staged file and then add the result to the vector
+database, moving the file into RESUMES_DIR under its name just before it is
+logged. Clients poll `/api/jobs/{id}` or follow
+`/api/jobs/{id}/events` for progress.
+
+Backpressure comes from two bounds: ``max_workers`` caps how many resumes are
+being extracted (and so how many model conversations are open) at once, and
+``max_pending`` caps how many jobs may wait in line. When the line is full
+`submit` raises `QueueFullError` and the route answers 429.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import shutil
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+from resume_wizard.globals import RESUMES_DIR
+from resume_wizard.vectordb.manager import VectorDBManager
+from resume_wizard.wizard.rezwiz import SECTIONS, astream_resume_wizard
+
+DEFAULT_INGEST_WORKERS = int(os.getenv("RESUME_WIZARD_INGEST_WORKERS", "2"))
+DEFAULT_INGEST_MAX_PENDING = int(os.getenv("RESUME_WIZARD_INGEST_MAX_PENDING", "32"))
+
+# Finished jobs kept for status lookups before the oldest are forgotten
+DEFAULT_FINISHED_JOBS_KEPT = 1000
+
+# Status events kept per job; older ones are dropped, so a late follower
+# only sees the most recent ones
+DEFAULT_MAX_JOB_EVENTS = int(os.getenv("RESUME_WIZARD_MAX_JOB_EVENTS", "200"))
+
+# Uploads wait here, relative to RESUMES_DIR, until they are logged, so a
+# failed upload never replaces a resume that is already indexed
+UPLOADS_DIR = ".uploads"
+
+JOB_STATES = ("queued", "extracting", "indexing", "succeeded", "failed")
+
+# Called with the documents and vectors a job added to the index
+IndexedHook = Callable[[List[Document], np.ndarray], None]
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while ``max_pending`` jobs are already waiting."""
+
+
+@dataclass
+class IngestionJob:
+    """State of one resume ingestion."""
+    id: str
+    filename: str
+    # Where the upload waits, relative to RESUMES_DIR; None if it is already
+    # saved as ``filename``
+    upload: Optional[str] = None
+    state: str = "queued"
+    sections_done: int = 0
+    sections_total: int = len(SECTIONS)
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    # SSE payloads, {"status": ...} or {"error": ...}, in the order they
+    # happened; only the last ``max_job_events`` are kept
+    events: List[Dict[str, str]] = field(default_factory=list)
+    events_dropped: int = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ("succeeded", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the job's status without its event log."""
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "state": self.state,
+            "progress": {
+                "sections_done": self.sections_done,
+                "sections_total": self.sections_total,
+            },
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class IngestionQueue:
+    """Bounded asyncio worker pool for resume ingestion.
+
+    Must be started from the running event loop with `start` and stopped with
+    `stop`; the API does both in its lifespan handler.
+    """
+
+    def __init__(
+        self,
+        openai_api_key: Optional[str],
+        *,
+        max_workers: int = DEFAULT_INGEST_WORKERS,
+        max_pending: int = DEFAULT_INGEST_MAX_PENDING,
+        finished_jobs_kept: int = DEFAULT_FINISHED_JOBS_KEPT,
+        max_job_events: int = DEFAULT_MAX_JOB_EVENTS,
+        on_indexed: Optional[IndexedHook] = None
+    ):
+        self.openai_api_key = openai_api_key
+        # e.g. `VectorDBSearcher.add_embedded_documents`, so searches see new resumes
+        self.on_indexed = on_indexed
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(1, max_pending)
+        self.finished_jobs_kept = finished_jobs_kept
+        self.max_job_events = max(1, max_job_events)
+
+        self._jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue[IngestionJob]] = None
+        self._workers: List[asyncio.Task] = []
+        self._changed: Optional[asyncio.Condition] = None
+        # Jobs only append to the write-ahead log, which serializes them
+        # itself; compacting the log into the index runs one at a time
+        self._compaction: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Create the queue and launch the worker tasks."""
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._changed = asyncio.Condition()
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"ingest-worker-{i}")
+            for i in range(self.max_workers)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel the workers and wait for a running compaction. Jobs still queued are left unfinished."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._compaction is not None:
+            await asyncio.gather(self._compaction, return_exceptions=True)
+
+    def submit(self, filename: str, upload: Optional[str] = None) -> IngestionJob:
+        """Enqueue a resume for ingestion.
+
+        Args:
+            filename: Name the resume is saved and indexed under in RESUMES_DIR
+            upload: Path of the uploaded PDF relative to RESUMES_DIR (see
+                `stage_upload`). It replaces ``filename`` just before the
+                resume is logged, and is deleted if the job fails. None if
+                the resume is already saved as ``filename``.
+
+        Raises:
+            QueueFullError: If ``max_pending`` jobs are already waiting
+            RuntimeError: If the queue hasn't been started
+        """
+        if self._queue is None:
+            raise RuntimeError("Ingestion queue not started")
+        job = IngestionJob(id=uuid.uuid4().hex, filename=filename, upload=upload)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(
+                f"{self.max_pending} uploads are already waiting to be processed"
+            ) from None
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        """Return a job by id, or None if it is unknown or has been forgotten."""
+        return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and job counts by state."""
+        states = {state: 0 for state in JOB_STATES}
+        for job in self._jobs.values():
+            states[job.state] += 1
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "jobs": states,
+        }
+
+    async def follow(self, job_id: str) -> AsyncGenerator[Dict[str, str], None]:
+        """Yield a job's kept events, then new ones until it finishes.
+
+        Yields nothing for an unknown or forgotten job.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        # Events emitted so far, including dropped ones
+        sent = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(
+                    lambda: job.events_dropped + len(job.events) > sent or job.finished
+                )
+                new_events = job.events[max(0, sent - job.events_dropped):]
+                sent = job.events_dropped + len(job.events)
+                finished = job.finished
+            for event in new_events:
+                yield event
+            if finished:
+                return
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: IngestionJob) -> None:
+        job.started_at = time.time()
+        await self._update(job, state="extracting")
+        try:
+            resume_data = None
+            async for status in astream_resume_wizard(job.upload or job.filename):
+                if status.startswith('{'):
+                    resume_data = json.loads(status)
+                elif status.lstrip().startswith(f"{'='*20} Finished "):
+                    job.sections_done += 1
+                await self._update(job, event={"status": status})
+            job.sections_done = job.sections_total
+
+            if not self.openai_api_key:
+                raise RuntimeError("OpenAI API key not configured")
+
+            await self._update(job, state="indexing", event={"status": "Adding resume to database..."})
+            success = await asyncio.to_thread(self._index, job, resume_data)
+            if not success:
+                raise RuntimeError("Failed to add resume to database")
+            await self._update(
+                job, state="succeeded", event={"status": "✅ Resume added to database successfully!"}
+            )
+            self._maybe_compact()
+        except Exception as e:
+            job.error = str(e)
+            await self._update(job, state="failed", event={"error": str(e)})
+        finally:
+            # Don't leave an upload on disk that never made it into the database
+            if job.upload is not None:
+                discard_upload(job.upload)
+            self._forget_old_jobs()
+
+    def _index(self, job: IngestionJob, resume_data: Optional[Dict[str, Any]]) -> bool:
+        filename = job.filename
+        target = Path(RESUMES_DIR) / filename
+        previous = None
+        if job.upload is not None:
+            # Uploads are saved under their name before they are logged (see
+            # `VectorDBManager.build`); keep the replaced resume until then
+            if target.exists():
+                previous = (Path(RESUMES_DIR) / job.upload).with_name(f"{filename}.previous")
+                shutil.copy2(target, previous)
+            os.replace(Path(RESUMES_DIR) / job.upload, target)
+        manager = VectorDBManager(self.openai_api_key)
+        try:
+            documents, vectors = manager.ingest_resume(filename, resume_data)
+        except Exception as e:
+            print(f"Error adding resume to database: {e}")
+            if job.upload is not None:
+                _restore(target, previous)
+            return False
+        if self.on_indexed is not None:
+            try:
+                self.on_indexed(documents, vectors)
+            except Exception as e:
+                print(f"Warning: Could not refresh the searcher with {filename}: {e}")
+        return True
+
+    def _maybe_compact(self) -> None:
+        """Start compacting the write-ahead log in the background once it is large enough."""
+        if self._compaction is not None and not self._compaction.done():
+            return
+        manager = VectorDBManager(self.openai_api_key)
+        if manager.needs_compaction():
+            self._compaction = asyncio.create_task(asyncio.to_thread(self._compact, manager))
+
+    @staticmethod
+    def _compact(manager: VectorDBManager) -> None:
+        try:
+            manager.compact()
+        except Exception as e:
+            print(f"Warning: Could not compact the write-ahead log: {e}")
+
+    async def _update(
+        self,
+        job: IngestionJob,
+        *,
+        state: Optional[str] = None,
+        event: Optional[Dict[str, str]] = None
+    ) -> None:
+        async with self._changed:
+            if state is not None:
+                job.state = state
+                if job.finished:
+                    job.finished_at = time.time()
+            if event is not None:
+                job.events.append(event)
+                excess = len(job.events) - self.max_job_events
+                if excess > 0:
+                    del job.events[:excess]
+                    job.events_dropped += excess
+            self._changed.notify_all()
+
+    def _forget_old_jobs(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.finished_jobs_kept)]:
+            del self._jobs[job_id]
+
+
+def stage_upload(filename: str, content: bytes) -> str:
+    """Save an uploaded PDF where it waits for its ingestion job.
+
+    Returns:
+        str: The upload's path relative to RESUMES_DIR, for `IngestionQueue.submit`
+    """
+    upload = Path(UPLOADS_DIR) / uuid.uuid4().hex / filename
+    path = Path(RESUMES_DIR) / upload
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return str(upload)
+
+
+def discard_upload(upload: str) -> None:
+    """Delete a staged upload along with its directory."""
+    shutil.rmtree((Path(RESUMES_DIR) / upload).parent, ignore_errors=True)
+
+
+def _restore(target: Path, previous: Optional[Path]) -> None:
+    """Put back the resume an upload replaced, or remove the upload if it was new."""
+    try:
+        if previous is not None:
+            os.replace(previous, target)
+        else:
+            target.unlink(missing_ok=True)
+    except OSError as e:
+        print(f"Warning: Could not restore {target.name}: {e}")
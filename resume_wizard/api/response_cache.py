@@ -0,0 +1,90 @@
+"""In-memory LRU cache of serialized `/api/search` responses.
+
+Caching query vectors only saves the embeddings request; an identical search
+still runs the index search, filtering and response model construction. This
+cache keeps the JSON body of each response, keyed by the full search request
+and the searcher's index version, so a repeated search returns the stored
+bytes without touching the index.
+
+Every ingested resume bumps `VectorDBSearcher.index_version`. Entries are
+only valid for the version they were computed at, and the first lookup after
+a bump drops the whole cache. Changes made by another process (such as
+``--backfill-candidates``) don't bump the version, so restart the API after
+them as with any other out-of-process change to the index.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Dict, Hashable, Optional
+
+from cachetools import LRUCache
+
+DEFAULT_RESPONSE_CACHE_SIZE = int(os.getenv("RESUME_WIZARD_RESPONSE_CACHE_SIZE", "1024"))
+
+
+class SearchResponseCache:
+    """Thread-safe LRU cache of response bodies for one index version at a time."""
+
+    def __init__(self, maxsize: int = DEFAULT_RESPONSE_CACHE_SIZE):
+        """
+        Args:
+            maxsize: Maximum number of responses kept. 0 disables caching.
+        """
+        self.maxsize = max(0, maxsize)
+        self._cache: LRUCache = LRUCache(maxsize=max(1, self.maxsize))
+        self._lock = threading.Lock()
+        self.version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: int) -> Optional[bytes]:
+        """Return the cached body for ``key`` at index ``version``, or None."""
+        if not self.maxsize:
+            return None
+        with self._lock:
+            self._set_version(version)
+            body = self._cache.get(key) if version == self.version else None
+            if body is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return body
+
+    def put(self, key: Hashable, version: int, body: bytes) -> None:
+        """Cache ``body`` for ``key``, computed at index ``version``.
+
+        Bodies computed at a version older than the newest one seen are
+        dropped; the index changed while they were being computed.
+        """
+        if not self.maxsize:
+            return
+        with self._lock:
+            if self.version is not None and version < self.version:
+                return
+            self._set_version(version)
+            self._cache[key] = body
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size, index version and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._cache),
+                "max_entries": self.maxsize,
+                "index_version": self.version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _set_version(self, version: int) -> None:
+        """Switch to a newer index version, dropping responses from older ones."""
+        if self.version is None or version > self.version:
+            self._cache.clear()
+            self.version = version
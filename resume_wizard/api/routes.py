@@ -1,27 +1,52 @@
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
-from fastapi.responses import StreamingResponse, FileResponse
-from pydantic import BaseModel
-from typing import List, Optional, Set
+from fastapi.responses import StreamingResponse, FileResponse, Response
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import Dict, List, Optional, Set
 import os
 from pathlib import Path
 import json
 import subprocess
-import asyncio  # Add delay between messages
+import asyncio
 
-from resume_wizard.vectordb.searcher import VectorDBSearcher, ResumeSection
+from resume_wizard.vectordb.searcher import VectorDBSearcher, ResumeSection, SearchRequest
+from resume_wizard.vectordb.candidate_store import MAX_CANDIDATE_FILTERS
 from resume_wizard.vectordb.manager import VectorDBManager
-from resume_wizard.globals import RESUMES_DIR
-from resume_wizard.wizard.rezwiz import run_resume_wizard
-from .dependencies import get_searcher
+from .dependencies import get_searcher, get_ingestion_queue, get_response_cache
+from .jobs import IngestionJob, IngestionQueue, QueueFullError, discard_upload, stage_upload
+from .response_cache import SearchResponseCache
 from ..resume_tailor.test_tailor import main as tailor_main
 
 router = APIRouter()
 
+# Most queries accepted by one /search/batch request
+MAX_BATCH_QUERIES = int(os.getenv("RESUME_WIZARD_MAX_BATCH_QUERIES", "100"))
+
 class SearchQuery(BaseModel):
     query: str
     section: Optional[str] = None
     max_results: Optional[int] = 5
     score_threshold: Optional[float] = 0.5
+    # Per-query search effort; None uses the server default, larger values
+    # are clamped to the server cap
+    ef_search: Optional[int] = Field(None, ge=1)
+    nprobe: Optional[int] = Field(None, ge=1)
+    # "vector", "hybrid" or "lexical" (keywords only, no embeddings request);
+    # None uses the server default
+    mode: Optional[str] = None
+    # Structured field filters applied before searching, e.g. "gpa>=3.5",
+    # "skills ⊇ {python, aws}", "location=VA"
+    candidate_filters: List[str] = Field(default_factory=list, max_length=MAX_CANDIDATE_FILTERS)
+
+class SearchFilters(BaseModel):
+    source_file: Optional[str] = None
+    candidate_name: Optional[str] = None
+    candidate_email: Optional[str] = None
+
+class BatchSearchItem(SearchQuery):
+    filters: Optional[SearchFilters] = None
+
+class BatchSearchQuery(BaseModel):
+    queries: List[BatchSearchItem] = Field(..., max_length=MAX_BATCH_QUERIES)
 
 class SearchResult(BaseModel):
     source: str
@@ -29,6 +54,57 @@ class SearchResult(BaseModel):
     content: str
     section: str
 
+class CandidateRankQuery(BaseModel):
+    query: str
+    max_results: Optional[int] = 5
+    # "weighted_sum" rewards matches across sections, "max" only the best one
+    aggregation: Optional[str] = "weighted_sum"
+    section_weights: Optional[Dict[str, float]] = None
+    sections_per_candidate: Optional[int] = 3
+    score_threshold: Optional[float] = None
+    ef_search: Optional[int] = Field(None, ge=1)
+    nprobe: Optional[int] = Field(None, ge=1)
+    candidate_filters: List[str] = Field(default_factory=list, max_length=MAX_CANDIDATE_FILTERS)
+
+# Serializes /search responses once, so cache hits can return the stored bytes
+_search_results_adapter = TypeAdapter(List[SearchResult])
+
+class RankedCandidate(BaseModel):
+    source: str
+    name: Optional[str] = None
+    email: Optional[str] = None
+    score: float
+    sections: List[SearchResult]
+
+class JobMatchQuery(BaseModel):
+    job_description: str = Field(..., max_length=20_000)
+    max_results: Optional[int] = 10
+    # Cosine similarity at which a section meets a requirement; None uses
+    # the server default
+    match_threshold: Optional[float] = None
+    ef_search: Optional[int] = Field(None, ge=1)
+    nprobe: Optional[int] = Field(None, ge=1)
+    candidate_filters: List[str] = Field(default_factory=list, max_length=MAX_CANDIDATE_FILTERS)
+
+class RequirementEvidence(BaseModel):
+    requirement: str
+    similarity: float
+    matched: bool
+    evidence: SearchResult
+
+class JobMatchCandidate(BaseModel):
+    source: str
+    name: Optional[str] = None
+    email: Optional[str] = None
+    coverage: float
+    requirements_met: int
+    score: float
+    requirements: List[RequirementEvidence]
+
+class JobMatchResult(BaseModel):
+    requirements: List[str]
+    candidates: List[JobMatchCandidate]
+
 class CandidateSearchQuery(BaseModel):
     name: str
     max_results: Optional[int] = 5
@@ -40,28 +116,48 @@ class FileSearchQuery(BaseModel):
     score_threshold: Optional[float] = 0.5
 
 @router.post("/search", response_model=List[SearchResult])
-async def search_resumes(
+def search_resumes(
     search_query: SearchQuery,
-    searcher: VectorDBSearcher = Depends(get_searcher)
+    searcher: VectorDBSearcher = Depends(get_searcher),
+    response_cache: SearchResponseCache = Depends(get_response_cache)
 ):
     """Search through resumes using vector similarity search.
     
+    Responses are cached serialized, keyed by every search parameter and
+    the index version, so a repeated search returns the stored JSON body
+    until an upload changes the index.
+    
     Args:
         search_query: The search parameters
         searcher: VectorDBSearcher instance (injected via dependency)
+        response_cache: SearchResponseCache instance (injected via dependency)
         
     Returns:
         List[SearchResult]: List of matching resume sections with their sources
     """
+    # Read before searching: a search racing an upload is cached under the
+    # older version, which the upload has already made stale
+    index_version = searcher.index_version
+    cache_key = search_query.model_dump_json()
+    body = response_cache.get(cache_key, index_version)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+
     try:
         results = searcher.get_relevant_candidates(
             prompt=search_query.query,
             section=search_query.section,
             max_docs=search_query.max_results,
-            score_threshold=search_query.score_threshold
+            score_threshold=search_query.score_threshold,
+            ef_search=search_query.ef_search,
+            nprobe=search_query.nprobe,
+            mode=search_query.mode,
+            candidate_filters=search_query.candidate_filters,
+            # A failed search must not be cached as an empty result
+            raise_errors=True
         )
         
-        return [
+        body = _search_results_adapter.dump_json([
             SearchResult(
                 source=result["metadata"]["source"],
                 score=result["relevance_score"],
@@ -69,16 +165,79 @@ async def search_resumes(
                 section=result["metadata"]["section"]
             )
             for result in results
-        ]
+        ])
+        
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error searching resumes: {str(e)}"
+        )
+    response_cache.put(cache_key, index_version, body)
+    return Response(content=body, media_type="application/json")
+
+@router.post("/search/batch", response_model=List[List[SearchResult]])
+def search_resumes_batch(
+    batch: BatchSearchQuery,
+    searcher: VectorDBSearcher = Depends(get_searcher)
+):
+    """Run many searches in one request.
+    
+    All queries are embedded in a single embeddings request and each index
+    is searched once per group of similar queries with the whole query
+    matrix, so per-query cost drops sharply compared to separate
+    `/search` calls.
+    
+    Args:
+        batch: The searches, each with the parameters of `/search` plus
+            optional source file, candidate name and email filters
+        searcher: VectorDBSearcher instance (injected via dependency)
         
+    Returns:
+        List[List[SearchResult]]: Results of each query, in request order
+    """
+    requests = []
+    for item in batch.queries:
+        filters = item.filters or SearchFilters()
+        requests.append(SearchRequest(
+            item.query,
+            section=item.section,
+            source_file=filters.source_file,
+            candidate_name=filters.candidate_name,
+            candidate_email=filters.candidate_email,
+            max_docs=item.max_results,
+            score_threshold=item.score_threshold,
+            ef_search=item.ef_search,
+            nprobe=item.nprobe,
+            mode=item.mode,
+            candidate_filters=item.candidate_filters
+        ))
+    try:
+        batch_results = searcher.search_batch(requests)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error searching resumes: {str(e)}"
         )
+    
+    return [
+        [
+            SearchResult(
+                source=result["metadata"]["source"],
+                score=result["relevance_score"],
+                content=result["content"],
+                section=result["metadata"]["section"]
+            )
+            for result in results
+        ]
+        for results in batch_results
+    ]
 
 @router.post("/search/sources")
-async def search_resume_sources(
+def search_resume_sources(
     search_query: SearchQuery,
     searcher: VectorDBSearcher = Depends(get_searcher)
 ) -> List[str]:
@@ -87,34 +246,156 @@ async def search_resume_sources(
             prompt=search_query.query,
             section=search_query.section,
             max_docs=search_query.max_results,
-            score_threshold=search_query.score_threshold
+            score_threshold=search_query.score_threshold,
+            ef_search=search_query.ef_search,
+            nprobe=search_query.nprobe,
+            mode=search_query.mode,
+            candidate_filters=search_query.candidate_filters
         )
         # Extract unique source files using a set
         sources = {result["metadata"]["source"] for result in results}
         return list(sources)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/search/candidates", response_model=List[RankedCandidate])
+def rank_candidates(
+    search_query: CandidateRankQuery,
+    searcher: VectorDBSearcher = Depends(get_searcher)
+):
+    """Rank candidates by how well their resume sections match a query.
+    
+    Section scores from a single vector search are aggregated per resume,
+    so candidates matching in several sections rank above candidates who
+    match in one.
+    
+    Args:
+        search_query: The search and aggregation parameters
+        searcher: VectorDBSearcher instance (injected via dependency)
+        
+    Returns:
+        List[RankedCandidate]: Best candidates first, with their best-matching sections
+    """
+    try:
+        results = searcher.rank_candidates(
+            search_query.query,
+            max_candidates=search_query.max_results,
+            aggregation=search_query.aggregation,
+            section_weights=search_query.section_weights,
+            sections_per_candidate=search_query.sections_per_candidate,
+            score_threshold=search_query.score_threshold,
+            ef_search=search_query.ef_search,
+            nprobe=search_query.nprobe,
+            candidate_filters=search_query.candidate_filters
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    return [
+        RankedCandidate(
+            source=result["source"],
+            name=result["name"],
+            email=result["email"],
+            score=result["score"],
+            sections=[
+                SearchResult(
+                    source=section["metadata"]["source"],
+                    score=section["relevance_score"],
+                    content=section["content"],
+                    section=section["metadata"]["section"]
+                )
+                for section in result["sections"]
+            ]
+        )
+        for result in results
+    ]
+
+@router.post("/search/job", response_model=JobMatchResult)
+def match_job_description(
+    search_query: JobMatchQuery,
+    searcher: VectorDBSearcher = Depends(get_searcher)
+):
+    """Rank candidates against a job description, requirement by requirement.
+    
+    The description is split into requirement phrases, and candidates are
+    ranked by how many of them one of their resume sections meets, with
+    their best section for each requirement as evidence.
+    
+    Args:
+        search_query: The job description and matching parameters
+        searcher: VectorDBSearcher instance (injected via dependency)
+        
+    Returns:
+        JobMatchResult: The requirement phrases and the best candidates first
+    """
+    options = {}
+    if search_query.match_threshold is not None:
+        options["match_threshold"] = search_query.match_threshold
+    try:
+        result = searcher.match_job_description(
+            search_query.job_description,
+            max_candidates=search_query.max_results,
+            ef_search=search_query.ef_search,
+            nprobe=search_query.nprobe,
+            candidate_filters=search_query.candidate_filters,
+            **options
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    return JobMatchResult(
+        requirements=result["requirements"],
+        candidates=[
+            JobMatchCandidate(
+                source=candidate["source"],
+                name=candidate["name"],
+                email=candidate["email"],
+                coverage=candidate["coverage"],
+                requirements_met=candidate["requirements_met"],
+                score=candidate["score"],
+                requirements=[
+                    RequirementEvidence(
+                        requirement=item["requirement"],
+                        similarity=item["similarity"],
+                        matched=item["matched"],
+                        evidence=SearchResult(
+                            source=item["metadata"]["source"],
+                            score=item["similarity"],
+                            content=item["content"],
+                            section=item["metadata"]["section"]
+                        )
+                    )
+                    for item in candidate["requirements"]
+                ]
+            )
+            for candidate in result["candidates"]
+        ]
+    )
+
 @router.post("/search/candidate")
-async def search_by_candidate_name(
+def search_by_candidate_name(
     search_query: CandidateSearchQuery,
     searcher: VectorDBSearcher = Depends(get_searcher)
 ) -> List[SearchResult]:
-    """Search for a specific candidate by name.
+    """Search for a specific candidate by name or email.
+    
+    Matching is fuzzy, so partial names and small typos still find the
+    candidate; each section is scored with its candidate's match score.
     
     Args:
-        search_query: The search parameters including candidate name
+        search_query: The search parameters including candidate name or email
         searcher: VectorDBSearcher instance (injected via dependency)
         
     Returns:
-        List[SearchResult]: List of matching resume sections for that candidate
+        List[SearchResult]: List of matching resume sections, best matching candidate first
     """
     try:
-        results = searcher.get_relevant_candidates(
-            prompt="",  # Empty prompt since we're filtering by name
-            candidate_name=search_query.name,
+        results = searcher.find_candidate_documents(
+            search_query.name,
             max_docs=search_query.max_results,
-            score_threshold=search_query.score_threshold
+            min_similarity=search_query.score_threshold
         )
         
         return [
@@ -134,7 +415,7 @@ async def search_by_candidate_name(
         )
 
 @router.post("/search/file")
-async def search_by_filename(
+def search_by_filename(
     search_query: FileSearchQuery,
     searcher: VectorDBSearcher = Depends(get_searcher)
 ) -> List[SearchResult]:
@@ -171,152 +452,121 @@ async def search_by_filename(
             detail=f"Error searching by filename: {str(e)}"
         )
 
-@router.post("/upload")
+async def _save_upload(file: UploadFile) -> str:
+    """Validate an uploaded PDF and stage it for ingestion.
+    
+    A resume already saved under the same name is only replaced once the
+    upload has been extracted and is being added to the database.
+    
+    Returns:
+        str: The staged upload's path relative to RESUMES_DIR
+    """
+    if not file.filename.endswith('.pdf'):
+        raise HTTPException(
+            status_code=400,
+            detail="Only PDF files are accepted"
+        )
+
+    content = await file.read()
+    return await asyncio.to_thread(stage_upload, Path(file.filename).name, content)
+
+def _enqueue(upload: str, queue: IngestionQueue) -> IngestionJob:
+    """Submit a staged resume for ingestion, discarding it again if the queue is full."""
+    try:
+        return queue.submit(Path(upload).name, upload)
+    except QueueFullError as e:
+        discard_upload(upload)
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": "30"}
+        )
+
+@router.post("/upload", status_code=202)
 async def upload_resume(
     file: UploadFile = File(...),
-    searcher: VectorDBSearcher = Depends(get_searcher)
+    queue: IngestionQueue = Depends(get_ingestion_queue)
 ) -> dict:
-    """Upload a resume and add it to the vector database.
+    """Upload a resume and queue it for processing.
+    
+    The resume is extracted and added to the vector database by a background
+    worker; poll `/jobs/{job_id}` or follow `/jobs/{job_id}/events` for progress.
     
     Args:
         file: The uploaded PDF file
-        searcher: VectorDBSearcher instance (injected via dependency)
+        queue: IngestionQueue instance (injected via dependency)
         
     Returns:
-        dict: Status of the upload and processing
+        dict: The queued job's id and status
     """
-    try:
-        if not file.filename.endswith('.pdf'):
-            raise HTTPException(
-                status_code=400,
-                detail="Only PDF files are accepted"
-            )
-        
-        # Save the file
-        file_path = Path(RESUMES_DIR) / file.filename
-        
-        # Ensure directory exists
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Write the file
-        content = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(content)
-            
-        # Get OpenAI API key from environment
-        openai_api_key = os.getenv("OPENAI_API_KEY")
-        if not openai_api_key:
-            raise HTTPException(
-                status_code=500,
-                detail="OpenAI API key not configured"
-            )
-            
-        # Create manager and add resume to database
-        manager = VectorDBManager.load_existing(openai_api_key)
-        success = manager.add_single_resume(file.filename)
-        
-        if not success:
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to process resume"
-            )
-            
-        return {
-            "message": "Resume uploaded and processed successfully",
-            "filename": file.filename
-        }
-        
-    except Exception as e:
-        # Clean up file if it was saved
-        if 'file_path' in locals():
-            try:
-                os.remove(file_path)
-            except:
-                pass
-                
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error processing resume: {str(e)}"
-        )
+    upload = await _save_upload(file)
+    job = _enqueue(upload, queue)
+    return {
+        "message": "Resume uploaded and queued for processing",
+        **job.to_dict()
+    }
 
 @router.post("/upload/stream")
 async def upload_and_stream_resume(
     file: UploadFile = File(...),
-    searcher: VectorDBSearcher = Depends(get_searcher)
+    queue: IngestionQueue = Depends(get_ingestion_queue)
 ):
-    """Upload a resume and stream the processing status.
+    """Upload a resume, queue it and stream the job's processing status.
     
     Args:
         file: The uploaded PDF file
-        searcher: VectorDBSearcher instance (injected via dependency)
+        queue: IngestionQueue instance (injected via dependency)
         
     Returns:
         StreamingResponse: A stream of status updates
     """
-    try:
-        if not file.filename.endswith('.pdf'):
-            raise HTTPException(
-                status_code=400,
-                detail="Only PDF files are accepted"
-            )
-        
-        # Save the file
-        file_path = Path(RESUMES_DIR) / file.filename
-        
-        # Ensure directory exists
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Write the file
-        content = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(content)
-
-        async def process_resume():
-            try:
-                # Stream the processing status
-                for status in run_resume_wizard(file.filename, stream=True):
-                    yield f"data: {json.dumps({'status': status})}\n\n"
-                    
-                # After processing, add to vector database
-                openai_api_key = os.getenv("OPENAI_API_KEY")
-                if not openai_api_key:
-                    yield f"data: {json.dumps({'error': 'OpenAI API key not configured'})}\n\n"
-                    return
-                    
-                manager = VectorDBManager.load_existing(openai_api_key)
-                success = manager.add_single_resume(file.filename)
-                
-                if success:
-                    yield f"data: {json.dumps({'status': '✅ Resume added to database successfully!'})}\n\n"
-                else:
-                    yield f"data: {json.dumps({'error': 'Failed to add resume to database'})}\n\n"
-                    
-            except Exception as e:
-                yield f"data: {json.dumps({'error': str(e)})}\n\n"
-                
-                # Clean up file if there was an error
-                try:
-                    os.remove(file_path)
-                except:
-                    pass
-
-        return StreamingResponse(
-            process_resume(),
-            media_type="text/event-stream"
-        )
-        
-    except Exception as e:
-        # Clean up file if it was saved
-        if 'file_path' in locals():
-            try:
-                os.remove(file_path)
-            except:
-                pass
-                
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error processing resume: {str(e)}"
-        )
+    upload = await _save_upload(file)
+    job = _enqueue(upload, queue)
+    return StreamingResponse(
+        _job_event_stream(job.id, queue),
+        media_type="text/event-stream",
+        headers={"X-Job-Id": job.id}
+    )
+
+async def _job_event_stream(job_id: str, queue: IngestionQueue):
+    async for event in queue.follow(job_id):
+        yield f"data: {json.dumps(event)}\n\n"
+
+@router.get("/jobs")
+async def ingestion_queue_stats(
+    queue: IngestionQueue = Depends(get_ingestion_queue)
+) -> dict:
+    """Return ingestion queue depth and job counts by state."""
+    return queue.stats()
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(
+    job_id: str,
+    queue: IngestionQueue = Depends(get_ingestion_queue)
+) -> dict:
+    """Return the state and progress of an ingestion job."""
+    job = queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    queue: IngestionQueue = Depends(get_ingestion_queue)
+):
+    """Stream an ingestion job's status updates as server-sent events.
+    
+    Events already emitted are replayed first, so the stream can be opened
+    at any point in the job's life. It ends when the job finishes.
+    """
+    if queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return StreamingResponse(
+        _job_event_stream(job_id, queue),
+        media_type="text/event-stream"
+    )
+
 
 @router.post("/tailor/stream")
 async def tailor_resume_stream(
@@ -0,0 +1 @@
+"""Benchmarks for the resume wizard and vector search. Run each module with `python -m`."""
@@ -0,0 +1,115 @@
+"""Per-query cost of `VectorDBSearcher.search_batch` against one search per query.
+
+Saves a synthetic corpus as a snapshot (see ``benchmarks.docstore_load``),
+opens a `VectorDBSearcher` on it and runs the same queries at each batch
+size, once as separate `get_relevant_candidates` calls (what the dashboards
+do with ``/api/search``) and once as a single `search_batch` call (what
+``/api/search/batch`` does). A third of the queries are restricted to a
+section, like the dashboards' mix.
+
+The embeddings model is a local stand-in that sleeps ``--embed-latency-ms``
+per request to model the round-trip to the embeddings API; pass 0 to see
+the FAISS side alone. Every query is unique, so the query cache never
+answers. No API calls are made.
+
+Usage:
+    python -m resume_wizard.benchmarks.batch_search [--resumes N] [--dim D]
+        [--embed-latency-ms MS] [--batch-sizes 1 10 50 100]
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+from langchain_community.embeddings import FakeEmbeddings
+
+from resume_wizard.benchmarks.docstore_load import INDEX_NAME, build_corpus
+from resume_wizard.vectordb.searcher import SearchRequest, VectorDBSearcher
+from resume_wizard.vectordb.section_index import SectionIndexes
+from resume_wizard.vectordb.storage import save_snapshot
+
+
+class SlowEmbeddings(FakeEmbeddings):
+    """Deterministic random embeddings with a fixed delay per request."""
+
+    latency: float = 0.0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency)
+        return [
+            np.random.default_rng(abs(hash(text)) % 2**32).standard_normal(self.size).tolist()
+            for text in texts
+        ]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def make_requests(count: int, offset: int) -> List[SearchRequest]:
+    sections = (None, None, "experience")
+    return [
+        SearchRequest(
+            f"query {offset + i}",
+            section=sections[i % len(sections)],
+            max_docs=10,
+            score_threshold=-np.inf,
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--embed-latency-ms", type=float, default=100.0)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--index-type", default="HNSW", choices=["HNSW", "Flat"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        print(f"Building {args.resumes} resumes (dim {args.dim}, {args.index_type})...")
+        db = build_corpus(args.resumes, args.dim)
+        if args.index_type == "HNSW":
+            # build_corpus makes a flat index; move its vectors into an HNSW one
+            from resume_wizard.vectordb.index_types import create_index
+            vectors = db.index.reconstruct_n(0, db.index.ntotal)
+            db.index = create_index("HNSW", args.dim)
+            db.index.add(vectors)
+        save_snapshot(db, SectionIndexes.build(db, args.index_type), folder, INDEX_NAME, wal_seq=0)
+        del db
+
+        embeddings = SlowEmbeddings(size=args.dim, latency=args.embed_latency_ms / 1000)
+        searcher = VectorDBSearcher(folder, INDEX_NAME, embeddings)
+
+        print(f"\n{'batch':>6}{'separate ms/q':>15}{'batched ms/q':>14}{'speedup':>9}")
+        offset = 0
+        for batch_size in args.batch_sizes:
+            requests = make_requests(batch_size, offset)
+            offset += batch_size
+            started = time.perf_counter()
+            for request in requests:
+                searcher.get_relevant_candidates(
+                    request.prompt,
+                    section=request.section,
+                    max_docs=request.max_docs,
+                    score_threshold=request.score_threshold,
+                )
+            separate = (time.perf_counter() - started) / batch_size
+
+            requests = make_requests(batch_size, offset)
+            offset += batch_size
+            started = time.perf_counter()
+            searcher.search_batch(requests)
+            batched = (time.perf_counter() - started) / batch_size
+            print(
+                f"{batch_size:>6}{separate * 1000:>15.2f}{batched * 1000:>14.2f}"
+                f"{separate / batched:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Compare searcher startup with the pickled docstore, the SQLite document store and mmap.
+
+Builds a synthetic corpus of resumes (five documents each, with resume-sized
+text), saves it once with ``FAISS.save_local`` (pickled `InMemoryDocstore`)
+and once as a snapshot with the SQLite document store, then loads each in a
+fresh process the way `VectorDBSearcher` does: load the database and build
+its `IndexSegment`, then run a top-k search. The snapshot is loaded twice,
+reading the FAISS index into memory and memory-mapping the flat layout
+(``mmap_index=True``). Reports load time, RSS growth once the searcher is
+ready, the part of it that is private to the process (shared, file-backed
+pages excluded) and on-disk size. No API calls are made.
+
+Usage:
+    python -m resume_wizard.benchmarks.docstore_load [--resumes N] [--dim D]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+
+from resume_wizard.vectordb.flat_layout import MmapFlatIndex, MmapSectionIndexes
+from resume_wizard.vectordb.section_index import SectionIndexes
+from resume_wizard.vectordb.segment import IndexSegment
+from resume_wizard.vectordb.storage import load_snapshot, save_snapshot
+
+INDEX_NAME = "resume_db"
+SECTIONS = ("skills", "objective", "experience", "experience", "projects")
+FILLER = (
+    "Designed and shipped data pipelines and internal tools, partnered with "
+    "product and design, mentored interns and improved reliability. "
+)
+
+
+def build_corpus(num_resumes: int, dim: int, seed: int = 0) -> FAISS:
+    """Return an in-memory FAISS store shaped like the resume index."""
+    rng = np.random.default_rng(seed)
+    num_docs = num_resumes * len(SECTIONS)
+    db = FAISS(
+        embedding_function=FakeEmbeddings(size=dim),
+        index=faiss.IndexFlatL2(dim),
+        docstore=InMemoryDocstore(),
+        index_to_docstore_id={},
+    )
+    vectors = rng.standard_normal((num_docs, dim)).astype(np.float32)
+    texts, metadatas = [], []
+    for resume in range(num_resumes):
+        identity = {
+            "source": f"resume_{resume:06d}.pdf",
+            "name": f"Candidate {resume}",
+            "email": f"candidate{resume}@example.com",
+        }
+        for section in SECTIONS:
+            texts.append(f"{section.title()} of candidate {resume}. " + FILLER * 3)
+            metadatas.append({**identity, "section": section})
+    # Add in chunks so InMemoryDocstore's copy-on-add doesn't dominate
+    chunk = 50_000
+    for start in range(0, num_docs, chunk):
+        db.add_embeddings(
+            list(zip(texts[start:start + chunk], vectors[start:start + chunk].tolist())),
+            metadatas=metadatas[start:start + chunk],
+        )
+    return db
+
+
+def _rss_mb() -> float:
+    """Current resident set size, or peak RSS where /proc isn't available."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _private_mb() -> float:
+    """Memory private to this process, or RSS where /proc isn't available."""
+    try:
+        private_kb = 0
+        with open("/proc/self/smaps_rollup") as rollup:
+            for line in rollup:
+                if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                    private_kb += int(line.split()[1])
+        return private_kb / 1024
+    except OSError:
+        return _rss_mb()
+
+
+def measure(mode: str, folder: str, dim: int) -> Dict[str, Any]:
+    """Load one saved copy in this process and report time and memory."""
+    baseline_mb = _rss_mb()
+    baseline_private_mb = _private_mb()
+    embeddings = FakeEmbeddings(size=dim)
+    started = time.perf_counter()
+    if mode == "pickle":
+        db = FAISS.load_local(folder, embeddings, INDEX_NAME, allow_dangerous_deserialization=True)
+    else:
+        db, _ = load_snapshot(folder, INDEX_NAME, embeddings, mmap=mode == "mmap")
+    loaded = time.perf_counter() - started
+    if isinstance(db.index, MmapFlatIndex):
+        sections = MmapSectionIndexes(db.index.layout)
+    else:
+        sections = SectionIndexes.load(folder, INDEX_NAME, db, "Flat")
+    segment = IndexSegment(db, sections)
+    ready = time.perf_counter() - started
+
+    query = np.random.default_rng(1).standard_normal(dim).tolist()
+    started = time.perf_counter()
+    segment.similarity_search(query, 5)
+    search = time.perf_counter() - started
+    return {
+        "load_s": loaded,
+        "ready_s": ready,
+        "search_ms": search * 1000,
+        "rss_mb": _rss_mb() - baseline_mb,
+        "private_mb": _private_mb() - baseline_private_mb,
+    }
+
+
+def _folder_size_mb(folder: Path) -> float:
+    return sum(path.stat().st_size for path in folder.rglob("*") if path.is_file()) / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=64)
+    parser.add_argument("--measure", nargs=2, metavar=("MODE", "FOLDER"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(*args.measure, args.dim)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folders = {"pickle": Path(tmp) / "pickle", "sqlite": Path(tmp) / "sqlite"}
+        print(f"Building {args.resumes} resumes ({args.resumes * len(SECTIONS)} documents, dim {args.dim})...")
+        db = build_corpus(args.resumes, args.dim)
+        sections = SectionIndexes.build(db, "Flat")
+
+        started = time.perf_counter()
+        folders["pickle"].mkdir()
+        db.save_local(str(folders["pickle"]), INDEX_NAME)
+        sections.save(folders["pickle"], INDEX_NAME)
+        save_times = {"pickle": time.perf_counter() - started}
+        started = time.perf_counter()
+        folders["sqlite"].mkdir()
+        save_snapshot(db, sections, folders["sqlite"], INDEX_NAME, wal_seq=0)
+        save_times["sqlite"] = time.perf_counter() - started
+        del db, sections
+
+        folders["mmap"] = folders["sqlite"]
+        save_times["mmap"] = save_times["sqlite"]
+
+        print(
+            f"\n{'store':<8}{'save s':>9}{'disk MB':>10}{'load s':>9}{'ready s':>10}"
+            f"{'search ms':>11}{'RSS MB':>9}{'private MB':>12}"
+        )
+        for mode, folder in folders.items():
+            output = subprocess.run(
+                [sys.executable, "-m", __spec__.name, "--dim", str(args.dim), "--measure", mode, str(folder)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            row = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{mode:<8}{save_times[mode]:>9.2f}{_folder_size_mb(folder):>10.1f}"
+                f"{row['load_s']:>9.2f}{row['ready_s']:>10.2f}{row['search_ms']:>11.2f}"
+                f"{row['rss_mb']:>9.1f}{row['private_mb']:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
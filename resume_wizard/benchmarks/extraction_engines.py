@@ -0,0 +1,131 @@
+"""Compare latency and token usage of the resume extraction engines.
+
+Runs `run_resume_wizard` on each resume with the extraction cache disabled,
+once per configuration, and reports wall-clock time, model calls and tokens.
+Needs ANTHROPIC_API_KEY and spends real tokens.
+
+Usage:
+    python -m resume_wizard.benchmarks.extraction_engines [resume.pdf ...] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Generator, List, Optional
+
+from dotenv import load_dotenv
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+
+from resume_wizard.globals import RESUMES_DIR
+from resume_wizard.wizard import run_resume_wizard
+from resume_wizard.wizard.rezwiz import SECTIONS
+
+CONFIGURATIONS = [
+    ("sections (sequential)", {"engine": "sections", "concurrency": 1}),
+    ("sections (concurrent)", {"engine": "sections", "concurrency": len(SECTIONS)}),
+    ("single_pass", {"engine": "single_pass"}),
+]
+
+
+class UsageTracker(BaseCallbackHandler):
+    """Callback handler that totals model calls and token usage."""
+
+    def __init__(self):
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self._lock = threading.Lock()
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        with self._lock:
+            self.calls += 1
+            for generations in response.generations:
+                for generation in generations:
+                    message = getattr(generation, "message", None)
+                    usage = getattr(message, "usage_metadata", None) or {}
+                    self.input_tokens += usage.get("input_tokens", 0)
+                    self.output_tokens += usage.get("output_tokens", 0)
+
+
+_usage_tracker: ContextVar[Optional[UsageTracker]] = ContextVar(
+    "resume_wizard_usage_tracker", default=None
+)
+register_configure_hook(_usage_tracker, inheritable=True)
+
+
+@contextmanager
+def track_usage() -> Generator[UsageTracker, None, None]:
+    """Attach a `UsageTracker` to every model call made inside the block."""
+    tracker = UsageTracker()
+    token = _usage_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _usage_tracker.reset(token)
+
+
+def benchmark_resume(resume_file_name: str, repeat: int) -> List[Dict[str, Any]]:
+    """Run every configuration ``repeat`` times on one resume."""
+    rows = []
+    for label, options in CONFIGURATIONS:
+        for _ in range(repeat):
+            with track_usage() as usage:
+                started = time.perf_counter()
+                for _ in run_resume_wizard(resume_file_name, stream=True, use_cache=False, **options):
+                    pass
+                elapsed = time.perf_counter() - started
+            rows.append({
+                "resume": resume_file_name,
+                "configuration": label,
+                "seconds": elapsed,
+                "calls": usage.calls,
+                "input_tokens": usage.input_tokens,
+                "output_tokens": usage.output_tokens,
+            })
+    return rows
+
+
+def print_report(rows: List[Dict[str, Any]]) -> None:
+    print(f"\n{'configuration':<24}{'runs':>6}{'mean s':>10}{'calls':>8}{'input tok':>12}{'output tok':>12}")
+    for label, _ in CONFIGURATIONS:
+        runs = [row for row in rows if row["configuration"] == label]
+        if not runs:
+            continue
+        print(
+            f"{label:<24}{len(runs):>6}"
+            f"{statistics.mean(r['seconds'] for r in runs):>10.1f}"
+            f"{statistics.mean(r['calls'] for r in runs):>8.1f}"
+            f"{statistics.mean(r['input_tokens'] for r in runs):>12.0f}"
+            f"{statistics.mean(r['output_tokens'] for r in runs):>12.0f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("resumes", nargs="*", help="PDF names in RESUMES_DIR (default: all)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per configuration and resume")
+    args = parser.parse_args()
+
+    load_dotenv()
+    if not os.getenv("ANTHROPIC_API_KEY"):
+        raise SystemExit("ANTHROPIC_API_KEY environment variable not set")
+
+    resumes = args.resumes or sorted(
+        pdf for pdf in os.listdir(RESUMES_DIR) if pdf.lower().endswith(".pdf")
+    )
+    rows: List[Dict[str, Any]] = []
+    for resume in resumes:
+        print(f"Benchmarking {resume}...")
+        rows.extend(benchmark_resume(resume, args.repeat))
+    print_report(rows)
+
+
+if __name__ == "__main__":
+    main()
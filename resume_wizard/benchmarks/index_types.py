@@ -0,0 +1,122 @@
+"""Recall and latency of each index type against the exact flat baseline.
+
+Builds every type in `INDEX_TYPES` over the same synthetic clustered vectors
+(a Gaussian mixture, so quantizers see structure roughly like real
+embeddings), trains quantized types the way `VectorDBManager` does, and
+reports for each:
+
+- bytes per vector of the serialized index
+- bytes per vector of the section sub-indexes kept alongside it (see
+  `SectionIndexes`), with vectors spread evenly over ``--sections`` sections
+- build time, including training
+- recall@k against exact nearest neighbours from the flat index
+- single-query search latency (p50 / p95)
+
+No API calls are made. For a decision about a real deployment, run it at
+the production dimension (1536 for OpenAI's small embedding model) and
+corpus size.
+
+Usage:
+    python -m resume_wizard.benchmarks.index_types [--vectors N] [--dim D]
+        [--k K] [--queries Q] [--sections S] [--types Flat HNSW ...]
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Any, Dict, List
+
+import faiss
+import numpy as np
+
+from resume_wizard.vectordb.index_types import INDEX_TYPES, create_index, train_index
+from resume_wizard.vectordb.section_index import SectionIndexes
+
+
+def make_vectors(num_vectors: int, num_queries: int, dim: int, seed: int = 0):
+    """Return (corpus, queries) drawn from the same Gaussian mixture."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(8, num_vectors // 500), dim)).astype(np.float32)
+
+    def sample(count: int) -> np.ndarray:
+        picks = rng.integers(len(centers), size=count)
+        return centers[picks] + 0.35 * rng.standard_normal((count, dim)).astype(np.float32)
+
+    return sample(num_vectors), sample(num_queries)
+
+
+def section_bytes(index: faiss.Index, index_type: str, num_sections: int) -> int:
+    """Memory of section sub-indexes over ``index``, with positions dealt round-robin."""
+    sections = SectionIndexes(index.d, index_type)
+    positions = np.arange(index.ntotal)
+    sections.extend(index, 0, {
+        f"section{i}": positions[i::num_sections].tolist() for i in range(num_sections)
+    })
+    return sections.nbytes()
+
+
+def benchmark(
+    index_type: str,
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    truth: np.ndarray,
+    k: int,
+    num_sections: int = 6
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    index = create_index(index_type, corpus.shape[1], len(corpus))
+    train_index(index, corpus)
+    index.add(corpus)
+    build = time.perf_counter() - started
+
+    timings: List[float] = []
+    hits = 0
+    for query, expected in zip(queries, truth):
+        started = time.perf_counter()
+        _, found = index.search(query.reshape(1, -1), k)
+        timings.append(time.perf_counter() - started)
+        hits += len(set(found[0].tolist()) & set(expected.tolist()))
+    timings.sort()
+    return {
+        "type": index_type,
+        "bytes_per_vector": len(faiss.serialize_index(index)) / len(corpus),
+        "section_bytes_per_vector": section_bytes(index, index_type, num_sections) / len(corpus),
+        "build_s": build,
+        "recall": hits / (len(queries) * k),
+        "p50_ms": statistics.median(timings) * 1000,
+        "p95_ms": timings[int(0.95 * (len(timings) - 1))] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--sections", type=int, default=6)
+    parser.add_argument("--types", nargs="+", default=list(INDEX_TYPES), choices=INDEX_TYPES)
+    args = parser.parse_args()
+
+    print(f"Generating {args.vectors} x {args.dim} vectors...")
+    corpus, queries = make_vectors(args.vectors, args.queries, args.dim)
+    exact = faiss.IndexFlatL2(args.dim)
+    exact.add(corpus)
+    _, truth = exact.search(queries, args.k)
+
+    print(
+        f"\n{'type':<10}{'bytes/vec':>11}{'sections':>10}{'build s':>10}"
+        f"{f'recall@{args.k}':>12}{'p50 ms':>9}{'p95 ms':>9}"
+    )
+    for index_type in args.types:
+        row = benchmark(index_type, corpus, queries, truth, args.k, args.sections)
+        print(
+            f"{row['type']:<10}{row['bytes_per_vector']:>11.0f}"
+            f"{row['section_bytes_per_vector']:>10.0f}{row['build_s']:>10.2f}"
+            f"{row['recall']:>12.3f}{row['p50_ms']:>9.3f}{row['p95_ms']:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
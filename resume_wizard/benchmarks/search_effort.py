@@ -0,0 +1,116 @@
+"""Recall/latency curve of the per-query search effort settings.
+
+Builds an HNSW index and an IVF-SQ8 index over the same synthetic clustered
+vectors as ``benchmarks.index_types``, then sweeps ``ef_search`` (HNSW) and
+``nprobe`` (IVF) in powers of two up to the server caps. Every search goes
+through `search_parameters`, exactly as an ``/api/search`` request with that
+override would. For each setting it reports recall@k against exact nearest
+neighbours and single-query latency (p50 / p95), and draws recall as a bar
+so the knee of the curve is easy to spot. The server default is marked
+with ``*``. No API calls are made.
+
+Usage:
+    python -m resume_wizard.benchmarks.search_effort [--vectors N] [--dim D]
+        [--k K] [--queries Q]
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Any, Dict, List
+
+import faiss
+import numpy as np
+
+from resume_wizard.benchmarks.index_types import make_vectors
+from resume_wizard.vectordb.index_types import (
+    DEFAULT_HNSW_EF_SEARCH,
+    DEFAULT_IVF_NPROBE,
+    MAX_HNSW_EF_SEARCH,
+    MAX_IVF_NPROBE,
+    create_index,
+    search_parameters,
+    train_index
+)
+
+# Width of the recall bar at recall 1.0
+BAR_WIDTH = 30
+
+
+def sweep(start: int, cap: int, default: int) -> List[int]:
+    """Powers of two from ``start`` up to ``cap``, plus the cap and the default."""
+    values = {cap, min(default, cap)}
+    value = start
+    while value < cap:
+        values.add(value)
+        value *= 2
+    return sorted(values)
+
+
+def measure(
+    index: faiss.Index,
+    queries: np.ndarray,
+    truth: np.ndarray,
+    k: int,
+    **effort: int
+) -> Dict[str, Any]:
+    params = search_parameters(index, **effort)
+    timings: List[float] = []
+    hits = 0
+    for query, expected in zip(queries, truth):
+        started = time.perf_counter()
+        _, found = index.search(query.reshape(1, -1), k, params=params)
+        timings.append(time.perf_counter() - started)
+        hits += len(set(found[0].tolist()) & set(expected.tolist()))
+    timings.sort()
+    return {
+        "recall": hits / (len(queries) * k),
+        "p50_ms": statistics.median(timings) * 1000,
+        "p95_ms": timings[int(0.95 * (len(timings) - 1))] * 1000,
+    }
+
+
+def report(name: str, setting: str, values: List[int], default: int, index, queries, truth, k: int) -> None:
+    print(f"\n{name} ({setting})")
+    print(f"{setting:>10}{f'recall@{k}':>12}{'p50 ms':>9}{'p95 ms':>9}  recall")
+    for value in values:
+        row = measure(index, queries, truth, k, **{setting: value})
+        marker = "*" if value == default else " "
+        bar = "#" * round(row["recall"] * BAR_WIDTH)
+        print(
+            f"{value:>9}{marker}{row['recall']:>12.3f}{row['p50_ms']:>9.3f}"
+            f"{row['p95_ms']:>9.3f}  {bar}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"Generating {args.vectors} x {args.dim} vectors...")
+    corpus, queries = make_vectors(args.vectors, args.queries, args.dim)
+    exact = faiss.IndexFlatL2(args.dim)
+    exact.add(corpus)
+    _, truth = exact.search(queries, args.k)
+
+    for index_type in ("HNSW", "IVF-SQ8"):
+        print(f"Building {index_type}...")
+        index = create_index(index_type, args.dim, len(corpus))
+        train_index(index, corpus)
+        index.add(corpus)
+        if index_type == "HNSW":
+            values = sweep(8, MAX_HNSW_EF_SEARCH, DEFAULT_HNSW_EF_SEARCH)
+            report(index_type, "ef_search", values, DEFAULT_HNSW_EF_SEARCH, index, queries, truth, args.k)
+        else:
+            nlist = faiss.extract_index_ivf(index).nlist
+            values = sweep(1, min(MAX_IVF_NPROBE, nlist), DEFAULT_IVF_NPROBE)
+            report(index_type, "nprobe", values, DEFAULT_IVF_NPROBE, index, queries, truth, args.k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Compare post-filtered and pre-filtered (sub-index) section search.
+
+Builds a synthetic index in memory with skewed section sizes, then for each
+section measures latency and recall@k of:
+
+- post-filter: LangChain FAISS ``similarity_search_with_score_by_vector`` with
+  ``filter={"section": ...}``, the path `get_relevant_candidates` used before
+- sub-index: `SectionIndexes.search` on that section's own index
+
+Recall is measured against exact nearest neighbours within the section. No
+API calls are made.
+
+Usage:
+    python -m resume_wizard.benchmarks.section_search [--docs N] [--dim D] [--k K]
+        [--queries Q] [--index-type HNSW|Flat]
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Any, Dict, List
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+
+from resume_wizard.vectordb.section_index import SectionIndexes
+
+# Share of documents per section, roughly what resumes produce: several
+# experience and project entries, one skills block and one objective each
+SECTION_SHARES = {
+    "experience": 0.55,
+    "projects": 0.30,
+    "skills": 0.10,
+    "objective": 0.05,
+}
+
+
+def build_corpus(num_docs: int, dim: int, index_type: str, seed: int = 0) -> FAISS:
+    """Return a FAISS store of random vectors with section metadata."""
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((num_docs, dim)).astype(np.float32)
+    sections = rng.choice(
+        list(SECTION_SHARES), size=num_docs, p=list(SECTION_SHARES.values())
+    )
+    index = faiss.IndexHNSWFlat(dim, 32) if index_type == "HNSW" else faiss.IndexFlatL2(dim)
+    db = FAISS(
+        embedding_function=FakeEmbeddings(size=dim),
+        index=index,
+        docstore=InMemoryDocstore(),
+        index_to_docstore_id={},
+    )
+    db.add_embeddings(
+        [(f"doc {i}", vector.tolist()) for i, vector in enumerate(vectors)],
+        metadatas=[{"source": f"{i // 10}.pdf", "section": section} for i, section in enumerate(sections)],
+    )
+    return db
+
+
+def _recall(found: List[int], expected: np.ndarray) -> float:
+    return len(set(found) & set(expected.tolist())) / len(expected) if len(expected) else 1.0
+
+
+def benchmark(db: FAISS, sections: SectionIndexes, k: int, num_queries: int, seed: int = 1) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng(seed)
+    vectors = db.index.reconstruct_n(0, db.index.ntotal)
+    docstore_id_to_position = {doc_id: pos for pos, doc_id in db.index_to_docstore_id.items()}
+    section_positions: Dict[str, np.ndarray] = {}
+    for position, doc_id in db.index_to_docstore_id.items():
+        section = db.docstore.search(doc_id).metadata["section"]
+        section_positions.setdefault(section, []).append(position)
+
+    rows = []
+    for section, positions in section_positions.items():
+        positions = np.asarray(positions)
+        queries = rng.standard_normal((num_queries, db.index.d)).astype(np.float32)
+        timings: Dict[str, List[float]] = {"post-filter": [], "sub-index": []}
+        recalls: Dict[str, List[float]] = {"post-filter": [], "sub-index": []}
+        for query in queries:
+            distances = ((vectors[positions] - query) ** 2).sum(axis=1)
+            expected = positions[np.argsort(distances)[:k]]
+
+            started = time.perf_counter()
+            docs = db.similarity_search_with_score_by_vector(query.tolist(), k=k, filter={"section": section})
+            timings["post-filter"].append(time.perf_counter() - started)
+            recalls["post-filter"].append(_recall([docstore_id_to_position[doc.id] for doc, _ in docs], expected))
+
+            started = time.perf_counter()
+            _, found = sections.search(section, query, k)
+            timings["sub-index"].append(time.perf_counter() - started)
+            recalls["sub-index"].append(_recall([int(p) for p in found if p >= 0], expected))
+
+        for method in timings:
+            rows.append({
+                "section": section,
+                "docs": len(positions),
+                "method": method,
+                "p50_ms": statistics.median(timings[method]) * 1000,
+                "recall": statistics.mean(recalls[method]),
+            })
+    return rows
+
+
+def print_report(rows: List[Dict[str, Any]], k: int) -> None:
+    print(f"\n{'section':<12}{'docs':>8}  {'method':<12}{'p50 ms':>10}{f'recall@{k}':>12}")
+    for row in sorted(rows, key=lambda r: (-r["docs"], r["method"])):
+        print(f"{row['section']:<12}{row['docs']:>8}  {row['method']:<12}{row['p50_ms']:>10.3f}{row['recall']:>12.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--index-type", default="HNSW", choices=["HNSW", "Flat"])
+    args = parser.parse_args()
+
+    print(f"Building {args.docs} x {args.dim} {args.index_type} index...")
+    db = build_corpus(args.docs, args.dim, args.index_type)
+    sections = SectionIndexes.build(db, args.index_type)
+    print_report(benchmark(db, sections, args.k, args.queries), args.k)
+
+
+if __name__ == "__main__":
+    main()
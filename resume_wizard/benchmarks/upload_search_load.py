@@ -0,0 +1,119 @@
+"""Measure /api/search latency while resumes are being uploaded.
+
+Sends a steady stream of search requests to a running API server, first on
+its own and then while ``--uploads`` concurrent /api/upload/stream requests are
+in flight, and reports p50/p95/max search latency for both phases. A blocked
+event loop shows up as the second phase's latency tracking upload time.
+Uploads spend real tokens unless the extraction cache already holds them.
+
+Usage:
+    python -m resume_wizard.benchmarks.upload_search_load resume.pdf [--uploads N]
+        [--base-url http://localhost:8000] [--searches N] [--query TEXT]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+from resume_wizard.globals import RESUMES_DIR
+
+
+async def _search_latencies(
+    client: httpx.AsyncClient,
+    query: str,
+    count: int,
+    stop: asyncio.Event | None = None
+) -> List[float]:
+    """Issue ``count`` searches one after another, or until ``stop`` is set."""
+    latencies = []
+    for _ in range(count):
+        if stop is not None and stop.is_set():
+            break
+        started = time.perf_counter()
+        response = await client.post("/api/search", json={"query": query, "max_results": 5})
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def _upload(client: httpx.AsyncClient, pdf_path: Path, index: int) -> float:
+    """Stream one upload to completion and return how long it took."""
+    started = time.perf_counter()
+    # Give each upload its own filename so they don't overwrite each other
+    files = {"file": (f"loadtest_{index}_{pdf_path.name}", pdf_path.read_bytes(), "application/pdf")}
+    async with client.stream("POST", "/api/upload/stream", files=files) as response:
+        response.raise_for_status()
+        async for _ in response.aiter_lines():
+            pass
+    return time.perf_counter() - started
+
+
+def _summary(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+async def run_load_test(
+    base_url: str,
+    pdf_path: Path,
+    uploads: int,
+    searches: int,
+    query: str
+) -> Dict[str, Dict[str, float]]:
+    """Run the baseline and under-load phases and return their latency summaries."""
+    async with httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+        baseline = await _search_latencies(client, query, searches)
+
+        stop = asyncio.Event()
+        upload_tasks = [asyncio.create_task(_upload(client, pdf_path, i)) for i in range(uploads)]
+        search_task = asyncio.create_task(_search_latencies(client, query, searches, stop))
+        upload_seconds = await asyncio.gather(*upload_tasks)
+        stop.set()
+        under_load = await search_task
+
+    report = {"baseline": _summary(baseline), "during uploads": _summary(under_load)}
+    report["during uploads"]["upload_mean_s"] = statistics.mean(upload_seconds)
+    return report
+
+
+def print_report(report: Dict[str, Dict[str, float]]) -> None:
+    print(f"\n{'phase':<18}{'requests':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for phase, row in report.items():
+        print(
+            f"{phase:<18}{row['requests']:>10}"
+            f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['max_ms']:>10.1f}"
+        )
+    print(f"\nMean upload time: {report['during uploads']['upload_mean_s']:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("resume", help="PDF to upload, as a path or a name in RESUMES_DIR")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--uploads", type=int, default=4, help="Concurrent uploads")
+    parser.add_argument("--searches", type=int, default=200, help="Searches per phase")
+    parser.add_argument("--query", default="python developer with machine learning experience")
+    args = parser.parse_args()
+
+    pdf_path = Path(args.resume)
+    if not pdf_path.exists():
+        pdf_path = Path(RESUMES_DIR) / args.resume
+    report = asyncio.run(
+        run_load_test(args.base_url, pdf_path, args.uploads, args.searches, args.query)
+    )
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
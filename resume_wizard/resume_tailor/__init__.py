@@ -2,6 +2,7 @@
 from pathlib import Path
 from typing import Optional
 
+from resume_wizard.ai.tool_loop import print_tool_event
 from .models import LatexTemplateData
 from .chain import create_tailoring_chain, tailor_resume
 from .renderer import LatexTemplateRenderer
@@ -60,7 +61,9 @@ Format the information according to our template structure."""
         # The chain's tools will populate the template data
     
     # Now tailor the resume content to the job description
-    tailored_data = tailor_resume(chain, resume_text, job_description, template_data)
+    tailored_data = tailor_resume(
+        chain, resume_text, job_description, template_data, on_event=print_tool_event
+    )
     
     # Create renderer and generate PDF
     renderer = LatexTemplateRenderer(template_path)
@@ -8,6 +8,7 @@ from langchain.schema import SystemMessage
 
 from .models import LatexTemplateData, EducationEntry, ExperienceEntry, ProjectEntry, TechnicalSkills
 from .tools import create_tailoring_tools
+from resume_wizard.ai.tool_loop import ToolEventHook, ToolHandler, run_tool_loop
 
 ANALYSIS_PROMPT = """You are an expert at analyzing resumes and extracting structured information. Your task is to analyze a resume and extract information in a format suitable for our LaTeX template.
 
@@ -93,15 +94,107 @@ def create_tailoring_chain(api_key: str):
     
     return llm_with_tools
 
+def create_template_handlers(template_data: LatexTemplateData) -> Dict[str, ToolHandler]:
+    """Map each tailoring tool name to a handler that updates ``template_data``.
+    
+    Args:
+        template_data: The template data the tools write into
+        
+    Returns:
+        Dict[str, ToolHandler]: Tool handlers keyed by tool name
+    """
+    def update_contact_info(**tool_args: Any) -> str:
+        template_data.name = tool_args.get('name', template_data.name)
+        template_data.email = tool_args.get('email', template_data.email)
+        template_data.phone = tool_args.get('phone', template_data.phone)
+        template_data.linkedin = tool_args.get('linkedin', template_data.linkedin)
+        template_data.github = tool_args.get('github', template_data.github)
+        return "Updated contact information"
+
+    def update_education(education: List[Dict[str, Any]] | None = None, **_: Any) -> str:
+        # Convert each education entry to proper model
+        education_entries = [
+            EducationEntry(
+                university_name=entry.get('university', ''),
+                university_city=entry.get('city', ''),
+                university_state=entry.get('state', ''),
+                major_degree_name=entry.get('degree', ''),
+                minor_degree_name=entry.get('minor', None),
+                start_date=entry.get('start_date', ''),
+                end_date=entry.get('end_date', '')
+            )
+            for entry in education or []
+        ]
+        template_data.education = education_entries
+        return f"Updated education section with {len(education_entries)} entries"
+
+    def update_experience(experience: List[Dict[str, Any]] | None = None, **_: Any) -> str:
+        # Convert each experience entry to proper model
+        experience_entries = [
+            ExperienceEntry(
+                work_title=entry.get('title', ''),
+                work_company=entry.get('company', ''),
+                work_city=entry.get('city', ''),
+                work_state=entry.get('state', ''),
+                work_start_date=entry.get('start_date', ''),
+                work_end_date=entry.get('end_date', ''),
+                work_descriptions=entry.get('bullets', [])
+            )
+            for entry in experience or []
+        ]
+        template_data.experience = experience_entries
+        return f"Updated experience section with {len(experience_entries)} entries"
+
+    def update_projects(projects: List[Dict[str, Any]] | None = None, **_: Any) -> str:
+        # Convert each project entry to proper model
+        project_entries = []
+        for entry in projects or []:
+            technologies = entry.get('technologies', [])
+            # Convert technologies list to string if needed
+            if isinstance(technologies, list):
+                technologies = ', '.join(technologies)
+
+            project_entries.append(ProjectEntry(
+                project_name=entry.get('name', ''),
+                project_technologies=technologies,
+                project_start_date=entry.get('start_date', ''),
+                project_end_date=entry.get('end_date', ''),
+                project_bullets=entry.get('bullets', [])
+            ))
+        template_data.projects = project_entries
+        return f"Updated projects section with {len(project_entries)} entries"
+
+    def update_skills(skills: Dict[str, List[str]] | None = None, **_: Any) -> str:
+        # Convert skills to proper model
+        skills = skills or {}
+        template_data.technical_skills = TechnicalSkills(
+            languages=', '.join(skills.get('Languages', [])),
+            frameworks=', '.join(skills.get('Frameworks', [])),
+            dev_tools=', '.join(skills.get('Tools', [])),
+            libraries=', '.join(skills.get('Libraries', []))
+        )
+        return "Updated technical skills"
+
+    return {
+        "update_contact_info": update_contact_info,
+        "update_education": update_education,
+        "update_experience": update_experience,
+        "update_projects": update_projects,
+        "update_skills": update_skills,
+    }
+
 def analyze_resume(
     chain: Any,
-    resume_text: str
+    resume_text: str,
+    on_event: Optional[ToolEventHook] = None
 ) -> LatexTemplateData:
     """Analyze a resume and create template data.
     
     Args:
         chain: The analysis chain
         resume_text: Resume content to analyze
+        on_event: Optional hook called with tool-loop progress events, e.g.
+            `print_tool_event`
         
     Returns:
         LatexTemplateData: Extracted template data
@@ -121,125 +214,7 @@ def analyze_resume(
     }]
     
     template_data = LatexTemplateData()  # Start with empty template
-    print("\nCreated empty template data")
-    
-    while True:
-        print("\nSending request to Claude...")
-        response = chain.invoke(messages)
-        print("Received response from Claude")
-        
-        # Add assistant's response to messages
-        messages.append({"role": "assistant", "content": response.content})
-        
-        # If no more tool calls, we're done
-        if response.response_metadata.get('stop_reason') != "tool_use":
-            print("No more tool calls, analysis complete")
-            break
-            
-        # Get all tool use blocks
-        tool_uses = [block for block in response.content if block.get('type') == "tool_use"]
-        print(f"\nProcessing {len(tool_uses)} tool calls")
-        
-        # Process each tool use
-        for tool_use in tool_uses:
-            tool_name = tool_use['name']
-            tool_args = tool_use['input']
-            print(f"\nProcessing tool: {tool_name}")
-            print(f"Tool arguments: {tool_args}")
-            
-            try:
-                # Execute the tool and update template data
-                if tool_name == "update_contact_info":
-                    template_data.name = tool_args.get('name', template_data.name)
-                    template_data.email = tool_args.get('email', template_data.email)
-                    template_data.phone = tool_args.get('phone', template_data.phone)
-                    template_data.linkedin = tool_args.get('linkedin', template_data.linkedin)
-                    template_data.github = tool_args.get('github', template_data.github)
-                    result = "Updated contact information"
-                    
-                elif tool_name == "update_education":
-                    # Convert each education entry to proper model
-                    education_entries = []
-                    for entry in tool_args.get('education', []):
-                        edu_entry = EducationEntry(
-                            university_name=entry.get('university', ''),
-                            university_city=entry.get('city', ''),
-                            university_state=entry.get('state', ''),
-                            major_degree_name=entry.get('degree', ''),
-                            minor_degree_name=entry.get('minor', None),
-                            start_date=entry.get('start_date', ''),
-                            end_date=entry.get('end_date', '')
-                        )
-                        education_entries.append(edu_entry)
-                    template_data.education = education_entries
-                    result = f"Updated education section with {len(education_entries)} entries"
-                    
-                elif tool_name == "update_experience":
-                    # Convert each experience entry to proper model
-                    experience_entries = []
-                    for entry in tool_args.get('experience', []):
-                        exp_entry = ExperienceEntry(
-                            work_title=entry.get('title', ''),
-                            work_company=entry.get('company', ''),
-                            work_city=entry.get('city', ''),
-                            work_state=entry.get('state', ''),
-                            work_start_date=entry.get('start_date', ''),
-                            work_end_date=entry.get('end_date', ''),
-                            work_descriptions=entry.get('bullets', [])
-                        )
-                        experience_entries.append(exp_entry)
-                    template_data.experience = experience_entries
-                    result = f"Updated experience section with {len(experience_entries)} entries"
-                    
-                elif tool_name == "update_projects":
-                    # Convert each project entry to proper model
-                    project_entries = []
-                    for entry in tool_args.get('projects', []):
-                        technologies = entry.get('technologies', [])
-                        # Convert technologies list to string if needed
-                        if isinstance(technologies, list):
-                            technologies = ', '.join(technologies)
-                            
-                        proj_entry = ProjectEntry(
-                            project_name=entry.get('name', ''),
-                            project_technologies=technologies,
-                            project_start_date=entry.get('start_date', ''),
-                            project_end_date=entry.get('end_date', ''),
-                            project_bullets=entry.get('bullets', [])
-                        )
-                        project_entries.append(proj_entry)
-                    template_data.projects = project_entries
-                    result = f"Updated projects section with {len(project_entries)} entries"
-                    
-                elif tool_name == "update_skills":
-                    # Convert skills to proper model
-                    skills = tool_args.get('skills', {})
-                    template_data.technical_skills = TechnicalSkills(
-                        languages=', '.join(skills.get('Languages', [])),
-                        frameworks=', '.join(skills.get('Frameworks', [])),
-                        dev_tools=', '.join(skills.get('Tools', [])),
-                        libraries=', '.join(skills.get('Libraries', []))
-                    )
-                    result = "Updated technical skills"
-                    
-                else:
-                    result = f"Unknown tool: {tool_name}"
-                
-                print(f"Tool result: {result}")
-                
-            except Exception as e:
-                print(f"Error processing tool {tool_name}: {str(e)}")
-                result = f"Error: {str(e)}"
-            
-            # Add tool result to messages
-            messages.append({
-                "role": "user",
-                "content": [{
-                    "type": "tool_result",
-                    "tool_use_id": tool_use['id'],
-                    "content": result
-                }]
-            })
+    run_tool_loop(chain, messages, create_template_handlers(template_data), on_event=on_event)
     
     print("\n=== Resume Analysis Complete ===")
     print(f"Final template data: {template_data.model_dump_json(indent=2)}")
@@ -249,7 +224,8 @@ def tailor_resume(
     chain: Any,
     resume_text: str,
     job_description: str,
-    template_data: Optional[LatexTemplateData] = None
+    template_data: Optional[LatexTemplateData] = None,
+    on_event: Optional[ToolEventHook] = None
 ) -> LatexTemplateData:
     """Tailor a resume to a job description.
     
@@ -258,6 +234,8 @@ def tailor_resume(
         resume_text: Original resume content
         job_description: Target job description
         template_data: Optional existing template data. If None, will analyze resume first.
+        on_event: Optional hook called with tool-loop progress events, e.g.
+            `print_tool_event`
         
     Returns:
         LatexTemplateData: Updated template data
@@ -267,7 +245,7 @@ def tailor_resume(
     # If no template data provided, analyze the resume first
     if template_data is None:
         print("\nNo template data provided, analyzing resume first...")
-        template_data = analyze_resume(chain, resume_text)
+        template_data = analyze_resume(chain, resume_text, on_event=on_event)
     
     # Add system message for tailoring
     chain = chain.with_config({
@@ -290,125 +268,8 @@ Current Template Data:
 Please analyze both and update the template data to better match the job requirements."""
     }]
     
-    print("\nStarting tailoring process...")
-    while True:
-        print("\nSending request to Claude...")
-        response = chain.invoke(messages)
-        print("Received response from Claude")
-        
-        # Add assistant's response to messages
-        messages.append({"role": "assistant", "content": response.content})
-        
-        # If no more tool calls, we're done
-        if response.response_metadata.get('stop_reason') != "tool_use":
-            print("No more tool calls, tailoring complete")
-            break
-            
-        # Get all tool use blocks
-        tool_uses = [block for block in response.content if block.get('type') == "tool_use"]
-        print(f"\nProcessing {len(tool_uses)} tool calls")
-        
-        # Process each tool use
-        for tool_use in tool_uses:
-            tool_name = tool_use['name']
-            tool_args = tool_use['input']
-            print(f"\nProcessing tool: {tool_name}")
-            print(f"Tool arguments: {tool_args}")
-            
-            try:
-                # Execute the tool and update template data
-                if tool_name == "update_contact_info":
-                    template_data.name = tool_args.get('name', template_data.name)
-                    template_data.email = tool_args.get('email', template_data.email)
-                    template_data.phone = tool_args.get('phone', template_data.phone)
-                    template_data.linkedin = tool_args.get('linkedin', template_data.linkedin)
-                    template_data.github = tool_args.get('github', template_data.github)
-                    result = "Updated contact information"
-                    
-                elif tool_name == "update_education":
-                    # Convert each education entry to proper model
-                    education_entries = []
-                    for entry in tool_args.get('education', []):
-                        edu_entry = EducationEntry(
-                            university_name=entry.get('university', ''),
-                            university_city=entry.get('city', ''),
-                            university_state=entry.get('state', ''),
-                            major_degree_name=entry.get('degree', ''),
-                            minor_degree_name=entry.get('minor', None),
-                            start_date=entry.get('start_date', ''),
-                            end_date=entry.get('end_date', '')
-                        )
-                        education_entries.append(edu_entry)
-                    template_data.education = education_entries
-                    result = f"Updated education section with {len(education_entries)} entries"
-                    
-                elif tool_name == "update_experience":
-                    # Convert each experience entry to proper model
-                    experience_entries = []
-                    for entry in tool_args.get('experience', []):
-                        exp_entry = ExperienceEntry(
-                            work_title=entry.get('title', ''),
-                            work_company=entry.get('company', ''),
-                            work_city=entry.get('city', ''),
-                            work_state=entry.get('state', ''),
-                            work_start_date=entry.get('start_date', ''),
-                            work_end_date=entry.get('end_date', ''),
-                            work_descriptions=entry.get('bullets', [])
-                        )
-                        experience_entries.append(exp_entry)
-                    template_data.experience = experience_entries
-                    result = f"Updated experience section with {len(experience_entries)} entries"
-                    
-                elif tool_name == "update_projects":
-                    # Convert each project entry to proper model
-                    project_entries = []
-                    for entry in tool_args.get('projects', []):
-                        technologies = entry.get('technologies', [])
-                        # Convert technologies list to string if needed
-                        if isinstance(technologies, list):
-                            technologies = ', '.join(technologies)
-                            
-                        proj_entry = ProjectEntry(
-                            project_name=entry.get('name', ''),
-                            project_technologies=technologies,
-                            project_start_date=entry.get('start_date', ''),
-                            project_end_date=entry.get('end_date', ''),
-                            project_bullets=entry.get('bullets', [])
-                        )
-                        project_entries.append(proj_entry)
-                    template_data.projects = project_entries
-                    result = f"Updated projects section with {len(project_entries)} entries"
-                    
-                elif tool_name == "update_skills":
-                    # Convert skills to proper model
-                    skills = tool_args.get('skills', {})
-                    template_data.technical_skills = TechnicalSkills(
-                        languages=', '.join(skills.get('Languages', [])),
-                        frameworks=', '.join(skills.get('Frameworks', [])),
-                        dev_tools=', '.join(skills.get('Tools', [])),
-                        libraries=', '.join(skills.get('Libraries', []))
-                    )
-                    result = "Updated technical skills"
-                    
-                else:
-                    result = f"Unknown tool: {tool_name}"
-                
-                print(f"Tool result: {result}")
-                
-            except Exception as e:
-                print(f"Error processing tool {tool_name}: {str(e)}")
-                result = f"Error: {str(e)}"
-            
-            # Add tool result to messages
-            messages.append({
-                "role": "user",
-                "content": [{
-                    "type": "tool_result",
-                    "tool_use_id": tool_use['id'],
-                    "content": result
-                }]
-            })
+    run_tool_loop(chain, messages, create_template_handlers(template_data), on_event=on_event)
     
     print("\n=== Resume Tailoring Complete ===")
     print(f"Final template data: {template_data.model_dump_json(indent=2)}")
-    return template_data 
\ No newline at end of file
+    return template_data
@@ -0,0 +1,42 @@
+from datetime import date
+
+import pytest
+
+from resume_wizard.vectordb.candidate_store import CandidateFilter, degree_level, parse_filter
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("gpa>=3.5", CandidateFilter("gpa", ">=", (3.5,))),
+    ("  gpa < 3 ", CandidateFilter("gpa", "<", (3.0,))),
+    ("experience_years>5", CandidateFilter("experience_years", ">", (60.0,))),
+    ("skills ⊇ {Python, AWS, python}", CandidateFilter("skills", "⊇", ("python", "aws"))),
+    ("skills>={js, k8s}", CandidateFilter("skills", "⊇", ("javascript", "kubernetes"))),
+    ("skills!=golang", CandidateFilter("skills", "!=", ("go",))),
+    ("location=Virginia", CandidateFilter("location", "=", ("va",))),
+    ("company=Acme  Corp", CandidateFilter("company", "=", ("acme corp",))),
+    ("graduation<=May 2018", CandidateFilter("graduation", "<=", (date(2018, 5, 1),))),
+    ("GPA>=3", CandidateFilter("gpa", ">=", (3.0,))),
+])
+def test_parse_filter(expression, expected):
+    assert parse_filter(expression) == expected
+
+
+def test_parse_filter_degree_by_level():
+    assert parse_filter("degree>=master") == CandidateFilter("degree", ">=", (degree_level("master"),))
+
+
+@pytest.mark.parametrize("expression", [
+    "",
+    "gpa",
+    "gpa>>3",
+    "bogus=1",
+    "gpa>abc",
+    "gpa ⊇ {3}",
+    "skills<python",
+    "skills ⊇ {}",
+    "degree=wizard",
+    "graduation<=someday",
+])
+def test_parse_filter_rejects(expression):
+    with pytest.raises(ValueError):
+        parse_filter(expression)
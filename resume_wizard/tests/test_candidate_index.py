@@ -0,0 +1,105 @@
+import pytest
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+
+import resume_wizard.vectordb.manager as manager_module
+from resume_wizard.vectordb.candidate_index import CandidateIndex
+from resume_wizard.vectordb.manager import VECTOR_DB_NAME, VectorDBManager
+from resume_wizard.vectordb.searcher import VectorDBSearcher
+from resume_wizard.vectordb.section_index import SectionIndexes
+from resume_wizard.vectordb.storage import save_snapshot
+
+DIM = 8
+
+JANE = {
+    "name": "Jane Doe",
+    "email": "jane.doe@example.com",
+    "skills": {"languages": ["Python", "Go"]},
+    "objective": "Backend engineering",
+    "experience": [{"position": "Engineer", "company": "Acme", "description": "Built APIs"}],
+    "projects": [{"name": "Resume Wizard", "description": "Parses resumes"}],
+}
+
+
+@pytest.fixture
+def index():
+    index = CandidateIndex()
+    index.add("jane.pdf", "Jane Doe", "jane.doe@example.com")
+    index.add("john.pdf", "John Smith", "jsmith@example.com")
+    index.add("janet.pdf", "Janet Dawson", None)
+    return index
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(manager_module, "VECTOR_DB_DIR", tmp_path)
+    return VectorDBManager("sk-test")
+
+
+def _sources(matches):
+    return [source for source, _ in matches]
+
+
+def test_exact_name(index):
+    assert index.lookup("Jane Doe")[0] == ("jane.pdf", 1.0)
+
+
+def test_email(index):
+    assert index.lookup("jsmith@example.com")[0] == ("john.pdf", 1.0)
+    assert index.lookup("jsmith")[0] == ("john.pdf", 1.0)
+
+
+def test_typo(index):
+    assert _sources(index.lookup("Jnae Doe"))[0] == "jane.pdf"
+    assert _sources(index.lookup("jonh smith"))[0] == "john.pdf"
+
+
+def test_prefix(index):
+    assert set(_sources(index.lookup("jan"))) == {"jane.pdf", "janet.pdf"}
+    assert _sources(index.lookup("daws")) == ["janet.pdf"]
+
+
+def test_reordered_name(index):
+    assert _sources(index.lookup("smith john"))[0] == "john.pdf"
+
+
+def test_no_match(index):
+    assert index.lookup("zzzz") == []
+    assert index.lookup("  ") == []
+
+
+def test_every_document_keeps_the_candidate_identity(manager):
+    documents = manager._process_resume_data(JANE, "jane.pdf")
+    assert {doc.metadata["section"] for doc in documents} == {
+        "skills", "objective", "experience", "projects"
+    }
+    for doc in documents:
+        assert doc.metadata["name"] == "Jane Doe"
+        assert doc.metadata["email"] == "jane.doe@example.com"
+    (project,) = [doc for doc in documents if doc.metadata["section"] == "projects"]
+    assert project.metadata["project_name"] == "Resume Wizard"
+
+
+def test_backfill_identities(manager, tmp_path):
+    # Documents as indexed before identities were attached
+    documents = manager._process_resume_data(JANE, "jane.pdf")
+    for doc in documents:
+        doc.metadata = {
+            key: value for key, value in doc.metadata.items() if key not in ("name", "email")
+        }
+        if "project_name" in doc.metadata:
+            doc.metadata["name"] = doc.metadata.pop("project_name")
+    db = FAISS.from_documents(documents, FakeEmbeddings(size=DIM))
+    save_snapshot(db, SectionIndexes.build(db, "Flat"), tmp_path, VECTOR_DB_NAME, wal_seq=0)
+    manager.candidate_store.upsert_many([("jane.pdf", JANE)])
+
+    assert manager.backfill_identities() == len(documents)
+    assert manager.backfill_identities() == 0
+
+    searcher = VectorDBSearcher(tmp_path, VECTOR_DB_NAME, FakeEmbeddings(size=DIM))
+    assert searcher.metadata_schema["name"] == ["Jane Doe"]
+    found = searcher.find_candidate_documents("Jnae Doe")
+    assert len(found) == len(documents)
+    assert {result["metadata"]["name"] for result in found} == {"Jane Doe"}
+    (project,) = searcher.filter_documents(section="projects", candidate_name="Jane Doe")
+    assert project["metadata"]["project_name"] == "Resume Wizard"
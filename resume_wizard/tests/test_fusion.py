@@ -0,0 +1,55 @@
+import pytest
+from langchain_core.documents import Document
+
+from resume_wizard.vectordb.fusion import RRF_K, reciprocal_rank_fusion
+
+
+def _doc(doc_id):
+    return Document(id=doc_id, page_content=f"content {doc_id}")
+
+
+def _ids(fused):
+    return [doc.id for doc, _ in fused]
+
+
+def test_documents_in_both_lists_rank_first():
+    vector = [(_doc("a"), 0.9), (_doc("b"), 0.8), (_doc("c"), 0.7)]
+    lexical = [(_doc("c"), 12.0), (_doc("d"), 9.0), (_doc("a"), 4.0)]
+    assert _ids(reciprocal_rank_fusion([vector, lexical])) == ["a", "c", "b", "d"]
+
+
+def test_ties_keep_first_seen_order():
+    fused = reciprocal_rank_fusion([[(_doc("a"), 1.0)], [(_doc("b"), 1.0)]])
+    assert _ids(fused) == ["a", "b"]
+    assert fused[0][1] == fused[1][1]
+
+
+def test_ignores_input_scores():
+    fused = reciprocal_rank_fusion([[(_doc("a"), 0.1), (_doc("b"), 1000.0)]])
+    assert _ids(fused) == ["a", "b"]
+
+
+def test_scores_are_normalized():
+    fused = dict(
+        (doc.id, score)
+        for doc, score in reciprocal_rank_fusion([
+            [(_doc("a"), 0.0), (_doc("b"), 0.0)],
+            [(_doc("a"), 0.0)],
+        ])
+    )
+    assert fused["a"] == pytest.approx(1.0)
+    assert fused["b"] == pytest.approx((1 / (RRF_K + 2)) / (2 / (RRF_K + 1)))
+
+
+def test_documents_without_ids_match_on_content():
+    first = Document(page_content="Python", metadata={"source": "a.pdf", "section": "skills"})
+    same = Document(page_content="Python", metadata={"source": "a.pdf", "section": "skills"})
+    other = Document(page_content="Python", metadata={"source": "b.pdf", "section": "skills"})
+    fused = reciprocal_rank_fusion([[(first, 0.0)], [(other, 0.0), (same, 0.0)]])
+    assert len(fused) == 2
+    assert fused[0][0] is first
+
+
+def test_empty():
+    assert reciprocal_rank_fusion([]) == []
+    assert reciprocal_rank_fusion([[], []]) == []
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+
+from langchain_core.documents import Document
+
+import resume_wizard.wizard.rezwiz as rezwiz
+
+CONTACT_INFO = {"name": "Jane Doe", "email": "jane.doe@example.com", "phone": "5555550100"}
+
+def _fake_sections(extract):
+    return [(name, lambda api_key, tools: None, extract) for name in ("First", "Second")]
+
+
+def test_sections_overlap_by_default(monkeypatch):
+    # Each section waits for the other, so this only finishes if they run at once
+    barrier = threading.Barrier(2, timeout=5)
+
+    def extract(chain, resume_text, tools, on_event=None):
+        barrier.wait()
+        tools.parser_helper.contact_info = CONTACT_INFO
+        return "Assistant: done"
+
+    monkeypatch.setattr(rezwiz, "parse_single_pdf", lambda name: [Document(page_content="resume")])
+    monkeypatch.setattr(rezwiz, "SECTIONS", _fake_sections(extract))
+
+    assert rezwiz.DEFAULT_SECTION_CONCURRENCY > 1
+    updates = list(rezwiz.run_resume_wizard("resume.pdf", stream=True, use_cache=False))
+    assert sum("Finished" in update for update in updates) == 2
+    assert CONTACT_INFO["email"] in updates[-1]
+
+
+class RecordingCache:
+    """Extraction cache stand-in that records which thread each call runs on."""
+
+    def __init__(self, threads):
+        self.threads = threads
+        self.stored = {}
+
+    def get(self, pdf_sha256, engine):
+        self.threads.append(("get", threading.get_ident()))
+        return self.stored.get(pdf_sha256)
+
+    def put(self, pdf_sha256, resume_data, engine):
+        self.threads.append(("put", threading.get_ident()))
+        self.stored[pdf_sha256] = resume_data
+
+
+def test_async_cache_stays_off_the_event_loop(monkeypatch):
+    threads = []
+    cache = RecordingCache(threads)
+
+    def open_cache():
+        threads.append(("open", threading.get_ident()))
+        return cache
+
+    async def aextract(chain, resume_text, tools, on_event=None):
+        tools.parser_helper.contact_info = CONTACT_INFO
+        return "Assistant: done"
+
+    monkeypatch.setattr(rezwiz, "get_extraction_cache", open_cache)
+    monkeypatch.setattr(rezwiz, "hash_pdf", lambda path: "digest")
+    monkeypatch.setattr(rezwiz, "parse_single_pdf", lambda name: [Document(page_content="resume")])
+    monkeypatch.setattr(rezwiz, "SECTIONS", _fake_sections(None))
+    monkeypatch.setattr(rezwiz, "ASYNC_EXTRACTORS", {"First": aextract, "Second": aextract})
+
+    async def run_twice():
+        loop_thread = threading.get_ident()
+        first = await rezwiz.arun_resume_wizard("resume.pdf")
+        second = await rezwiz.arun_resume_wizard("resume.pdf")
+        return loop_thread, first, second
+
+    loop_thread, first, second = asyncio.run(run_twice())
+    assert first == second
+    assert [call for call, _ in threads] == ["open", "get", "put", "open", "get"]
+    assert all(thread != loop_thread for _, thread in threads)
@@ -0,0 +1,144 @@
+import json
+
+import numpy as np
+import pytest
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+from resume_wizard.vectordb.section_index import SectionIndexes
+from resume_wizard.vectordb.storage import (
+    WriteAheadLog,
+    load_snapshot,
+    recover_snapshot,
+    save_snapshot
+)
+
+INDEX_NAME = "resume_db"
+DIM = 8
+
+
+@pytest.fixture
+def log(tmp_path):
+    return WriteAheadLog(tmp_path, INDEX_NAME)
+
+
+def _append(log, doc_id):
+    return log.append([Document(id=doc_id, page_content=doc_id)], np.ones((1, DIM), dtype=np.float32))
+
+
+def _logged_ids(log, after_seq=0):
+    return [doc.id for record in log.records(after_seq) for doc in record.documents]
+
+
+def _db():
+    return FAISS.from_texts(
+        ["Python, AWS", "Seeking a backend role"],
+        FakeEmbeddings(size=DIM),
+        metadatas=[
+            {"source": "a.pdf", "section": "skills"},
+            {"source": "a.pdf", "section": "objective"},
+        ],
+        ids=["a-skills", "a-objective"],
+    )
+
+
+def _staging(tmp_path):
+    return tmp_path / f".{INDEX_NAME}.staging"
+
+
+def test_log_round_trip(log):
+    assert [_append(log, name) for name in ("a", "b", "c")] == [1, 2, 3]
+    assert _logged_ids(log) == ["a", "b", "c"]
+    assert _logged_ids(log, after_seq=2) == ["c"]
+    assert log.last_seq() == 3
+
+
+def test_torn_tail_is_ignored_and_overwritten(log):
+    _append(log, "a")
+    _append(log, "b")
+    with open(log.path, "r+b") as f:
+        f.truncate(log.size() - 5)
+
+    reopened = WriteAheadLog(log.folder, INDEX_NAME)
+    assert _logged_ids(reopened) == ["a"]
+    assert reopened.last_seq() == 1
+
+    assert _append(reopened, "c") == 2
+    assert _logged_ids(reopened) == ["a", "c"]
+
+
+def test_corrupt_tail_is_ignored(log):
+    _append(log, "a")
+    _append(log, "b")
+    data = bytearray(log.path.read_bytes())
+    data[-1] ^= 0xFF
+    log.path.write_bytes(bytes(data))
+
+    reopened = WriteAheadLog(log.folder, INDEX_NAME)
+    assert _logged_ids(reopened) == ["a"]
+    assert _append(reopened, "c") == 2
+    assert _logged_ids(reopened) == ["a", "c"]
+
+
+def test_garbage_after_last_record_is_ignored(log):
+    _append(log, "a")
+    with open(log.path, "ab") as f:
+        f.write(b"not a record")
+    assert _logged_ids(WriteAheadLog(log.folder, INDEX_NAME)) == ["a"]
+
+
+def test_truncate_through(log):
+    for name in ("a", "b", "c"):
+        _append(log, name)
+    log.truncate_through(2)
+    assert _logged_ids(log) == ["c"]
+    assert _append(log, "d") == 4
+
+
+def test_ready_staging_is_installed(tmp_path):
+    staging = _staging(tmp_path)
+    staging.mkdir()
+    (staging / f"{INDEX_NAME}.extra").write_text("new")
+    (staging / f"{INDEX_NAME}.snapshot.json").write_text(json.dumps({"wal_seq": 7}))
+    (staging / "READY").touch()
+    (tmp_path / f"{INDEX_NAME}.extra").write_text("old")
+
+    recover_snapshot(tmp_path, INDEX_NAME)
+
+    assert not staging.exists()
+    assert (tmp_path / f"{INDEX_NAME}.extra").read_text() == "new"
+    assert WriteAheadLog(tmp_path, INDEX_NAME).snapshot_seq() == 7
+
+
+def test_unready_staging_is_left_for_the_next_save(tmp_path):
+    db = _db()
+    save_snapshot(db, SectionIndexes.build(db, "Flat"), tmp_path, INDEX_NAME, wal_seq=0)
+    saved = (tmp_path / f"{INDEX_NAME}.snapshot.json").read_text()
+
+    # An abandoned save, or one still writing
+    staging = _staging(tmp_path)
+    staging.mkdir()
+    (staging / f"{INDEX_NAME}.snapshot.json").write_text(json.dumps({"wal_seq": 99}))
+
+    recover_snapshot(tmp_path, INDEX_NAME)
+    assert staging.exists()
+    assert (tmp_path / f"{INDEX_NAME}.snapshot.json").read_text() == saved
+    loaded, wal_seq = load_snapshot(tmp_path, INDEX_NAME, FakeEmbeddings(size=DIM))
+    assert (loaded.index.ntotal, wal_seq) == (2, 0)
+
+    save_snapshot(db, SectionIndexes.build(db, "Flat"), tmp_path, INDEX_NAME, wal_seq=3)
+    assert not staging.exists()
+    assert WriteAheadLog(tmp_path, INDEX_NAME).snapshot_seq() == 3
+
+
+def test_load_replays_log_after_snapshot(tmp_path):
+    db = _db()
+    save_snapshot(db, SectionIndexes.build(db, "Flat"), tmp_path, INDEX_NAME, wal_seq=0)
+    log = WriteAheadLog(tmp_path, INDEX_NAME)
+    _append(log, "b-skills")
+
+    loaded, wal_seq = load_snapshot(tmp_path, INDEX_NAME, FakeEmbeddings(size=DIM))
+    assert wal_seq == 1
+    assert loaded.index.ntotal == 3
+    assert loaded.docstore.search("b-skills").page_content == "b-skills"
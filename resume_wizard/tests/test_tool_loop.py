@@ -0,0 +1,65 @@
+import asyncio
+from types import SimpleNamespace
+
+from resume_wizard.ai.chains.skills.chain import aextract_skills, extract_skills
+from resume_wizard.ai.tool_loop import run_tool_loop
+from resume_wizard.ai.tools import _ResumeParserHelper, _ResumeParsingTools
+from resume_wizard.wizard.rezwiz import format_conversation
+
+
+class EndlessToolChain:
+    """Stub chat model that asks for the same tool on every turn and never stops."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        return SimpleNamespace(
+            content=[{
+                "type": "tool_use",
+                "id": f"call-{self.calls}",
+                "name": "add_programming_languages",
+                "input": {"languages": [f"Lang{self.calls}"]},
+            }],
+            response_metadata={"stop_reason": "tool_use"},
+            usage_metadata={"input_tokens": 1, "output_tokens": 1},
+        )
+
+    async def ainvoke(self, messages):
+        return self.invoke(messages)
+
+
+def _parser_tools(helper=None):
+    return _ResumeParsingTools(parser_helper=helper or _ResumeParserHelper())
+
+
+def test_loop_stops_at_max_turns():
+    chain = EndlessToolChain()
+    result = run_tool_loop(chain, [], {"add_programming_languages": lambda languages: "ok"}, max_turns=3)
+    assert chain.calls == 3
+    assert result.hit_max_turns
+    assert result.final_text is None
+    assert result.tool_calls == 3
+
+
+def test_extract_keeps_partial_result_at_max_turns(capsys):
+    chain = EndlessToolChain()
+    helper = _ResumeParserHelper()
+    text = extract_skills(chain, "resume text", _parser_tools(helper))
+    assert text == ""
+    assert chain.calls > 0
+    assert {"Lang1", f"Lang{chain.calls}"} <= set(helper.skills["languages"])
+    assert "Warning: Skills extraction stopped" in capsys.readouterr().out
+    assert format_conversation(text) == ""
+
+
+def test_async_extract_at_max_turns():
+    text = asyncio.run(aextract_skills(EndlessToolChain(), "resume text", _parser_tools()))
+    assert text == ""
+
+
+def test_format_conversation_tolerates_nothing():
+    assert format_conversation(None) == ""
+    assert format_conversation("") == ""
+    assert format_conversation("Human: hi") == "\n🧑 User:\n  hi"
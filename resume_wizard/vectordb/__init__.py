@@ -1,4 +1,25 @@
 from .manager import VectorDBManager
 from .searcher import VectorDBSearcher
+from .candidate_index import CandidateIndex
+from .candidate_store import CandidateStore
+from .docstore import SQLiteDocstore
+from .lexical_index import LexicalIndex
+from .embedding_cache import (
+    CachedEmbeddings,
+    EmbeddingStore,
+    QueryEmbeddingCache,
+    get_embedding_store
+)
 
-__all__ = ["VectorDBManager", "VectorDBSearcher"]
+__all__ = [
+    "VectorDBManager",
+    "VectorDBSearcher",
+    "CandidateIndex",
+    "CandidateStore",
+    "SQLiteDocstore",
+    "LexicalIndex",
+    "CachedEmbeddings",
+    "EmbeddingStore",
+    "QueryEmbeddingCache",
+    "get_embedding_store"
+]
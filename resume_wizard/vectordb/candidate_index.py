@@ -0,0 +1,147 @@
+"""In-memory fuzzy index of candidate names and emails.
+
+Every candidate (one resume file) is indexed under a few terms: the full
+name, each name part, the full email and the email's local part. A lookup
+matches those terms by prefix first and then by trigram similarity, so
+partial names ("spenc"), reordered names and small typos ("jonh smith")
+still find the right resume.
+"""
+from __future__ import annotations
+
+import bisect
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Dict, List, Optional, Set, Tuple
+
+# Minimum trigram similarity (Dice coefficient) for a fuzzy match
+DEFAULT_MIN_SIMILARITY = 0.4
+
+# Score given to terms that start with the query, above any fuzzy match
+_PREFIX_SCORE = 0.95
+
+
+def normalize_identity(text: str) -> str:
+    """Lowercase, strip accents and collapse everything but letters, digits, '@' and '.'."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return " ".join(re.sub(r"[^a-z0-9@.]+", " ", text).split())
+
+
+def trigrams(term: str) -> Set[str]:
+    """Return the character trigrams of a term padded with one space each side.
+
+    Unlike pg_trgm there is no two-space leading trigram; it would be shared
+    by every term starting with the same letter and dominate lookup time.
+    """
+    padded = f" {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CandidateIndex:
+    """Trigram and prefix index from candidate names and emails to resume files."""
+
+    def __init__(self):
+        self._terms: List[str] = []  # sorted on first lookup after an add, for prefix search
+        self._terms_sorted = True
+        self._term_sources: Dict[str, Set[str]] = defaultdict(set)
+        self._term_trigrams: Dict[str, Set[str]] = {}
+        self._trigram_terms: Dict[str, Set[str]] = defaultdict(set)
+        self.identities: Dict[str, Dict[str, Optional[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.identities)
+
+    def add(self, source: str, name: Optional[str] = None, email: Optional[str] = None) -> None:
+        """Index a candidate's name and email under their resume file."""
+        identity = self.identities.setdefault(source, {"name": None, "email": None})
+        identity["name"] = name or identity["name"]
+        identity["email"] = email or identity["email"]
+
+        terms: Set[str] = set()
+        if name:
+            full_name = normalize_identity(name)
+            terms.add(full_name)
+            terms.update(full_name.split())
+        if email:
+            full_email = normalize_identity(email)
+            terms.add(full_email)
+            terms.add(full_email.split("@")[0])
+        for term in terms:
+            if not term:
+                continue
+            if term not in self._term_trigrams:
+                self._terms.append(term)
+                self._terms_sorted = False
+                self._term_trigrams[term] = trigrams(term)
+                for trigram in self._term_trigrams[term]:
+                    self._trigram_terms[trigram].add(term)
+            self._term_sources[term].add(source)
+
+    def lookup(
+        self,
+        query: str,
+        *,
+        limit: int = 10,
+        min_similarity: float = DEFAULT_MIN_SIMILARITY
+    ) -> List[Tuple[str, float]]:
+        """Return the resume files best matching a name or email, best first.
+
+        A term equal to the query scores 1.0 and a term starting with it
+        scores 0.95; other terms score their trigram similarity with the
+        query. Multi-word queries also score each word and average them, so
+        "smith john" matches "John Smith". Each candidate keeps its best score.
+
+        Args:
+            query: Full or partial name or email
+            limit: Maximum number of candidates to return
+            min_similarity: Minimum trigram similarity for fuzzy matches
+
+        Returns:
+            List[Tuple[str, float]]: (source file, score) pairs
+        """
+        normalized = normalize_identity(query)
+        if not normalized:
+            return []
+        if not self._terms_sorted:
+            self._terms.sort()
+            self._terms_sorted = True
+
+        scores = self._score_term(normalized, min_similarity)
+        words = normalized.split()
+        if len(words) > 1:
+            per_word = [self._score_term(word, min_similarity) for word in words]
+            for source in set().union(*per_word):
+                combined = sum(word_scores.get(source, 0.0) for word_scores in per_word) / len(words)
+                if combined >= min_similarity:
+                    scores[source] = max(scores.get(source, 0.0), combined)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def _score_term(self, query: str, min_similarity: float) -> Dict[str, float]:
+        """Best score per source for one normalized query term."""
+        term_scores: Dict[str, float] = {}
+
+        position = bisect.bisect_left(self._terms, query)
+        while position < len(self._terms) and self._terms[position].startswith(query):
+            term = self._terms[position]
+            term_scores[term] = 1.0 if term == query else _PREFIX_SCORE
+            position += 1
+
+        query_trigrams = trigrams(query)
+        shared = Counter(chain.from_iterable(
+            self._trigram_terms.get(trigram, ()) for trigram in query_trigrams
+        ))
+        for term, count in shared.items():
+            similarity = 2 * count / (len(query_trigrams) + len(self._term_trigrams[term]))
+            if similarity >= min_similarity and similarity > term_scores.get(term, 0.0):
+                term_scores[term] = similarity
+
+        source_scores: Dict[str, float] = {}
+        for term, score in term_scores.items():
+            for source in self._term_sources[term]:
+                if score > source_scores.get(source, 0.0):
+                    source_scores[source] = score
+        return source_scores
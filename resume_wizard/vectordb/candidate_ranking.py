@@ -0,0 +1,119 @@
+"""Candidate-level ranking from section-level search hits.
+
+A vector search returns resume sections. `rank_sources` turns the hits of a
+single FAISS pass into a ranking of candidates (resume ``source`` files):
+
+1. Each candidate keeps only its best hit per section, so a resume with
+   three experience entries doesn't count experience three times.
+2. Section scores are measured from a floor, by default the weakest hit
+   fetched: a section that wasn't fetched at all scores no better than
+   that, so it contributes nothing. The result is multiplied by the
+   section's weight. Relevance scores can be negative for L2 distances, so
+   a fixed floor of 0 would throw away most real matches.
+3. The weighted section scores are reduced per candidate, either summed
+   (``weighted_sum``, which rewards candidates who match in several
+   sections) or by taking the best one (``max``).
+
+Every step is a NumPy reduction over the hit arrays; Python only loops
+over the candidates that are returned.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+AGGREGATIONS = ("weighted_sum", "max")
+
+# Weight of each section's best score in a candidate's score
+DEFAULT_SECTION_WEIGHTS: Dict[str, float] = {
+    "skills": 1.0,
+    "experience": 1.0,
+    "projects": 0.8,
+    "education": 0.5,
+    "objective": 0.5,
+    "basic_info": 0.25,
+}
+
+# Weight of sections missing from the weights
+UNLISTED_SECTION_WEIGHT = 0.5
+
+
+class RankedSource(NamedTuple):
+    """One candidate's aggregate score and its best hits, best first."""
+    source: str
+    score: float
+    hits: np.ndarray
+
+
+def rank_sources(
+    sources: np.ndarray,
+    sections: np.ndarray,
+    scores: np.ndarray,
+    *,
+    aggregation: str = "weighted_sum",
+    section_weights: Optional[Dict[str, float]] = None,
+    limit: int = 5,
+    hits_per_source: int = 3,
+    floor: Optional[float] = None
+) -> List[RankedSource]:
+    """Rank the sources of section hits by their aggregated, weighted scores.
+
+    Args:
+        sources: Source file of each hit
+        sections: Section of each hit
+        scores: Relevance score of each hit, higher is better
+        aggregation: One of `AGGREGATIONS`
+        section_weights: Weights overriding `DEFAULT_SECTION_WEIGHTS`
+        limit: Maximum number of sources to return
+        hits_per_source: Maximum number of hits to return per source, at
+            most one per section
+        floor: Score that counts as no match, or None for the lowest score
+            among the hits
+
+    Returns:
+        List[RankedSource]: Best sources first, ties broken by the source's
+            best raw score
+    """
+    if aggregation not in AGGREGATIONS:
+        raise ValueError(f"aggregation must be one of {AGGREGATIONS}, got {aggregation!r}")
+    scores = np.asarray(scores, dtype=np.float64)
+    if len(scores) == 0 or limit <= 0:
+        return []
+    source_names, source_codes = np.unique(np.asarray(sources).astype(str), return_inverse=True)
+    section_names, section_codes = np.unique(np.asarray(sections).astype(str), return_inverse=True)
+    weights_by_section = {**DEFAULT_SECTION_WEIGHTS, **(section_weights or {})}
+    weights = np.array([
+        weights_by_section.get(name, UNLISTED_SECTION_WEIGHT) for name in section_names
+    ])
+
+    # Best hit of every (source, section) pair: the first one once sorted best first
+    order = np.argsort(-scores, kind="stable")
+    pairs = source_codes[order] * len(section_names) + section_codes[order]
+    _, first = np.unique(pairs, return_index=True)
+    best = order[first]
+    best_sources = source_codes[best]
+    floor = scores.min() if floor is None else floor
+    weighted = np.clip(scores[best] - floor, 0.0, None) * weights[section_codes[best]]
+
+    if aggregation == "weighted_sum":
+        totals = np.bincount(best_sources, weights=weighted, minlength=len(source_names))
+    else:
+        totals = np.zeros(len(source_names))
+        np.maximum.at(totals, best_sources, weighted)
+    best_raw = np.full(len(source_names), -np.inf)
+    np.maximum.at(best_raw, source_codes, scores)
+    ranked = np.lexsort((-best_raw, -totals))[:limit]
+
+    # Pairs grouped by source, each group ordered by weighted then raw score
+    by_source = np.lexsort((-scores[best], -weighted, best_sources))
+    group_starts = np.searchsorted(best_sources[by_source], np.arange(len(source_names)))
+    group_ends = np.append(group_starts[1:], len(by_source))
+    return [
+        RankedSource(
+            source=str(source_names[code]),
+            score=float(totals[code]),
+            hits=best[by_source[group_starts[code]:min(group_ends[code], group_starts[code] + hits_per_source)]],
+        )
+        for code in ranked
+    ]
@@ -0,0 +1,503 @@
+"""Structured candidate store for filtering resumes by extracted fields.
+
+The vector index keeps only the text of each resume section. `CandidateStore`
+keeps the full `ResumeAnalysisSchema` extraction of every resume in SQLite,
+alongside normalized, indexed columns that searches can filter on before any
+vector is compared:
+
+- ``candidates``: one row per resume ``source`` with the raw extraction as
+  JSON, the best GPA, highest degree level, latest graduation date and
+  total months of experience (overlapping positions counted once)
+- ``education`` and ``experience``: one row per entry with dates
+  normalized to the first of their month
+- ``candidate_terms``: normalized ``(kind, term)`` pairs per resume for the
+  set-valued fields: skills (skill categories plus the technologies of
+  positions and projects), locations, companies and institutions
+
+Filters are short expressions parsed by `parse_filter`::
+
+    gpa>=3.5
+    skills ⊇ {python, aws}      (or skills>={python, aws})
+    location=VA
+    degree>=master
+    graduation<=2025-06
+    experience_years>2
+
+`CandidateStore.matching_sources` returns the resumes matching all of them.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    create_engine,
+    delete,
+    distinct,
+    func,
+    select,
+)
+
+# Most candidate filters accepted in one search
+MAX_CANDIDATE_FILTERS = int(os.getenv("RESUME_WIZARD_MAX_CANDIDATE_FILTERS", "16"))
+
+_metadata = MetaData()
+
+_candidates = Table(
+    "candidates",
+    _metadata,
+    Column("source", String, primary_key=True),
+    Column("name", String),
+    Column("email", String, index=True),
+    Column("gpa", Float, index=True),
+    Column("degree_level", Integer, index=True),
+    Column("graduation", Date, index=True),
+    Column("experience_months", Integer, index=True),
+    Column("data", Text, nullable=False),
+)
+
+_education = Table(
+    "education",
+    _metadata,
+    Column("source", String, nullable=False, index=True),
+    Column("institution", String),
+    Column("location", String),
+    Column("degree", String),
+    Column("degree_level", Integer),
+    Column("gpa", Float),
+    Column("start_date", Date),
+    Column("end_date", Date),
+)
+
+_experience = Table(
+    "experience",
+    _metadata,
+    Column("source", String, nullable=False, index=True),
+    Column("position", String),
+    Column("company", String),
+    Column("location", String),
+    Column("start_date", Date),
+    Column("end_date", Date),
+    Column("ongoing", Boolean),
+)
+
+_terms = Table(
+    "candidate_terms",
+    _metadata,
+    Column("source", String, nullable=False, index=True),
+    Column("kind", String(16), nullable=False),
+    Column("term", String, nullable=False),
+    Index("ix_candidate_terms_kind_term", "kind", "term", "source"),
+)
+
+# Degree levels, highest first so "master of business" isn't read as a bachelor's
+DEGREE_LEVELS: Tuple[Tuple[str, int, str], ...] = (
+    ("doctorate", 4, r"\b(?:ph\.?\s?d|doctor(?:ate)?|d\.?phil|ed\.?d)\b"),
+    ("master", 3, r"\b(?:master'?s?|m\.?s\.?c?|m\.?a|m\.?eng|mba|m\.?b\.?a)\b"),
+    ("bachelor", 2, r"\b(?:bachelor'?s?|b\.?s\.?c?|b\.?a|b\.?eng|b\.?b\.?a)\b"),
+    # Abbreviations need their dots here; a bare "as" is just a word
+    ("associate", 1, r"\b(?:associate'?s?|a\.a\.(?:s\.)?|a\.s\.)"),
+)
+
+# Common alternative spellings of skills, mapped to one name
+SKILL_ALIASES = {
+    "amazon web services": "aws",
+    "golang": "go",
+    "js": "javascript",
+    "ts": "typescript",
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "react.js": "react",
+    "reactjs": "react",
+    "gcp": "google cloud",
+    "google cloud platform": "google cloud",
+    "ms sql server": "sql server",
+}
+
+US_STATES = {
+    "alabama": "al", "alaska": "ak", "arizona": "az", "arkansas": "ar", "california": "ca",
+    "colorado": "co", "connecticut": "ct", "delaware": "de", "district of columbia": "dc",
+    "florida": "fl", "georgia": "ga", "hawaii": "hi", "idaho": "id", "illinois": "il",
+    "indiana": "in", "iowa": "ia", "kansas": "ks", "kentucky": "ky", "louisiana": "la",
+    "maine": "me", "maryland": "md", "massachusetts": "ma", "michigan": "mi",
+    "minnesota": "mn", "mississippi": "ms", "missouri": "mo", "montana": "mt",
+    "nebraska": "ne", "nevada": "nv", "new hampshire": "nh", "new jersey": "nj",
+    "new mexico": "nm", "new york": "ny", "north carolina": "nc", "north dakota": "nd",
+    "ohio": "oh", "oklahoma": "ok", "oregon": "or", "pennsylvania": "pa",
+    "rhode island": "ri", "south carolina": "sc", "south dakota": "sd", "tennessee": "tn",
+    "texas": "tx", "utah": "ut", "vermont": "vt", "virginia": "va", "washington": "wa",
+    "west virginia": "wv", "wisconsin": "wi", "wyoming": "wy",
+}
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6, "jul": 7, "aug": 8,
+    "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+    # Academic terms
+    "spring": 1, "summer": 6, "fall": 9, "autumn": 9, "winter": 12,
+}
+_ONGOING_DATES = {"present", "current", "now", "ongoing", "today"}
+
+
+def normalize_date(text: Optional[str]) -> Optional[date]:
+    """Parse a resume date ("Sept 2019", "05/2021", "2021-05", "2021") to the first of its month.
+
+    Returns None for missing, ongoing ("Present") and unparseable dates.
+    """
+    if not text:
+        return None
+    text = str(text).strip().lower()
+    if text in _ONGOING_DATES:
+        return None
+    match = re.search(r"\b(\d{4})[-/.](\d{1,2})\b", text)
+    if match:
+        year, month = int(match.group(1)), int(match.group(2))
+    else:
+        match = re.search(r"\b(\d{1,2})[-/.](\d{4})\b", text)
+        if match:
+            month, year = int(match.group(1)), int(match.group(2))
+        else:
+            match = re.search(r"\b(\d{4})\b", text)
+            if not match:
+                return None
+            year = int(match.group(1))
+            month = next(
+                (number for name, number in _MONTHS.items() if re.search(rf"\b{name}", text)), 1
+            )
+    if not 1 <= month <= 12 or not 1900 <= year <= 2200:
+        return None
+    return date(year, month, 1)
+
+
+def degree_level(degree: Optional[str]) -> int:
+    """Level of a degree: 4 doctorate, 3 master, 2 bachelor, 1 associate, 0 unknown."""
+    if not degree:
+        return 0
+    degree = degree.lower()
+    for _, level, pattern in DEGREE_LEVELS:
+        if re.search(pattern, degree):
+            return level
+    return 0
+
+
+def normalize_term(text: str) -> str:
+    """Lowercase and collapse whitespace."""
+    return " ".join(str(text).lower().split())
+
+
+def normalize_skill(skill: str) -> str:
+    skill = normalize_term(skill)
+    return SKILL_ALIASES.get(skill, skill)
+
+
+def location_terms(location: Optional[str]) -> Set[str]:
+    """Terms a location matches: the whole location and each comma-separated part.
+
+    US state names are replaced by their codes, so "Arlington, Virginia"
+    matches ``location=VA`` and ``location=Virginia`` alike.
+    """
+    if not location:
+        return set()
+    parts = [normalize_term(part) for part in str(location).split(",")]
+    parts = [US_STATES.get(part, part) for part in parts if part]
+    terms = set(parts)
+    if len(parts) > 1:
+        terms.add(", ".join(parts))
+    return terms
+
+
+def experience_months(intervals: Iterable[Tuple[Optional[date], Optional[date], bool]], today: date) -> int:
+    """Total months covered by experience entries, counting overlaps once.
+
+    Entries without a start date are skipped; ongoing entries, and entries
+    whose end date is missing or in the future, run until ``today``.
+    """
+    spans = []
+    for start, end, ongoing in intervals:
+        if start is None:
+            continue
+        end = today if ongoing or end is None or end > today else end
+        if end >= start:
+            spans.append((start.year * 12 + start.month, end.year * 12 + end.month))
+    total, current_start, current_end = 0, None, None
+    for start, end in sorted(spans):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+class CandidateFilter(NamedTuple):
+    """A parsed filter expression."""
+    field: str
+    op: str
+    values: Tuple[Any, ...]
+
+
+# Filterable fields: set fields match `candidate_terms` of that kind, the
+# others a `candidates` column
+_TERM_FIELDS = ("skills", "location", "company", "institution")
+_COLUMNS = {
+    "gpa": _candidates.c.gpa,
+    "experience_years": _candidates.c.experience_months,
+    "degree": _candidates.c.degree_level,
+    "graduation": _candidates.c.graduation,
+}
+FILTER_FIELDS = (*_COLUMNS, *_TERM_FIELDS)
+
+_FILTER = re.compile(r"^\s*([a-z_]+)\s*(⊇|>=|<=|!=|=|>|<)\s*(.+?)\s*$", re.IGNORECASE)
+
+
+def parse_filter(expression: str) -> CandidateFilter:
+    """Parse a filter expression such as ``gpa>=3.5`` or ``skills ⊇ {python, aws}``.
+
+    Numeric (``gpa``, ``experience_years``), ``degree`` (by level, e.g.
+    ``degree>=master``) and date (``graduation``) fields take ``=``, ``!=``,
+    ``<``, ``<=``, ``>`` and ``>=``. Set fields (``skills``, ``location``,
+    ``company``, ``institution``) take ``=`` and ``!=`` with one value and
+    ``⊇`` (or ``>=``) with a ``{...}`` list the candidate must have all of.
+
+    Raises:
+        ValueError: If the expression, field, operator or value is invalid
+    """
+    match = _FILTER.match(expression)
+    if not match:
+        raise ValueError(f"Invalid candidate filter: {expression!r}")
+    field, op, raw = match.group(1).lower(), match.group(2), match.group(3)
+    if field not in FILTER_FIELDS:
+        raise ValueError(f"Unknown candidate filter field {field!r}; expected one of {FILTER_FIELDS}")
+
+    if field in _TERM_FIELDS:
+        if op == ">=":
+            op = "⊇"
+        if op not in ("=", "!=", "⊇"):
+            raise ValueError(f"Filter on {field} must use =, != or ⊇, got {op!r}")
+        items = raw.strip("{}").split(",") if op == "⊇" else [raw]
+        values = tuple(dict.fromkeys(
+            _normalize_value(field, item.strip(" '\"")) for item in items if item.strip(" '\"")
+        ))
+        if not values:
+            raise ValueError(f"Candidate filter has no values: {expression!r}")
+        return CandidateFilter(field, op, values)
+
+    if op == "⊇":
+        raise ValueError(f"⊇ only applies to {_TERM_FIELDS}, not {field!r}")
+    if field == "degree":
+        value = degree_level(raw) or (int(raw) if raw.isdigit() else 0)
+        if not value:
+            raise ValueError(f"Unknown degree {raw!r}; expected one of {[name for name, _, _ in DEGREE_LEVELS]}")
+    elif field == "graduation":
+        value = normalize_date(raw)
+        if value is None:
+            raise ValueError(f"Invalid date in candidate filter: {raw!r}")
+    else:
+        try:
+            value = float(raw)
+        except ValueError:
+            raise ValueError(f"Invalid number in candidate filter: {raw!r}") from None
+        if field == "experience_years":
+            # Stored in months
+            value *= 12
+    return CandidateFilter(field, op, (value,))
+
+
+def _normalize_value(field: str, value: str) -> str:
+    if field == "skills":
+        return normalize_skill(value)
+    value = normalize_term(value)
+    return US_STATES.get(value, value) if field == "location" else value
+
+
+def candidate_store_path(folder_path: Path | str, index_name: str) -> Path:
+    """Where the candidate store of an index lives, next to the index files."""
+    return Path(folder_path) / f"{index_name}.candidates.sqlite"
+
+
+class CandidateStore:
+    """SQLite store of every resume's structured extraction, keyed by source file."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._engine = create_engine(f"sqlite:///{self.path}")
+        _metadata.create_all(self._engine)
+        self._lock = threading.Lock()
+
+    def upsert(self, source: str, resume_data: Dict[str, Any], *, today: Optional[date] = None) -> None:
+        """Store (or replace) the extraction of one resume."""
+        self.upsert_many([(source, resume_data)], today=today)
+
+    def upsert_many(
+        self,
+        resumes: Sequence[Tuple[str, Dict[str, Any]]],
+        *,
+        today: Optional[date] = None
+    ) -> None:
+        """Store (or replace) the extractions of several resumes in one transaction.
+
+        Args:
+            resumes: (source file, extraction) pairs
+            today: End of ongoing positions, for experience totals
+        """
+        today = today or date.today()
+        candidates, education, experience, terms = [], [], [], []
+        for source, resume_data in resumes:
+            candidate, rows = self._rows(source, resume_data, today)
+            candidates.append(candidate)
+            education.extend(rows["education"])
+            experience.extend(rows["experience"])
+            terms.extend(rows["terms"])
+        if not candidates:
+            return
+
+        sources = [candidate["source"] for candidate in candidates]
+        with self._lock, self._engine.begin() as conn:
+            for start in range(0, len(sources), 500):
+                chunk = sources[start:start + 500]
+                for table in (_candidates, _education, _experience, _terms):
+                    conn.execute(delete(table).where(table.c.source.in_(chunk)))
+            conn.execute(_candidates.insert(), candidates)
+            for table, rows in ((_education, education), (_experience, experience), (_terms, terms)):
+                if rows:
+                    conn.execute(table.insert(), rows)
+
+    def remove(self, source: str) -> None:
+        with self._lock, self._engine.begin() as conn:
+            for table in (_candidates, _education, _experience, _terms):
+                conn.execute(delete(table).where(table.c.source == source))
+
+    def get(self, source: str) -> Optional[Dict[str, Any]]:
+        """The stored extraction of a resume, or None."""
+        with self._engine.connect() as conn:
+            data = conn.execute(
+                select(_candidates.c.data).where(_candidates.c.source == source)
+            ).scalar()
+        return json.loads(data) if data is not None else None
+
+    def __len__(self) -> int:
+        with self._engine.connect() as conn:
+            return conn.execute(select(func.count()).select_from(_candidates)).scalar()
+
+    def matching_sources(self, filters: Sequence[str | CandidateFilter]) -> Set[str]:
+        """Resumes matching every filter expression.
+
+        Raises:
+            ValueError: If a filter is invalid or there are more than
+                `MAX_CANDIDATE_FILTERS`
+        """
+        if len(filters) > MAX_CANDIDATE_FILTERS:
+            raise ValueError(f"At most {MAX_CANDIDATE_FILTERS} candidate filters are allowed")
+        parsed = [f if isinstance(f, CandidateFilter) else parse_filter(f) for f in filters]
+        query = select(_candidates.c.source)
+        for candidate_filter in parsed:
+            query = query.where(self._condition(candidate_filter))
+        with self._engine.connect() as conn:
+            return set(conn.execute(query).scalars())
+
+    @staticmethod
+    def _condition(candidate_filter: CandidateFilter):
+        field, op, values = candidate_filter
+        if field in _TERM_FIELDS:
+            having = select(_terms.c.source).where(
+                _terms.c.kind == field, _terms.c.term.in_(values)
+            ).group_by(_terms.c.source).having(func.count(distinct(_terms.c.term)) == len(values))
+            condition = _candidates.c.source.in_(having)
+            return ~condition if op == "!=" else condition
+
+        column, value = _COLUMNS[field], values[0]
+        return {
+            "=": column == value,
+            "!=": column != value,
+            "<": column < value,
+            "<=": column <= value,
+            ">": column > value,
+            ">=": column >= value,
+        }[op]
+
+    @staticmethod
+    def _rows(source: str, resume_data: Dict[str, Any], today: date) -> Tuple[Dict[str, Any], Dict[str, List]]:
+        """Rows of every table for one resume."""
+        terms: Set[Tuple[str, str]] = set()
+        for skills in (resume_data.get("skills") or {}).values():
+            terms.update(("skills", normalize_skill(skill)) for skill in skills or [] if skill)
+
+        education = []
+        for entry in resume_data.get("education") or []:
+            gpa = entry.get("gpa")
+            try:
+                gpa = float(gpa) if gpa is not None else None
+            except (TypeError, ValueError):
+                gpa = None
+            education.append({
+                "source": source,
+                "institution": entry.get("institution"),
+                "location": entry.get("location"),
+                "degree": entry.get("degree"),
+                "degree_level": degree_level(entry.get("degree")),
+                "gpa": gpa,
+                "start_date": normalize_date(entry.get("start_date")),
+                "end_date": normalize_date(entry.get("end_date")),
+            })
+            if entry.get("institution"):
+                terms.add(("institution", normalize_term(entry["institution"])))
+            terms.update(("location", term) for term in location_terms(entry.get("location")))
+
+        experience = []
+        for entry in resume_data.get("experience") or []:
+            end_text = entry.get("end_date")
+            experience.append({
+                "source": source,
+                "position": entry.get("position"),
+                "company": entry.get("company"),
+                "location": entry.get("location"),
+                "start_date": normalize_date(entry.get("start_date")),
+                "end_date": normalize_date(end_text),
+                "ongoing": bool(entry.get("ongoing")) or normalize_term(end_text or "") in _ONGOING_DATES,
+            })
+            if entry.get("company"):
+                terms.add(("company", normalize_term(entry["company"])))
+            terms.update(("location", term) for term in location_terms(entry.get("location")))
+            terms.update(("skills", normalize_skill(tech)) for tech in entry.get("technologies") or [] if tech)
+        for project in resume_data.get("projects") or []:
+            terms.update(("skills", normalize_skill(tech)) for tech in project.get("technologies") or [] if tech)
+
+        gpas = [row["gpa"] for row in education if row["gpa"] is not None]
+        graduations = [row["end_date"] for row in education if row["end_date"] is not None]
+        candidate = {
+            "source": source,
+            "name": resume_data.get("name"),
+            "email": resume_data.get("email"),
+            "gpa": max(gpas) if gpas else None,
+            "degree_level": max((row["degree_level"] for row in education), default=0),
+            "graduation": max(graduations) if graduations else None,
+            "experience_months": experience_months(
+                ((row["start_date"], row["end_date"], row["ongoing"]) for row in experience), today
+            ),
+            "data": json.dumps(resume_data, default=str),
+        }
+        return candidate, {
+            "education": education,
+            "experience": experience,
+            "terms": [{"source": source, "kind": kind, "term": term} for kind, term in sorted(terms)],
+        }
@@ -0,0 +1,326 @@
+"""SQLite document store for the saved resume index.
+
+LangChain's `FAISS.save_local` pickles the whole `InMemoryDocstore`, so every
+process that loads the index unpickles every document and keeps its own
+copy. The snapshot instead stores documents in ``<name>.docs.sqlite``:
+
+- one row per index position holding the document id and any metadata
+  beyond the indexed fields as JSON, with the text in a separate table
+- ``source``, ``section``, ``name`` and ``email`` interned in a ``strings``
+  table, since every document of a resume repeats them
+
+`SQLiteDocstore` reads that file lazily: a search only fetches its top-k
+documents, and the file is memory-mapped read-only, so API workers on the
+same machine share its pages through the OS cache. Documents added after
+loading (write-ahead log replay, new uploads) are kept in memory on top of
+it until the next snapshot writes them out. `PositionIdMap` does the same for
+`FAISS.index_to_docstore_id`.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import sys
+import threading
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from langchain_community.docstore.base import AddableMixin, Docstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+# Metadata fields stored as interned string ids rather than per-row JSON
+INTERNED_FIELDS = ("source", "section", "name", "email")
+
+# Bytes of the file SQLite may memory-map for reads
+DEFAULT_MMAP_SIZE = 1 << 30
+
+_SCHEMA = """
+CREATE TABLE strings (
+    id INTEGER PRIMARY KEY,
+    value TEXT NOT NULL UNIQUE
+);
+CREATE TABLE documents (
+    position INTEGER PRIMARY KEY,
+    doc_id TEXT NOT NULL UNIQUE,
+    source INTEGER REFERENCES strings(id),
+    section INTEGER REFERENCES strings(id),
+    name INTEGER REFERENCES strings(id),
+    email INTEGER REFERENCES strings(id),
+    extra TEXT
+);
+-- Kept apart so scanning metadata at startup doesn't read every page of text
+CREATE TABLE contents (
+    position INTEGER PRIMARY KEY,
+    content TEXT NOT NULL
+);
+"""
+
+_SELECT_INDEXED = (
+    "SELECT d.position, d.doc_id, "
+    + ", ".join(f"s_{field}.value" for field in INTERNED_FIELDS)
+    + " FROM documents d "
+    + " ".join(
+        f"LEFT JOIN strings s_{field} ON s_{field}.id = d.{field}" for field in INTERNED_FIELDS
+    )
+)
+_SELECT_DOCUMENT = _SELECT_INDEXED.replace(
+    "SELECT d.position, d.doc_id, ", "SELECT d.doc_id, c.content, d.extra, "
+).replace(
+    " FROM documents d ", " FROM documents d JOIN contents c ON c.position = d.position "
+)
+
+
+class SQLiteDocstore(Docstore, AddableMixin):
+    """Read-only view of a saved ``.docs.sqlite`` file plus documents added since."""
+
+    def __init__(self, path: Path | str, *, mmap_size: int = DEFAULT_MMAP_SIZE):
+        self.path = Path(path)
+        self.mmap_size = mmap_size
+        self._local = threading.local()
+        self._added: Dict[str, Document] = {}
+        # The file as loaded; threads opening their connection after a newer
+        # snapshot replaced it share this connection instead
+        self._loaded = self._open()
+        self._inode = self.path.stat().st_ino
+        self._local.connection = self._loaded
+        # Positions run from 0 without gaps, so this is a rowid lookup, not a scan
+        self.base_count: int = self._connection().execute(
+            "SELECT COALESCE(MAX(position) + 1, 0) FROM documents"
+        ).fetchone()[0]
+
+    def search(self, search: str) -> Union[str, Document]:
+        """Return the document with id ``search``, or a message if there is none."""
+        doc = self._added.get(search)
+        if doc is not None:
+            return doc
+        row = self._connection().execute(
+            _SELECT_DOCUMENT + " WHERE d.doc_id = ?", (search,)
+        ).fetchone()
+        if row is None:
+            return f"ID {search} not found."
+        return _row_to_document(row)
+
+    def add(self, texts: Dict[str, Document]) -> None:
+        """Keep new documents in memory until the next snapshot is written."""
+        overlapping = {
+            doc_id for doc_id in texts
+            if doc_id in self._added or not isinstance(self.search(doc_id), str)
+        }
+        if overlapping:
+            raise ValueError(f"Tried to add ids that already exist: {overlapping}")
+        self._added.update(texts)
+
+    def doc_id_at(self, position: int) -> Optional[str]:
+        """Document id saved at an index position, or None."""
+        row = self._connection().execute(
+            "SELECT doc_id FROM documents WHERE position = ?", (position,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def iter_indexed(self, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, str, Dict[str, str]]]:
+        """Yield ``(position, doc_id, indexed metadata)`` for saved documents in index order.
+
+        One query for the whole range, without loading document text.
+        """
+        end = self.base_count if end is None else min(end, self.base_count)
+        rows = self._connection().execute(
+            _SELECT_INDEXED + " WHERE d.position >= ? AND d.position < ? ORDER BY d.position",
+            (start, end)
+        )
+        for position, doc_id, *values in rows:
+            yield position, doc_id, {
+                field: value for field, value in zip(INTERNED_FIELDS, values) if value
+            }
+
+    def iter_contents(self, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """Yield ``(position, text)`` for saved documents in index order, in one query."""
+        end = self.base_count if end is None else min(end, self.base_count)
+        yield from self._connection().execute(
+            "SELECT position, content FROM contents WHERE position >= ? AND position < ? ORDER BY position",
+            (start, end)
+        )
+
+    def backup_to(self, connection: sqlite3.Connection) -> None:
+        """Copy the saved documents into ``connection``'s database."""
+        self._connection().backup(connection)
+
+    def _connection(self) -> sqlite3.Connection:
+        # One read-only connection per thread; a snapshot replacing the file
+        # doesn't disturb them since they keep the file they opened
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._open()
+            if not self._is_loaded_file():
+                # Opened a newer snapshot's documents, which don't match the
+                # loaded index positions
+                connection.close()
+                connection = self._loaded
+            self._local.connection = connection
+        return connection
+
+    def _open(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+        )
+        connection.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        return connection
+
+    def _is_loaded_file(self) -> bool:
+        # The loaded file stays open, so its inode number can't be reused
+        try:
+            return self.path.stat().st_ino == self._inode
+        except FileNotFoundError:
+            return False
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"path": str(self.path), "mmap_size": self.mmap_size, "added": self._added}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["path"], mmap_size=state["mmap_size"])
+        self._added = state["added"]
+
+
+class PositionIdMap(MutableMapping):
+    """`FAISS.index_to_docstore_id` backed by a `SQLiteDocstore`.
+
+    Saved positions are looked up in the file on demand; positions added
+    after loading are kept in memory.
+    """
+
+    def __init__(self, docstore: SQLiteDocstore):
+        self.docstore = docstore
+        self._added: Dict[int, str] = {}
+
+    def __getitem__(self, position: int) -> str:
+        position = int(position)  # FAISS hands back numpy integers
+        if position in self._added:
+            return self._added[position]
+        if 0 <= position < self.docstore.base_count:
+            doc_id = self.docstore.doc_id_at(position)
+            if doc_id is not None:
+                return doc_id
+        raise KeyError(position)
+
+    def __setitem__(self, position: int, doc_id: str) -> None:
+        position = int(position)
+        if position < self.docstore.base_count:
+            raise ValueError("Saved index positions are read-only")
+        self._added[position] = doc_id
+
+    def __delitem__(self, position: int) -> None:
+        raise NotImplementedError("Deleting from a saved index is not supported")
+
+    def __iter__(self) -> Iterator[int]:
+        yield from range(self.docstore.base_count)
+        yield from sorted(self._added)
+
+    def __len__(self) -> int:
+        return self.docstore.base_count + len(self._added)
+
+
+def open_docstore(path: Path | str) -> Tuple[SQLiteDocstore, PositionIdMap]:
+    """Open a saved ``.docs.sqlite`` file as a docstore and its position map."""
+    docstore = SQLiteDocstore(path)
+    return docstore, PositionIdMap(docstore)
+
+
+def write_docstore(db: FAISS, path: Path | str) -> None:
+    """Write every document in ``db`` to a new ``.docs.sqlite`` file at ``path``.
+
+    If ``db`` was loaded from such a file, the file is copied as is and only
+    documents added since are inserted.
+    """
+    connection = sqlite3.connect(str(path))
+    try:
+        start = 0
+        if isinstance(db.docstore, SQLiteDocstore):
+            db.docstore.backup_to(connection)
+            start = db.docstore.base_count
+        else:
+            connection.executescript(_SCHEMA)
+        strings = dict(connection.execute("SELECT value, id FROM strings"))
+
+        def intern(value: Any) -> Optional[int]:
+            if not value:
+                return None
+            value = str(value)
+            if value not in strings:
+                strings[value] = connection.execute(
+                    "INSERT INTO strings (value) VALUES (?)", (value,)
+                ).lastrowid
+            return strings[value]
+
+        rows: List[tuple] = []
+        contents: List[tuple] = []
+        for position in range(start, db.index.ntotal):
+            doc_id = db.index_to_docstore_id[position]
+            doc = db.docstore.search(doc_id)
+            if isinstance(doc, str):
+                raise ValueError(f"No document saved for index position {position}")
+            extra = {k: v for k, v in doc.metadata.items() if k not in INTERNED_FIELDS}
+            contents.append((position, doc.page_content))
+            rows.append((
+                position,
+                doc_id,
+                *(intern(doc.metadata.get(field)) for field in INTERNED_FIELDS),
+                json.dumps(extra) if extra else None,
+            ))
+        connection.executemany("INSERT INTO documents VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        connection.executemany("INSERT INTO contents VALUES (?, ?)", contents)
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def iter_indexed_metadata(
+    db: FAISS,
+    start: int = 0,
+    end: Optional[int] = None
+) -> Iterator[Tuple[int, str, Dict[str, str]]]:
+    """Yield ``(position, doc_id, indexed metadata)`` for positions ``start`` to ``end``.
+
+    Reads saved documents of a `SQLiteDocstore` in one query and looks up
+    everything else one document at a time.
+    """
+    end = db.index.ntotal if end is None else end
+    if isinstance(db.docstore, SQLiteDocstore):
+        yield from db.docstore.iter_indexed(start, end)
+        start = max(start, db.docstore.base_count)
+    for position in range(start, end):
+        doc_id = db.index_to_docstore_id.get(position)
+        doc = db.docstore.search(doc_id) if doc_id is not None else None
+        if doc is None or isinstance(doc, str):  # docstore returns a message for missing ids
+            continue
+        yield position, doc_id, {
+            field: doc.metadata[field] for field in INTERNED_FIELDS if doc.metadata.get(field)
+        }
+
+
+def iter_texts(
+    db: FAISS,
+    start: int = 0,
+    end: Optional[int] = None
+) -> Iterator[Tuple[int, str]]:
+    """Yield ``(position, text)`` for positions ``start`` to ``end``, like `iter_indexed_metadata`."""
+    end = db.index.ntotal if end is None else end
+    if isinstance(db.docstore, SQLiteDocstore):
+        yield from db.docstore.iter_contents(start, end)
+        start = max(start, db.docstore.base_count)
+    for position in range(start, end):
+        doc_id = db.index_to_docstore_id.get(position)
+        doc = db.docstore.search(doc_id) if doc_id is not None else None
+        if doc is None or isinstance(doc, str):
+            continue
+        yield position, doc.page_content
+
+
+def _row_to_document(row: tuple) -> Document:
+    doc_id, content, extra, *values = row
+    metadata: Dict[str, Any] = {
+        field: sys.intern(value) for field, value in zip(INTERNED_FIELDS, values) if value
+    }
+    if extra:
+        metadata.update(json.loads(extra))
+    return Document(id=doc_id, page_content=content, metadata=metadata)
@@ -0,0 +1,462 @@
+"""Caches of text embeddings shared by the manager and the API.
+
+Vectors are keyed by the SHA-256 of the embedding model's name and the exact
+text, so identical skills blocks, boilerplate objectives and re-uploaded
+resumes are embedded once. Each model gets its own directory holding:
+
+- ``vectors.f32``: a fixed-capacity float32 array, memory-mapped, one row per slot
+- ``index.sqlite``: the hash index mapping each key to its slot and last use
+
+The cache holds at most ``max_entries`` vectors; when it is full the least
+recently used slots are reused.
+
+The API and manager processes share a store, so every access holds
+``flock`` on the directory's ``lock`` file: shared for lookups and exclusive
+for writes. Slots are claimed in a ``BEGIN IMMEDIATE`` transaction, and a new
+vectors file replaces the old one under a new inode, so a process still
+mapping the old file never sees it truncated.
+
+`QueryEmbeddingCache` is a small in-process LRU+TTL tier for search queries,
+placed in front of either the raw model or a `CachedEmbeddings`.
+"""
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+from cachetools import TTLCache
+from langchain_core.embeddings import Embeddings
+from sqlalchemy import (
+    Column,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    delete,
+    event,
+    func,
+    select,
+    update,
+)
+
+EMBEDDING_CACHE_DIR = Path(__file__).parent / "embedding_cache"
+DEFAULT_MAX_CACHED_EMBEDDINGS = int(os.getenv("RESUME_WIZARD_EMBEDDING_CACHE_ENTRIES", "50000"))
+
+DEFAULT_QUERY_CACHE_SIZE = int(os.getenv("RESUME_WIZARD_QUERY_CACHE_SIZE", "1024"))
+DEFAULT_QUERY_CACHE_TTL = float(os.getenv("RESUME_WIZARD_QUERY_CACHE_TTL", "3600"))
+
+_metadata = MetaData()
+
+_entries = Table(
+    "entries",
+    _metadata,
+    Column("key", String(64), primary_key=True),
+    Column("slot", Integer, nullable=False, unique=True),
+    Column("last_accessed", Float, nullable=False, index=True),
+)
+
+_settings = Table(
+    "settings",
+    _metadata,
+    Column("name", String(32), primary_key=True),
+    Column("value", Integer, nullable=False),
+)
+
+
+def embedding_model_name(embeddings: Embeddings) -> str:
+    """Return a name identifying the model (and output size) an embeddings object uses."""
+    model = getattr(embeddings, "model", None) or type(embeddings).__name__
+    dimensions = getattr(embeddings, "dimensions", None) or getattr(embeddings, "size", None)
+    return f"{model}:{dimensions}" if dimensions else model
+
+
+class EmbeddingStore:
+    """Fixed-capacity, LRU-bounded store of one model's embeddings."""
+
+    def __init__(
+        self,
+        model: str,
+        cache_dir: Path | str = EMBEDDING_CACHE_DIR,
+        *,
+        max_entries: int = DEFAULT_MAX_CACHED_EMBEDDINGS
+    ):
+        self.model = model
+        self.max_entries = max(1, max_entries)
+        self.path = Path(cache_dir) / re.sub(r"[^A-Za-z0-9_.-]", "_", model)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = self.path / "vectors.f32"
+        self._lock_path = self.path / "lock"
+
+        self._engine = create_engine(f"sqlite:///{self.path / 'index.sqlite'}")
+        _begin_immediate(self._engine)
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.memmap] = None
+        # Inode of the mapped vectors file, to notice another process replacing it
+        self._vectors_inode: Optional[int] = None
+        self.dim: Optional[int] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        with self._file_lock(exclusive=True):
+            _metadata.create_all(self._engine)
+            settings = self._read_settings()
+            if settings.get("capacity") not in (None, self.max_entries):
+                print(
+                    f"Warning: Embedding cache for {model} was created with "
+                    f"{settings['capacity']} slots, not {self.max_entries}; clearing it"
+                )
+                self._clear()
+
+    def key(self, text: str) -> str:
+        """Return the cache key for a text under this store's model."""
+        return hashlib.sha256(f"{self.model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Return the cached vectors for whichever of ``keys`` are present."""
+        unique_keys = list(dict.fromkeys(keys))
+        with self._file_lock(exclusive=False):
+            self._sync_vectors()
+            if self._vectors is None:
+                self.misses += len(keys)
+                return {}
+            found: Dict[str, np.ndarray] = {}
+            with self._engine.begin() as conn:
+                for start in range(0, len(unique_keys), 500):
+                    chunk = unique_keys[start:start + 500]
+                    rows = conn.execute(
+                        select(_entries.c.key, _entries.c.slot).where(_entries.c.key.in_(chunk))
+                    ).all()
+                    for key, slot in rows:
+                        found[key] = np.array(self._vectors[slot])
+                    if rows:
+                        conn.execute(
+                            update(_entries)
+                            .where(_entries.c.key.in_([key for key, _ in rows]))
+                            .values(last_accessed=time.time())
+                        )
+            hit_count = sum(1 for key in keys if key in found)
+            self.hits += hit_count
+            self.misses += len(keys) - hit_count
+            return found
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        """Store vectors by key, reusing the least recently used slots when full."""
+        if not items:
+            return
+        with self._file_lock(exclusive=True):
+            self._sync_vectors()
+            if self._vectors is None:
+                self._create_vectors(len(next(iter(items.values()))))
+
+            with self._engine.begin() as conn:
+                existing = set(conn.execute(
+                    select(_entries.c.key).where(_entries.c.key.in_(list(items)))
+                ).scalars())
+            new_items = {key: vector for key, vector in items.items() if key not in existing}
+            # Never cache more than fits; the most recent vectors win
+            new_items = dict(list(new_items.items())[-self.max_entries:])
+            if not new_items:
+                return
+
+            slots = self._claim_slots(len(new_items))
+            for slot, vector in zip(slots, new_items.values()):
+                self._vectors[slot] = vector
+            self._vectors.flush()
+
+            now = time.time()
+            with self._engine.begin() as conn:
+                conn.execute(
+                    _entries.insert(),
+                    [
+                        {"key": key, "slot": slot, "last_accessed": now}
+                        for key, slot in zip(new_items, slots)
+                    ]
+                )
+
+    def clear(self) -> None:
+        """Remove every cached vector."""
+        with self._file_lock(exclusive=True):
+            self._clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry counts, storage use and hit/miss counters."""
+        with self._file_lock(exclusive=False):
+            self._sync_vectors()
+            with self._engine.connect() as conn:
+                entries = conn.execute(select(func.count()).select_from(_entries)).scalar()
+        lookups = self.hits + self.misses
+        return {
+            "model": self.model,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "dim": self.dim,
+            "file_bytes": self._vectors_path.stat().st_size if self._vectors_path.exists() else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    @contextmanager
+    def _file_lock(self, *, exclusive: bool) -> Iterator[None]:
+        """Hold the store's thread lock and ``flock`` on its lock file.
+
+        Lookups share the file lock; writes, which reuse slots other
+        processes may be reading, take it exclusively.
+        """
+        with self._lock:
+            with open(self._lock_path, "a+b") as f:
+                fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _claim_slots(self, count: int) -> List[int]:
+        """Return ``count`` free slots, evicting least recently used entries as needed.
+
+        Call with the exclusive file lock held. Evicted rows are deleted and
+        committed before their slots are overwritten, so the index never
+        points at a vector for another text.
+        """
+        with self._engine.begin() as conn:
+            used = np.zeros(self.max_entries, dtype=bool)
+            used[np.fromiter(conn.execute(select(_entries.c.slot)).scalars(), dtype=np.int64)] = True
+            # Free slots are the ones no entry points at; a write cut short
+            # after its evictions committed leaves its slots free
+            free = np.flatnonzero(~used)[:count].tolist()
+            needed = count - len(free)
+            if needed > 0:
+                evicted = conn.execute(
+                    select(_entries.c.key, _entries.c.slot)
+                    .order_by(_entries.c.last_accessed)
+                    .limit(needed)
+                ).all()
+                conn.execute(
+                    delete(_entries).where(_entries.c.key.in_([key for key, _ in evicted]))
+                )
+                free.extend(slot for _, slot in evicted)
+                self.evictions += len(evicted)
+        return free
+
+    def _read_settings(self) -> Dict[str, int]:
+        with self._engine.connect() as conn:
+            return dict(conn.execute(select(_settings.c.name, _settings.c.value)).all())
+
+    def _clear(self) -> None:
+        """Remove every cached vector. Call with the exclusive file lock held."""
+        with self._engine.begin() as conn:
+            conn.execute(delete(_entries))
+            conn.execute(delete(_settings))
+        self._close_vectors()
+        self._vectors_path.unlink(missing_ok=True)
+
+    def _create_vectors(self, dim: int) -> None:
+        """Start an empty vectors file. Call with the exclusive file lock held."""
+        with self._engine.begin() as conn:
+            conn.execute(delete(_entries))
+            conn.execute(delete(_settings))
+            conn.execute(
+                _settings.insert(),
+                [{"name": "dim", "value": dim}, {"name": "capacity", "value": self.max_entries}]
+            )
+        # Written under a new name and renamed into place, so processes that
+        # still map an older file keep a valid (if orphaned) mapping
+        tmp_path = self._vectors_path.with_name(self._vectors_path.name + ".tmp")
+        vectors = np.memmap(tmp_path, dtype=np.float32, mode="w+", shape=(self.max_entries, dim))
+        vectors.flush()
+        del vectors
+        os.replace(tmp_path, self._vectors_path)
+        self._close_vectors()
+        self._sync_vectors()
+
+    def _sync_vectors(self) -> None:
+        """Map the current vectors file, remapping it if another process replaced it.
+
+        Call with the file lock held.
+        """
+        try:
+            inode = self._vectors_path.stat().st_ino
+        except FileNotFoundError:
+            self._close_vectors()
+            return
+        if self._vectors is not None and inode == self._vectors_inode:
+            return
+        dim = self._read_settings().get("dim")
+        if not dim:
+            self._close_vectors()
+            return
+        self._vectors = np.memmap(
+            self._vectors_path, dtype=np.float32, mode="r+", shape=(self.max_entries, dim)
+        )
+        self._vectors_inode = inode
+        self.dim = dim
+
+    def _close_vectors(self) -> None:
+        self._vectors = None
+        self._vectors_inode = None
+        self.dim = None
+
+
+def _begin_immediate(engine) -> None:
+    """Make every transaction on a SQLite engine start with ``BEGIN IMMEDIATE``.
+
+    The write lock is then taken when the transaction starts instead of at
+    its first write, so two processes can't both read the free slots before
+    either claims them.
+    """
+    @event.listens_for(engine, "connect")
+    def _disable_implicit_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that serves repeated texts from an `EmbeddingStore`.
+
+    Only texts missing from the store are sent to the wrapped model, in a
+    single ``embed_documents`` call per request.
+    """
+
+    def __init__(self, underlying: Embeddings, store: Optional[EmbeddingStore] = None):
+        self.underlying = underlying
+        self.store = store or get_embedding_store(embedding_model_name(underlying))
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self.store.key(text) for text in texts]
+        cached = self.store.get_many(keys)
+
+        missing = list(dict.fromkeys(
+            (key, text) for key, text in zip(keys, texts) if key not in cached
+        ))
+        if missing:
+            vectors = self.underlying.embed_documents([text for _, text in missing])
+            fresh = {
+                key: np.asarray(vector, dtype=np.float32)
+                for (key, _), vector in zip(missing, vectors)
+            }
+            self.store.put_many(fresh)
+            cached.update(fresh)
+        return [cached[key].tolist() for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self.store.key(text)
+        cached = self.store.get_many([key])
+        if key in cached:
+            return cached[key].tolist()
+        vector = self.underlying.embed_query(text)
+        self.store.put_many({key: np.asarray(vector, dtype=np.float32)})
+        return vector
+
+
+class QueryEmbeddingCache(Embeddings):
+    """Thread-safe in-memory LRU+TTL cache in front of ``embed_query``.
+
+    Document embedding passes straight through; only query vectors are kept.
+    Wrap a `CachedEmbeddings` to fall back to its shared on-disk tier before
+    calling the model.
+    """
+
+    def __init__(
+        self,
+        underlying: Embeddings,
+        *,
+        maxsize: int = DEFAULT_QUERY_CACHE_SIZE,
+        ttl: float = DEFAULT_QUERY_CACHE_TTL
+    ):
+        self.underlying = underlying
+        self._cache: TTLCache = TTLCache(maxsize=max(1, maxsize), ttl=ttl)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.underlying.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        with self._lock:
+            vector = self._cache.get(text)
+            if vector is not None:
+                self.hits += 1
+                return list(vector)
+            self.misses += 1
+        # Embed outside the lock so one slow call doesn't hold up cached lookups
+        vector = self.underlying.embed_query(text)
+        with self._lock:
+            self._cache[text] = tuple(vector)
+        return vector
+
+    def embed_queries(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed several queries, with every uncached one in a single request.
+
+        Misses go through ``embed_documents`` of the underlying embeddings,
+        which for OpenAI models returns the same vectors as ``embed_query``.
+        """
+        vectors: Dict[str, List[float]] = {}
+        with self._lock:
+            for text in texts:
+                vector = self._cache.get(text)
+                if vector is not None:
+                    self.hits += 1
+                    vectors[text] = list(vector)
+            misses = [text for text in dict.fromkeys(texts) if text not in vectors]
+            self.misses += len(misses)
+        if misses:
+            embedded = self.underlying.embed_documents(misses)
+            with self._lock:
+                for text, vector in zip(misses, embedded):
+                    self._cache[text] = tuple(vector)
+                    vectors[text] = list(vector)
+        return [vectors[text] for text in texts]
+
+    def clear(self) -> None:
+        """Drop every cached query vector."""
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._cache),
+                "max_entries": self._cache.maxsize,
+                "ttl": self._cache.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_stores: Dict[str, EmbeddingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_embedding_store(model: str) -> EmbeddingStore:
+    """Return the process-wide store for a model, opening it on first use."""
+    with _stores_lock:
+        if model not in _stores:
+            _stores[model] = EmbeddingStore(model)
+        return _stores[model]
+
+
+if __name__ == "__main__":
+    import json
+
+    for model_dir in sorted(EMBEDDING_CACHE_DIR.glob("*")) if EMBEDDING_CACHE_DIR.exists() else []:
+        print(json.dumps(get_embedding_store(model_dir.name).stats(), indent=2))
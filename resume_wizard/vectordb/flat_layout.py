@@ -0,0 +1,250 @@
+"""Memory-mapped, read-only copy of the snapshot vectors for shared searching.
+
+Reading ``<name>.faiss`` gives every process its own private copy of the
+vectors. The FAISS build in use only memory-maps IVF inverted lists, not
+flat or HNSW storage, so every snapshot also stores its vectors in a plain
+layout that numpy can map directly:
+
+- ``<name>.flat.npy``: float32 vectors, one row per document, grouped by
+  section so each section is one contiguous block of rows
+- ``<name>.flat.positions.npy``: the main-index position of each row
+- ``<name>.flat.json``: the row range of every section
+
+`MmapFlatIndex` serves searches from these files with exact brute-force
+search (``faiss.knn``) over the mapped rows, and `MmapSectionIndexes` does
+the same over one section's block. Nothing is copied at load time, so a
+searcher starts without reading the vectors and every worker on the machine
+shares the same page cache. Searches are exact and scan every row they
+cover, which suits corpora where a flat scan is fast enough; HNSW's
+sub-linear search needs its graph and vectors in private memory.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import faiss
+import numpy as np
+from langchain_community.vectorstores import FAISS
+
+from resume_wizard.vectordb.docstore import iter_indexed_metadata
+from resume_wizard.vectordb.section_index import SectionIndexes
+
+# Rows reconstructed from the main index at a time while writing the layout
+_WRITE_CHUNK = 65_536
+
+
+def layout_exists(folder_path: Path | str, index_name: str) -> bool:
+    return (Path(folder_path) / f"{index_name}.flat.json").exists()
+
+
+def write_flat_layout(db: FAISS, folder_path: Path | str, index_name: str) -> None:
+    """Write ``db``'s vectors grouped by section next to the snapshot."""
+    folder = Path(folder_path)
+    ntotal, dim = db.index.ntotal, db.index.d
+    sections = np.full(ntotal, "", dtype=object)
+    for position, _, metadata in iter_indexed_metadata(db):
+        sections[position] = metadata.get("section", "")
+
+    # Rows ordered by section, keeping index order within each section
+    order = np.argsort(sections.astype(str), kind="stable")
+    names, starts = np.unique(sections[order].astype(str), return_index=True)
+    ends = np.append(starts[1:], ntotal)
+    row_of_position = np.empty(ntotal, dtype=np.int64)
+    row_of_position[order] = np.arange(ntotal, dtype=np.int64)
+
+    vectors = np.lib.format.open_memmap(
+        folder / f"{index_name}.flat.npy", mode="w+", dtype=np.float32, shape=(ntotal, dim)
+    )
+    for start in range(0, ntotal, _WRITE_CHUNK):
+        count = min(_WRITE_CHUNK, ntotal - start)
+        vectors[row_of_position[start:start + count]] = db.index.reconstruct_n(start, count)
+    vectors.flush()
+    del vectors
+    np.save(folder / f"{index_name}.flat.positions.npy", order.astype(np.int64))
+    (folder / f"{index_name}.flat.json").write_text(json.dumps({
+        "ntotal": int(ntotal),
+        "dim": int(dim),
+        "sections": {
+            str(name): [int(start), int(end)]
+            for name, start, end in zip(names, starts, ends) if name
+        },
+    }, indent=2))
+
+
+class FlatLayout:
+    """The memory-mapped vectors and row mapping of one snapshot."""
+
+    def __init__(self, folder_path: Path | str, index_name: str):
+        folder = Path(folder_path)
+        manifest = json.loads((folder / f"{index_name}.flat.json").read_text())
+        self.vectors: np.ndarray = np.load(folder / f"{index_name}.flat.npy", mmap_mode="r")
+        self.positions: np.ndarray = np.load(folder / f"{index_name}.flat.positions.npy", mmap_mode="r")
+        self.sections: Dict[str, Tuple[int, int]] = {
+            section: (start, end) for section, (start, end) in manifest["sections"].items()
+        }
+        if self.vectors.shape != (manifest["ntotal"], manifest["dim"]):
+            raise ValueError("flat layout doesn't match its manifest")
+
+    @property
+    def ntotal(self) -> int:
+        return self.vectors.shape[0]
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1]
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        rows: Optional[Tuple[int, int]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact L2 search over all rows or a row range, returning main-index positions."""
+        start, end = rows if rows is not None else (0, self.ntotal)
+        queries = np.ascontiguousarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        if end <= start or k <= 0:
+            return (
+                np.full((len(queries), max(k, 0)), np.inf, dtype=np.float32),
+                np.full((len(queries), max(k, 0)), -1, dtype=np.int64),
+            )
+        # A slice of the memmap is itself mapped, so nothing is copied here
+        distances, found = faiss.knn(queries, self.vectors[start:end], min(k, end - start))
+        positions = np.where(found >= 0, self.positions[np.maximum(found, 0) + start], -1)
+        if found.shape[1] < k:
+            pad = k - found.shape[1]
+            distances = np.pad(distances, ((0, 0), (0, pad)), constant_values=np.inf)
+            positions = np.pad(positions, ((0, 0), (0, pad)), constant_values=-1)
+        return distances, positions
+
+
+class MmapFlatIndex:
+    """Read-mostly stand-in for a FAISS index, backed by a `FlatLayout`.
+
+    Implements the parts of the `faiss.Index` interface LangChain's `FAISS`
+    and this package use. Vectors added after loading (write-ahead log
+    replay) go to a small in-memory flat index searched alongside.
+    """
+
+    def __init__(self, layout: FlatLayout):
+        self.layout = layout
+        self.d = layout.dim
+        self.metric_type = faiss.METRIC_L2
+        self.is_trained = True
+        self._added = faiss.IndexFlatL2(layout.dim)
+        self._row_of_position: Optional[np.ndarray] = None
+
+    @property
+    def ntotal(self) -> int:
+        return self.layout.ntotal + self._added.ntotal
+
+    def add(self, vectors: np.ndarray) -> None:
+        self._added.add(np.ascontiguousarray(vectors, dtype=np.float32))
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        distances, positions = self.layout.search(queries, k)
+        if self._added.ntotal:
+            added_distances, added_positions = self._added.search(
+                np.ascontiguousarray(queries, dtype=np.float32).reshape(-1, self.d), k
+            )
+            added_positions = np.where(added_positions >= 0, added_positions + self.layout.ntotal, -1)
+            distances, positions = _merge(distances, positions, added_distances, added_positions, k)
+        return distances, positions
+
+    def reconstruct_n(self, start: int, count: int) -> np.ndarray:
+        """Vectors at main-index positions ``start`` to ``start + count``."""
+        base_end = min(start + count, self.layout.ntotal)
+        parts: List[np.ndarray] = []
+        if start < base_end:
+            parts.append(np.asarray(self.layout.vectors[self._rows()[start:base_end]]))
+        if start + count > self.layout.ntotal:
+            added_start = max(0, start - self.layout.ntotal)
+            parts.append(self._added.reconstruct_n(added_start, start + count - self.layout.ntotal - added_start))
+        return np.vstack(parts) if parts else np.empty((0, self.d), dtype=np.float32)
+
+    def reconstruct(self, position: int) -> np.ndarray:
+        return self.reconstruct_n(position, 1)[0]
+
+    def reconstruct_batch(self, positions: np.ndarray) -> np.ndarray:
+        """Vectors at arbitrary main-index positions, in the order given."""
+        positions = np.asarray(positions, dtype=np.int64)
+        vectors = np.empty((len(positions), self.d), dtype=np.float32)
+        saved = positions < self.layout.ntotal
+        # Read the memory-mapped rows in file order
+        rows = self._rows()[positions[saved]]
+        order = np.argsort(rows)
+        saved_vectors = np.empty((len(rows), self.d), dtype=np.float32)
+        saved_vectors[order] = self.layout.vectors[rows[order]]
+        vectors[saved] = saved_vectors
+        if not saved.all():
+            vectors[~saved] = self._added.reconstruct_batch(positions[~saved] - self.layout.ntotal)
+        return vectors
+
+    def _rows(self) -> np.ndarray:
+        """Layout row of each saved main-index position, computed on first use."""
+        if self._row_of_position is None:
+            rows = np.empty(self.layout.ntotal, dtype=np.int64)
+            rows[self.layout.positions] = np.arange(self.layout.ntotal, dtype=np.int64)
+            self._row_of_position = rows
+        return self._row_of_position
+
+
+class MmapSectionIndexes(SectionIndexes):
+    """`SectionIndexes` whose saved part is served from the `FlatLayout`.
+
+    Only vectors added after loading get in-memory sub-indexes. Like
+    `MmapFlatIndex` this only serves searches: snapshots are saved by
+    `VectorDBManager`, which always loads the index into memory, and
+    `save_snapshot` refuses memory-mapped stores.
+    """
+
+    def __init__(self, layout: FlatLayout):
+        super().__init__(layout.dim, index_type="Flat")
+        self.layout = layout
+        self.covered = layout.ntotal
+
+    def search_many(
+        self,
+        section: str,
+        query_vectors: np.ndarray,
+        k: int,
+        *,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # The layout is always searched exactly, so the search effort only
+        # matters to sub-indexes of vectors added after loading
+        queries = np.ascontiguousarray(query_vectors, dtype=np.float32).reshape(-1, self.dim)
+        rows = self.layout.sections.get(section)
+        distances, positions = (
+            self.layout.search(queries, k, rows)
+            if rows is not None
+            else (
+                np.empty((len(queries), 0), dtype=np.float32),
+                np.empty((len(queries), 0), dtype=np.int64),
+            )
+        )
+        added_distances, added_positions = super().search_many(
+            section, queries, k, ef_search=ef_search, nprobe=nprobe
+        )
+        if added_positions.shape[1]:
+            distances, positions = _merge(distances, positions, added_distances, added_positions, k)
+        return distances, positions
+
+
+def _merge(
+    distances: np.ndarray,
+    positions: np.ndarray,
+    other_distances: np.ndarray,
+    other_positions: np.ndarray,
+    k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge two per-query result lists into the ``k`` nearest, nearest first."""
+    all_distances = np.hstack([distances, np.where(other_positions >= 0, other_distances, np.inf)])
+    all_positions = np.hstack([positions, other_positions])
+    order = np.argsort(all_distances, axis=1, kind="stable")[:, :k]
+    return (
+        np.take_along_axis(all_distances, order, axis=1),
+        np.take_along_axis(all_positions, order, axis=1),
+    )
@@ -0,0 +1,42 @@
+"""Reciprocal rank fusion of ranked result lists.
+
+Vector relevance scores and BM25 scores live on unrelated scales, so hybrid
+search combines the two rankings by rank rather than score: a document
+ranked ``r`` (from 1) in a list gets ``1 / (RRF_K + r)`` from it, summed over
+the lists it appears in. ``RRF_K`` damps the weight of the very top ranks;
+60 is the value from the original paper and works well without tuning.
+"""
+from __future__ import annotations
+
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Tuple[Document, float]]],
+    k: int = RRF_K
+) -> List[Tuple[Document, float]]:
+    """Fuse best-first lists of ``(document, score)`` into one ranking.
+
+    Returns:
+        List[Tuple[Document, float]]: Every document once, best first, with
+            its fused score divided by the best possible one (first in every
+            list), so scores fall in (0, 1]
+    """
+    fused: Dict[Hashable, float] = {}
+    documents: Dict[Hashable, Document] = {}
+    for ranking in rankings:
+        for rank, (doc, _) in enumerate(ranking, start=1):
+            key = _document_key(doc)
+            documents.setdefault(key, doc)
+            fused[key] = fused.get(key, 0.0) + 1.0 / (k + rank)
+    best_possible = len(rankings) / (k + 1)
+    ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)
+    return [(documents[key], score / best_possible) for key, score in ranked]
+
+
+def _document_key(doc: Document) -> Hashable:
+    return doc.id or (doc.metadata.get("source"), doc.metadata.get("section"), doc.page_content)
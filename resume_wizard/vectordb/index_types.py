@@ -0,0 +1,202 @@
+"""FAISS index types for the resume index and how to build and train them.
+
+``Flat`` and ``HNSW`` keep full float32 vectors, about 6 KB per document at
+1536 dimensions. The quantized types trade some recall for memory:
+
+- ``IVF-SQ8``: inverted file over ``nlist`` clusters, 8-bit scalar quantized
+  vectors (1 byte per dimension)
+- ``IVF-PQ``: inverted file with product quantization, ``dim / 16`` bytes
+  per vector by default
+- ``HNSW-SQ``: HNSW graph over 8-bit scalar quantized vectors
+
+Quantized types must be trained before vectors are added. `train_index`
+trains on a random sample of the vectors that are about to be stored.
+Compare the types on your own data with
+``python -m resume_wizard.benchmarks.index_types``.
+
+Search effort is chosen per query rather than stored on the index:
+`search_parameters` turns a request's ``ef_search`` (HNSW) or ``nprobe``
+(IVF) into FAISS search parameters, falling back to the server defaults and
+clamping to the server caps below. Chart the recall/latency trade-off with
+``python -m resume_wizard.benchmarks.search_effort``.
+"""
+from __future__ import annotations
+
+import math
+import os
+from typing import Optional
+
+import faiss
+import numpy as np
+
+INDEX_TYPES = ("Flat", "HNSW", "IVF-SQ8", "IVF-PQ", "HNSW-SQ")
+
+# Neighbours per node in HNSW graphs
+HNSW_M = 32
+
+# Candidate list size while building HNSW graphs (FAISS defaults to 40)
+HNSW_EF_CONSTRUCTION = int(os.getenv("RESUME_WIZARD_HNSW_EF_CONSTRUCTION", "80"))
+
+# Candidate list size per HNSW search, and the most a single query may ask for
+DEFAULT_HNSW_EF_SEARCH = int(os.getenv("RESUME_WIZARD_HNSW_EF_SEARCH", "64"))
+MAX_HNSW_EF_SEARCH = int(os.getenv("RESUME_WIZARD_MAX_HNSW_EF_SEARCH", "512"))
+
+# Vectors sampled to train a quantized index
+TRAINING_SAMPLE_SIZE = int(os.getenv("RESUME_WIZARD_TRAINING_SAMPLE_SIZE", "100000"))
+
+# Dimensions per product quantization sub-vector (one byte each)
+PQ_DIMS_PER_SUBQUANTIZER = int(os.getenv("RESUME_WIZARD_PQ_DIMS_PER_SUBQUANTIZER", "16"))
+
+# Inverted lists probed per IVF search, and the most a single query may ask for
+DEFAULT_IVF_NPROBE = int(os.getenv("RESUME_WIZARD_IVF_NPROBE", "16"))
+MAX_IVF_NPROBE = int(os.getenv("RESUME_WIZARD_MAX_IVF_NPROBE", "256"))
+
+# FAISS warns below this many training vectors per IVF cluster
+_MIN_POINTS_PER_CENTROID = 39
+
+
+def needs_training(index_type: Optional[str]) -> bool:
+    return index_type in ("IVF-SQ8", "IVF-PQ", "HNSW-SQ")
+
+
+def is_lossless(index) -> bool:
+    """Whether ``index`` stores full vectors, so reconstructing them is exact."""
+    index = faiss.downcast_index(index) if isinstance(index, faiss.Index) else index
+    if isinstance(index, faiss.IndexHNSW):
+        index = faiss.downcast_index(index.storage)
+    return isinstance(index, faiss.IndexFlat) or not isinstance(index, faiss.Index)
+
+
+def ivf_nlist(num_vectors: int, sample_size: int = TRAINING_SAMPLE_SIZE) -> int:
+    """Number of IVF clusters for ``num_vectors``: about 4 * sqrt(n).
+
+    Capped so the training sample has enough vectors for every cluster.
+    """
+    training_vectors = min(num_vectors, sample_size)
+    return max(1, min(
+        65_536,
+        int(4 * math.sqrt(max(num_vectors, 1))),
+        training_vectors // _MIN_POINTS_PER_CENTROID,
+    ))
+
+
+def create_index(
+    index_type: Optional[str],
+    dim: int,
+    num_vectors: int = 0,
+    sample_size: int = TRAINING_SAMPLE_SIZE
+) -> faiss.Index:
+    """Create an empty index of ``index_type``; untrained for quantized types.
+
+    Args:
+        index_type: One of `INDEX_TYPES`. Anything else gives a flat index.
+        dim: Vector dimension
+        num_vectors: Expected number of vectors, used to size IVF clusters
+        sample_size: Number of vectors it will be trained on
+    """
+    if index_type in ("HNSW", "HNSW-SQ"):
+        if index_type == "HNSW":
+            index = faiss.IndexHNSWFlat(dim, HNSW_M)
+        else:
+            index = faiss.IndexHNSWSQ(dim, faiss.ScalarQuantizer.QT_8bit, HNSW_M)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = DEFAULT_HNSW_EF_SEARCH
+        return index
+    if index_type in ("IVF-SQ8", "IVF-PQ"):
+        nlist = ivf_nlist(num_vectors, sample_size)
+        quantizer = faiss.IndexFlatL2(dim)
+        if index_type == "IVF-SQ8":
+            index = faiss.IndexIVFScalarQuantizer(
+                quantizer, dim, nlist, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_L2
+            )
+        else:
+            index = faiss.IndexIVFPQ(quantizer, dim, nlist, _pq_subquantizers(dim), 8)
+        index.nprobe = min(DEFAULT_IVF_NPROBE, nlist)
+        # Positions can be reconstructed, e.g. for section sub-indexes
+        index.set_direct_map_type(faiss.DirectMap.Array)
+        # The quantizer is owned by the IVF index from here on
+        index.own_fields = True
+        quantizer.this.disown()
+        return index
+    return faiss.IndexFlatL2(dim)
+
+
+def train_index(
+    index: faiss.Index,
+    vectors: np.ndarray,
+    sample_size: int = TRAINING_SAMPLE_SIZE,
+    seed: int = 0
+) -> None:
+    """Train ``index`` on a random sample of ``vectors`` if it needs training."""
+    if index.is_trained:
+        return
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if len(vectors) > sample_size:
+        rows = np.random.default_rng(seed).choice(len(vectors), sample_size, replace=False)
+        vectors = vectors[np.sort(rows)]
+    nlist = faiss.extract_index_ivf(index).nlist if _is_ivf(index) else 0
+    if nlist and len(vectors) < nlist * _MIN_POINTS_PER_CENTROID:
+        print(
+            f"Warning: Training {nlist} IVF clusters on only {len(vectors)} vectors; "
+            "recall may suffer until the index is rebuilt on more data"
+        )
+    index.train(np.ascontiguousarray(vectors))
+
+
+def search_parameters(
+    index,
+    ef_search: Optional[int] = None,
+    nprobe: Optional[int] = None
+) -> Optional[faiss.SearchParameters]:
+    """FAISS search parameters giving one query the requested search effort.
+
+    Parameters are passed to ``index.search`` for that call only, so
+    concurrent queries with different settings don't interfere.
+
+    Args:
+        index: Index about to be searched, optionally wrapped in an id map
+        ef_search: HNSW candidate list size, or None for
+            `DEFAULT_HNSW_EF_SEARCH`. Capped at `MAX_HNSW_EF_SEARCH`.
+        nprobe: IVF lists to probe, or None for `DEFAULT_IVF_NPROBE`. Capped
+            at `MAX_IVF_NPROBE` and the index's number of lists.
+
+    Returns:
+        Optional[faiss.SearchParameters]: Parameters for HNSW and IVF
+            indexes, None for exact indexes, which have no effort setting
+    """
+    if not isinstance(index, faiss.Index):
+        return None
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexIDMap):
+        index = faiss.downcast_index(index.index)
+    if isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(
+            efSearch=_clamp(ef_search, DEFAULT_HNSW_EF_SEARCH, MAX_HNSW_EF_SEARCH)
+        )
+    if _is_ivf(index):
+        nlist = faiss.extract_index_ivf(index).nlist
+        return faiss.SearchParametersIVF(
+            nprobe=min(_clamp(nprobe, DEFAULT_IVF_NPROBE, MAX_IVF_NPROBE), nlist)
+        )
+    return None
+
+
+def _clamp(value: Optional[int], default: int, cap: int) -> int:
+    return max(1, min(default if value is None else int(value), cap))
+
+
+def _pq_subquantizers(dim: int) -> int:
+    """Largest divisor of ``dim`` at most ``dim / PQ_DIMS_PER_SUBQUANTIZER``."""
+    target = max(1, dim // PQ_DIMS_PER_SUBQUANTIZER)
+    for m in range(target, 0, -1):
+        if dim % m == 0:
+            return m
+    return 1
+
+
+def _is_ivf(index: faiss.Index) -> bool:
+    try:
+        faiss.extract_index_ivf(index)
+        return True
+    except (RuntimeError, AttributeError):
+        return False
@@ -0,0 +1,135 @@
+"""Matching a job description against candidates, requirement by requirement.
+
+A job description is split into requirement phrases by `split_requirements`:
+one per bullet or sentence, with section headers ("Requirements:") and
+duplicates dropped. `VectorDBSearcher.match_job_description` embeds them in
+one request and scores the section vectors of shortlisted candidates
+against all of them at once. `rank_by_coverage` then reduces that
+similarity matrix to each candidate's best section per requirement and
+ranks candidates by how many requirements they cover.
+
+Similarities are cosine similarities, so they don't depend on the index
+type or on how relevance scores are mapped from distances.
+"""
+from __future__ import annotations
+
+import os
+import re
+from typing import List, NamedTuple
+
+import numpy as np
+
+# Requirements taken from one job description, in order of appearance
+MAX_REQUIREMENTS = int(os.getenv("RESUME_WIZARD_MAX_REQUIREMENTS", "30"))
+
+# Cosine similarity at which a section counts as meeting a requirement.
+# Related texts score around 0.8 with OpenAI's ada-002 embeddings.
+DEFAULT_MATCH_THRESHOLD = float(os.getenv("RESUME_WIZARD_REQUIREMENT_MATCH_THRESHOLD", "0.8"))
+
+# Bullets and list numbering at the start of a line
+_BULLET = re.compile(r"^\s*(?:[-*•·▪‣>]+|\(?\d{1,2}[.)])\s*")
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+")
+# Lead-ins like "Requirements:" or "Nice to have:", at most four words
+_HEADER = re.compile(r"^(?:[\w&/'-]+\s+){0,3}[\w&/'-]+\s*:\s*")
+
+
+def split_requirements(job_description: str, max_requirements: int = MAX_REQUIREMENTS) -> List[str]:
+    """Split a job description into requirement phrases.
+
+    Every bullet, line and sentence becomes one phrase. Lines that are only
+    a header are dropped and a header leading a line is stripped, so
+    "Skills: Python, SQL" gives "Python, SQL". Phrases repeated
+    case-insensitively are kept once.
+
+    Args:
+        job_description: Job description text
+        max_requirements: Maximum number of phrases to return
+
+    Returns:
+        List[str]: Requirement phrases in order of appearance
+    """
+    requirements: List[str] = []
+    seen = set()
+    for line in job_description.splitlines():
+        line = _BULLET.sub("", line).strip()
+        line = _HEADER.sub("", line, count=1)
+        for sentence in _SENTENCE_END.split(line):
+            phrase = sentence.strip(" \t.;:,")
+            key = " ".join(phrase.lower().split())
+            if len(key) < 2 or key in seen:
+                continue
+            seen.add(key)
+            requirements.append(phrase)
+            if len(requirements) >= max_requirements:
+                return requirements
+    return requirements
+
+
+class CoverageRanking(NamedTuple):
+    """Per-candidate coverage of a set of requirements.
+
+    ``best`` and ``evidence`` have one row per candidate and one column per
+    requirement; candidates are in the order of the ``owners`` codes given
+    to `rank_by_coverage` and ``order`` ranks them, best first.
+    """
+    order: np.ndarray
+    covered: np.ndarray
+    mean_similarity: np.ndarray
+    best: np.ndarray
+    evidence: np.ndarray
+
+
+def cosine_similarities(vectors: np.ndarray, queries: np.ndarray) -> np.ndarray:
+    """Cosine similarity of every vector (rows) with every query (columns)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    queries = np.asarray(queries, dtype=np.float32)
+    vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+    return vectors @ queries.T
+
+
+def rank_by_coverage(
+    similarities: np.ndarray,
+    owners: np.ndarray,
+    num_candidates: int,
+    threshold: float = DEFAULT_MATCH_THRESHOLD
+) -> CoverageRanking:
+    """Rank candidates by the number of requirements one of their sections meets.
+
+    Args:
+        similarities: Similarity of each section (rows) with each
+            requirement (columns)
+        owners: Candidate code of each section, in ``range(num_candidates)``
+        num_candidates: Number of candidates
+        threshold: Similarity at which a section meets a requirement
+
+    Returns:
+        CoverageRanking: Candidates ranked by requirements covered, then by
+            their mean best similarity over all requirements. ``evidence``
+            holds the row of each candidate's best section per requirement.
+    """
+    similarities = np.asarray(similarities, dtype=np.float64)
+    owners = np.asarray(owners, dtype=np.int64)
+    num_requirements = similarities.shape[1]
+    best = np.full((num_candidates, num_requirements), -np.inf)
+    np.maximum.at(best, owners, similarities)
+
+    # First section reaching each candidate's best, per requirement
+    evidence = np.full((num_candidates, num_requirements), -1, dtype=np.int64)
+    rows, columns = np.nonzero(similarities >= best[owners])
+    keys, first = np.unique(owners[rows] * num_requirements + columns, return_index=True)
+    evidence[keys // num_requirements, keys % num_requirements] = rows[first]
+
+    covered = (best >= threshold).sum(axis=1)
+    has_sections = np.bincount(owners, minlength=num_candidates) > 0
+    mean_similarity = np.full(num_candidates, -np.inf)
+    if num_requirements:
+        mean_similarity[has_sections] = best[has_sections].mean(axis=1)
+    order = np.lexsort((-mean_similarity, -covered))
+    return CoverageRanking(
+        order=order[has_sections[order]],
+        covered=covered,
+        mean_similarity=mean_similarity,
+        best=best,
+        evidence=evidence,
+    )
@@ -0,0 +1,257 @@
+"""BM25 keyword index over the resume documents.
+
+Recruiter queries are often literal ("Kubernetes", "PyTorch", "C++"), which
+embedding similarity matches loosely and which shouldn't need an embeddings
+request at all. `LexicalIndex` is an inverted index over the same documents
+as the FAISS index, keyed by index position, scored with Okapi BM25.
+
+Postings are kept in compressed sparse row form: for term ``t``,
+``positions[offsets[t]:offsets[t + 1]]`` are the documents containing it and
+``frequencies`` the matching term counts. Documents added after the arrays
+were built go to a small in-memory tail that is searched alongside and
+folded into the arrays when the index is saved.
+
+The index is saved next to the main index as ``<name>.lexical.npz`` and,
+like `SectionIndexes`, records how many main-index positions it covers, so
+loading it only tokenizes documents added since.
+"""
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_community.vectorstores import FAISS
+
+from resume_wizard.vectordb.docstore import iter_texts
+
+# Okapi BM25 term frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Words, keeping the symbols of names like "c++", "c#", "node.js" and "ci-cd"
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[.\-][a-z0-9+#]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class LexicalIndex:
+    """Inverted index with BM25 scoring over main-index positions."""
+
+    def __init__(self):
+        self.terms: Dict[str, int] = {}
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.positions = np.empty(0, dtype=np.int32)
+        self.frequencies = np.empty(0, dtype=np.uint16)
+        # Token count of every covered position
+        self.doc_lengths = np.empty(0, dtype=np.int32)
+        # Number of main-index positions covered, as in `SectionIndexes`
+        self.covered = 0
+        self._last_id: Optional[str] = None
+        self._tail: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._tail_lengths: List[int] = []
+
+    @property
+    def num_docs(self) -> int:
+        return len(self.doc_lengths) + len(self._tail_lengths)
+
+    @property
+    def total_length(self) -> int:
+        return int(self.doc_lengths.sum()) + sum(self._tail_lengths)
+
+    @classmethod
+    def build(cls, db: FAISS) -> "LexicalIndex":
+        """Build an index covering every document already in ``db``."""
+        index = cls()
+        index.sync(db)
+        return index
+
+    def sync(self, db: FAISS) -> int:
+        """Index documents added to ``db`` since the last sync.
+
+        Returns:
+            int: Number of documents added
+        """
+        start, end = self.covered, db.index.ntotal
+        if start >= end:
+            return 0
+        lengths = [0] * (end - start)
+        for position, text in iter_texts(db, start, end):
+            counts: Dict[str, int] = {}
+            for token in tokenize(text):
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                positions, frequencies = self._tail.setdefault(token, ([], []))
+                positions.append(position)
+                frequencies.append(min(count, np.iinfo(np.uint16).max))
+            lengths[position - start] = sum(counts.values())
+        self._tail_lengths.extend(lengths)
+        self.covered = end
+        self._last_id = db.index_to_docstore_id[end - 1]
+        return end - start
+
+    def document_frequencies(self, terms: Sequence[str]) -> np.ndarray:
+        """Number of documents containing each term."""
+        return np.array([len(self._postings(term)[0]) for term in terms], dtype=np.int64)
+
+    def search(
+        self,
+        terms: Sequence[str],
+        idf: np.ndarray,
+        avg_length: float,
+        k: int,
+        allowed: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Top ``k`` documents by BM25 score.
+
+        Term statistics are passed in rather than taken from this index, so
+        several indexes (one per searcher segment) score on the same scale.
+
+        Args:
+            terms: Query terms
+            idf: Inverse document frequency of each term
+            avg_length: Average document length in tokens
+            k: Maximum number of documents to return
+            allowed: Optional boolean mask over positions; other positions
+                are skipped
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Scores and positions, best first
+        """
+        matched_positions, matched_scores = [], []
+        for term, weight in zip(terms, idf):
+            positions, frequencies = self._postings(term)
+            if not len(positions) or weight <= 0:
+                continue
+            frequencies = frequencies.astype(np.float64)
+            lengths = self._lengths(positions)
+            matched_positions.append(positions)
+            matched_scores.append(
+                weight * frequencies * (BM25_K1 + 1)
+                / (frequencies + BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(avg_length, 1e-9)))
+            )
+        if not matched_positions or k <= 0:
+            return np.empty(0), np.empty(0, dtype=np.int64)
+
+        positions, inverse = np.unique(np.concatenate(matched_positions), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(matched_scores))
+        if allowed is not None:
+            keep = allowed[positions]
+            positions, scores = positions[keep], scores[keep]
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            positions, scores = positions[top], scores[top]
+        order = np.lexsort((positions, -scores))
+        return scores[order], positions[order].astype(np.int64)
+
+    def save(self, folder_path: Path | str, index_name: str) -> None:
+        """Fold the tail into the arrays and write them next to the main index."""
+        self._freeze()
+        manifest = {"covered": self.covered, "last_id": self._last_id}
+        np.savez(
+            Path(folder_path) / f"{index_name}.lexical.npz",
+            # Tokens never contain whitespace, so one newline-separated blob
+            # avoids padding every term to the longest one
+            terms=np.frombuffer("\n".join(self.terms).encode(), dtype=np.uint8),
+            offsets=self.offsets,
+            positions=self.positions,
+            frequencies=self.frequencies,
+            doc_lengths=self.doc_lengths,
+            manifest=np.array(json.dumps(manifest)),
+        )
+
+    @classmethod
+    def load(cls, folder_path: Path | str, index_name: str, db: FAISS) -> "LexicalIndex":
+        """Load the saved index for ``db``, rebuilding it if missing or stale."""
+        path = Path(folder_path) / f"{index_name}.lexical.npz"
+        try:
+            with np.load(path) as saved:
+                manifest = json.loads(str(saved["manifest"]))
+                covered = manifest["covered"]
+                if covered > db.index.ntotal or (
+                    covered and db.index_to_docstore_id.get(covered - 1) != manifest["last_id"]
+                ):
+                    raise ValueError("lexical index doesn't match the main index")
+                index = cls()
+                terms = saved["terms"].tobytes().decode()
+                index.terms = {term: i for i, term in enumerate(terms.split("\n"))} if terms else {}
+                index.offsets = saved["offsets"]
+                index.positions = saved["positions"]
+                index.frequencies = saved["frequencies"]
+                index.doc_lengths = saved["doc_lengths"]
+                index.covered = covered
+                index._last_id = manifest["last_id"]
+        except FileNotFoundError:
+            return cls.build(db)
+        except Exception as e:
+            print(f"Warning: Rebuilding lexical index: {e}")
+            return cls.build(db)
+        index.sync(db)
+        return index
+
+    def _postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        term_id = self.terms.get(term)
+        if term_id is None:
+            positions = np.empty(0, dtype=np.int32)
+            frequencies = np.empty(0, dtype=np.uint16)
+        else:
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            positions, frequencies = self.positions[start:end], self.frequencies[start:end]
+        tail = self._tail.get(term)
+        if tail is not None:
+            positions = np.concatenate([positions, np.asarray(tail[0], dtype=np.int32)])
+            frequencies = np.concatenate([frequencies, np.asarray(tail[1], dtype=np.uint16)])
+        return positions, frequencies
+
+    def _lengths(self, positions: np.ndarray) -> np.ndarray:
+        if not self._tail_lengths:
+            return self.doc_lengths[positions]
+        lengths = np.empty(len(positions), dtype=np.int64)
+        in_arrays = positions < len(self.doc_lengths)
+        lengths[in_arrays] = self.doc_lengths[positions[in_arrays]]
+        lengths[~in_arrays] = np.asarray(self._tail_lengths)[positions[~in_arrays] - len(self.doc_lengths)]
+        return lengths
+
+    def _freeze(self) -> None:
+        """Merge the tail's postings into the sorted arrays."""
+        if not self._tail:
+            self.doc_lengths = np.concatenate([self.doc_lengths, np.asarray(self._tail_lengths, dtype=np.int32)])
+            self._tail_lengths = []
+            return
+        for term in self._tail:
+            self.terms.setdefault(term, len(self.terms))
+        term_ids = [np.repeat(np.arange(len(self.offsets) - 1), np.diff(self.offsets))]
+        positions, frequencies = [self.positions], [self.frequencies]
+        for term, (tail_positions, tail_frequencies) in self._tail.items():
+            term_ids.append(np.full(len(tail_positions), self.terms[term]))
+            positions.append(np.asarray(tail_positions, dtype=np.int32))
+            frequencies.append(np.asarray(tail_frequencies, dtype=np.uint16))
+        term_ids = np.concatenate(term_ids)
+        # Stable, so each term's postings stay in position order
+        order = np.argsort(term_ids, kind="stable")
+        self.positions = np.concatenate(positions)[order]
+        self.frequencies = np.concatenate(frequencies)[order]
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(term_ids, minlength=len(self.terms)))])
+        self.doc_lengths = np.concatenate([self.doc_lengths, np.asarray(self._tail_lengths, dtype=np.int32)])
+        self._tail, self._tail_lengths = {}, []
+
+
+def corpus_statistics(
+    indexes: Sequence[LexicalIndex],
+    terms: Sequence[str]
+) -> Tuple[np.ndarray, float]:
+    """BM25 inverse document frequency of each term and average document length over several indexes.
+
+    Returns:
+        Tuple[np.ndarray, float]: IDF per term and average length in tokens
+    """
+    num_docs = sum(index.num_docs for index in indexes)
+    if not num_docs:
+        return np.zeros(len(terms)), 0.0
+    frequencies = sum(index.document_frequencies(terms) for index in indexes)
+    idf = np.log1p((num_docs - frequencies + 0.5) / (frequencies + 0.5))
+    return idf, sum(index.total_length for index in indexes) / num_docs
@@ -1,7 +1,11 @@
 import os
 import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from typing import Dict, Any, List
+
+import numpy as np
 from pathlib import Path
 
 from langchain_openai import OpenAIEmbeddings
@@ -11,138 +15,499 @@ from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
 
 from resume_wizard.globals import RESUMES_DIR
+from resume_wizard.vectordb.candidate_store import CandidateStore, candidate_store_path
+from resume_wizard.vectordb.embedding_cache import CachedEmbeddings
+from resume_wizard.vectordb.index_types import (
+    INDEX_TYPES,
+    TRAINING_SAMPLE_SIZE,
+    create_index,
+    is_lossless,
+    train_index
+)
+from resume_wizard.vectordb.lexical_index import LexicalIndex
+from resume_wizard.vectordb.section_index import SectionIndexes
+from resume_wizard.vectordb.storage import (
+    WriteAheadLog,
+    apply_record,
+    load_snapshot,
+    save_snapshot
+)
 from resume_wizard.wizard import run_resume_wizard
 
 # Add vector db directory constant
 VECTOR_DB_DIR = Path(__file__).parent / "vector_db"
 VECTOR_DB_NAME = "resume_db"
 
+# Texts per embeddings request and requests in flight at once during bulk adds.
+# OpenAI accepts up to 2048 inputs per request; keep below that and below the
+# account's rate limit.
+EMBEDDING_BATCH_SIZE = int(os.getenv("RESUME_WIZARD_EMBEDDING_BATCH_SIZE", "512"))
+EMBEDDING_MAX_PARALLEL = int(os.getenv("RESUME_WIZARD_EMBEDDING_MAX_PARALLEL", "4"))
+
+# Size the write-ahead log may reach before it is compacted into the snapshot
+COMPACT_WAL_BYTES = int(os.getenv("RESUME_WIZARD_COMPACT_WAL_BYTES", str(64 * 1024 * 1024)))
+
 load_dotenv()
 
 class VectorDBManager:
+    """Owns the on-disk FAISS resume index and writes new resumes into it.
+
+    Construction is cheap: no resumes are parsed and no embeddings are requested
+    until documents are actually added. Re-ingesting the whole ``RESUMES_DIR``
+    corpus only happens through :meth:`build_from_resumes`.
+
+    New resumes are appended to the write-ahead log by :meth:`ingest_resume`
+    without loading the index, and :meth:`compact` folds the log into the
+    saved snapshot. See `resume_wizard.vectordb.storage`.
+    """
+
     def __init__(
         self,
         api_key: str,
         index_type: str | None = "HNSW"
     ):
-        self._embeddings = OpenAIEmbeddings(api_key=api_key)
-        self._embedding_size = len(self._embeddings.embed_query("test"))
-        self._index = self._create_index(index_type)
-        self._raw_data = self._get_raw_resume_data()
+        # Repeated section texts are served from the on-disk embedding cache
+        self._embeddings = CachedEmbeddings(OpenAIEmbeddings(api_key=api_key))
+        self._index_type = index_type
+        self._embedding_size: int | None = None
         self.db = None
+        self.section_indexes: SectionIndexes | None = None
+        self.lexical_index: LexicalIndex | None = None
+        self._candidate_store: CandidateStore | None = None
+        self._log = WriteAheadLog(VECTOR_DB_DIR, VECTOR_DB_NAME)
+        # Last write-ahead log record contained in ``db``
+        self._applied_seq = 0
         
         # Create vector db directory if it doesn't exist
         VECTOR_DB_DIR.mkdir(parents=True, exist_ok=True)
         
     @classmethod
     def load_existing(cls, api_key: str) -> 'VectorDBManager':
-        """Load an existing VectorDBManager with a pre-existing database."""
+        """Load an existing VectorDBManager with a pre-existing database.
+        
+        If no database can be loaded, ``db`` is left unset and an empty one is
+        created the first time a resume is added.
+        """
         manager = cls(api_key)
         try:
-            manager.db = FAISS.load_local(
-                folder_path=str(VECTOR_DB_DIR),
-                index_name=VECTOR_DB_NAME,
-                embeddings=manager._embeddings,
-                allow_dangerous_deserialization=True  # Safe because we're loading our own files
-            )
+            manager.db = manager._load_db()
         except Exception as e:
             print(f"Warning: Could not load existing database: {e}")
-            # Create a new database if loading fails
-            manager.db = manager.create_db().get_db()
         return manager
 
-    def add_single_resume(self, pdf_filename: str) -> bool:
+    @classmethod
+    def build_from_resumes(
+        cls,
+        api_key: str,
+        index_type: str | None = "HNSW"
+    ) -> 'VectorDBManager':
+        """Parse every resume in ``RESUMES_DIR`` into a fresh database and save it.
+        
+        This is the only entry point that re-ingests the full corpus.
+        """
+        manager = cls(api_key, index_type)
+        # Uploaded resumes are saved to RESUMES_DIR before they are logged, so
+        # the rebuild contains everything logged so far
+        manager._applied_seq = manager._log.last_seq()
+        manager.create_db().add_docs_to_db().save()
+        return manager
+
+    @classmethod
+    def rebuild_existing(
+        cls,
+        api_key: str,
+        index_type: str,
+        *,
+        sample_size: int = TRAINING_SAMPLE_SIZE
+    ) -> 'VectorDBManager':
+        """Rebuild the saved database's index as ``index_type`` and save it.
+        
+        Resumes logged since the last snapshot are included. Uploads keep
+        going to the write-ahead log while the index is rebuilt and are
+        folded in just before the new snapshot is saved.
+        """
+        manager = cls(api_key, index_type)
+        manager.db = manager._load_db()
+        manager.rebuild_index(index_type, sample_size=sample_size)
+        with manager._log.writer_lock():
+            manager._catch_up()
+            manager.save()
+        return manager
+
+    @property
+    def embedding_size(self) -> int:
+        """Dimension of the embedding model, probed on first use."""
+        if self._embedding_size is None:
+            self._embedding_size = len(self._embeddings.embed_query("test"))
+        return self._embedding_size
+
+    @property
+    def candidate_store(self) -> CandidateStore:
+        """Structured extraction of every ingested resume, opened on first use."""
+        if self._candidate_store is None:
+            self._candidate_store = CandidateStore(candidate_store_path(VECTOR_DB_DIR, VECTOR_DB_NAME))
+        return self._candidate_store
+
+    def backfill_candidate_store(self) -> int:
+        """Add resumes in ``RESUMES_DIR`` missing from the candidate store.
+        
+        Extractions come from the resume wizard's cache where available.
+        
+        Returns:
+            int: Number of resumes added
+        """
+        missing = [
+            pdf for pdf in sorted(os.listdir(RESUMES_DIR))
+            if pdf.lower().endswith(".pdf") and self.candidate_store.get(pdf) is None
+        ]
+        resumes = []
+        for pdf in missing:
+            resume_data = run_resume_wizard(pdf)
+            if resume_data:
+                resumes.append((pdf, resume_data))
+        self.candidate_store.upsert_many(resumes)
+        return len(resumes)
+
+    def backfill_identities(self) -> int:
+        """Set the candidate name and email on every document of the saved database.
+
+        Documents indexed before identities were attached carry neither, and
+        their project documents hold the project title as ``name``. This
+        moves project titles to ``project_name`` and copies each resume's
+        name and email from the candidate store (run
+        ``--backfill-candidates`` first) or, failing that, from its other
+        documents. No embeddings are requested; the snapshot is rewritten
+        with the same vectors. Restart the API afterwards to pick it up.
+
+        Returns:
+            int: Number of documents changed
+        """
+        with self._log.writer_lock():
+            self.db = self._load_db()
+            positions = range(self.db.index.ntotal)
+            doc_ids = [self.db.index_to_docstore_id[position] for position in positions]
+            documents = [self.db.docstore.search(doc_id) for doc_id in doc_ids]
+
+            identities: Dict[str, Dict[str, Any]] = {}
+            for doc in documents:
+                source = doc.metadata.get("source")
+                if not source or source in identities:
+                    continue
+                resume_data = self.candidate_store.get(source) or {}
+                identities[source] = self._identity_metadata(resume_data, source)
+            for doc in documents:
+                # Fall back to a name or email already on a non-project document
+                identity = identities.get(doc.metadata.get("source"))
+                if identity is not None and doc.metadata.get("section") != "projects":
+                    for field in ("name", "email"):
+                        if doc.metadata.get(field):
+                            identity.setdefault(field, doc.metadata[field])
+
+            changed = 0
+            for doc in documents:
+                metadata = dict(doc.metadata)
+                if metadata.get("section") == "projects" and "project_name" not in metadata:
+                    metadata["project_name"] = metadata.pop("name", None)
+                metadata.update(identities.get(metadata.get("source"), {}))
+                if metadata != doc.metadata:
+                    doc.metadata = metadata
+                    changed += 1
+            if changed:
+                self.db.docstore = InMemoryDocstore(dict(zip(doc_ids, documents)))
+                self.db.index_to_docstore_id = dict(zip(positions, doc_ids))
+                self.save()
+        return changed
+
+    def add_single_resume(
+        self,
+        pdf_filename: str,
+        resume_data: Dict[str, Any] | None = None
+    ) -> bool:
         """Process and add a single resume to the existing vector database.
         
         Args:
             pdf_filename: The name of the PDF file to process
+            resume_data: Already extracted resume data for this file. If not
+                provided, the resume wizard is run on the file.
             
         Returns:
             bool: True if successful, False otherwise
         """
         try:
-            if not self.db:
-                # Try to load existing database
-                self.db = FAISS.load_local(
-                    folder_path=str(VECTOR_DB_DIR),
-                    index_name=VECTOR_DB_NAME,
-                    embeddings=self._embeddings,
-                    allow_dangerous_deserialization=True  # Safe because we're loading our own files
-                )
-            
-            # Process the single resume and get the final data
-            resume_generator = run_resume_wizard(pdf_filename, stream=True)
-            resume_data = None
-            
-            # Stream all updates and capture the final JSON string
-            for item in resume_generator:
-                if isinstance(item, str) and item.startswith('{'): # Capture the JSON string
-                    resume_data = json.loads(item)
-                yield item  # Stream everything to the frontend
-            
-            if not resume_data:
-                raise ValueError("No resume data generated")
-                
-            documents = self._process_resume_data(resume_data, pdf_filename)
-            
-            # Add to database
-            self.db.add_documents(documents)
-            
-            # Save the updated database
-            self.db.save_local(str(VECTOR_DB_DIR), VECTOR_DB_NAME)
-            
+            self.ingest_resume(pdf_filename, resume_data)
             return True
             
         except Exception as e:
             print(f"Error adding resume to database: {e}")
             return False
+
+    def ingest_resume(
+        self,
+        pdf_filename: str,
+        resume_data: Dict[str, Any] | None = None
+    ) -> tuple[List[Document], np.ndarray]:
+        """Embed a resume and durably append it to the write-ahead log.
+        
+        The saved index isn't loaded or rewritten; the resume becomes part of
+        it at the next :meth:`compact`. If this manager has a database loaded,
+        the resume is added to it as well.
+        
+        Args:
+            pdf_filename: The name of the PDF file to process
+            resume_data: Already extracted resume data for this file. If not
+                provided, the resume wizard is run on the file.
+            
+        Returns:
+            tuple[List[Document], np.ndarray]: The added documents and their vectors
+        """
+        if resume_data is None:
+            resume_data = run_resume_wizard(pdf_filename)
+        
+        if not resume_data:
+            raise ValueError("No resume data generated")
+            
+        documents = self._process_resume_data(resume_data, pdf_filename)
+        for doc in documents:
+            doc.id = doc.id or str(uuid.uuid4())
+        vectors = self._embed_documents(documents)
+        
+        # The only step that waits on other writers
+        self._log.append(documents, vectors)
+        try:
+            self.candidate_store.upsert(pdf_filename, resume_data)
+        except Exception as e:
+            # The resume is searchable regardless; only field filters miss it
+            print(f"Warning: Could not add {pdf_filename} to the candidate store: {e}")
         
+        if self.db:
+            self._catch_up()
+        return documents, vectors
+
     def create_db(self) -> FAISS:
         try:
             self.db = FAISS(
                 embedding_function=self._embeddings,
-                index=self._index,
+                index=self._create_index(self._index_type),
                 docstore=InMemoryDocstore(),
                 index_to_docstore_id={}
             )
+            self.section_indexes = SectionIndexes(self.embedding_size, self._index_type)
+            self.lexical_index = LexicalIndex()
             return self
         except Exception as e:
             print(f"Error creating FAISS database: {e}")
             return None
         
-    def add_docs_to_db(self) -> None:
+    def add_docs_to_db(
+        self,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_parallel: int = EMBEDDING_MAX_PARALLEL
+    ) -> 'VectorDBManager':
+        """Add every resume in ``RESUMES_DIR`` to the database in one bulk add.
+        
+        Documents from all resumes are collected first and then embedded
+        together by :meth:`add_documents_bulk`, rather than one embeddings
+        request per resume.
+        """
         if not self.db:
             raise ValueError("Database not created. Call create_db() first.")
         
-        for pdf_file, resume_data in zip(os.listdir(RESUMES_DIR), self._raw_data):
-            documents = self._process_resume_data(resume_data, pdf_file)
-            self.db.add_documents(documents)
+        documents: List[Document] = []
+        resumes = self._get_raw_resume_data()
+        for pdf_file, resume_data in resumes:
+            documents.extend(self._process_resume_data(resume_data, pdf_file))
         
+        self.add_documents_bulk(documents, batch_size=batch_size, max_parallel=max_parallel)
+        self.candidate_store.upsert_many([(pdf_file, data) for pdf_file, data in resumes if data])
         return self
-    
+
+    def add_documents_bulk(
+        self,
+        documents: List[Document],
+        *,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_parallel: int = EMBEDDING_MAX_PARALLEL
+    ) -> List[str]:
+        """Embed documents in fixed-size batches and add them to the index at once.
+        
+        Up to ``max_parallel`` embeddings requests run at a time. The vectors
+        are added to FAISS in a single call once every batch has returned, in
+        the same order as ``documents``.
+        
+        Args:
+            documents: Documents to add
+            batch_size: Number of texts sent per embeddings request
+            max_parallel: Maximum number of embeddings requests in flight
+            
+        Returns:
+            List[str]: Docstore ids of the added documents
+        """
+        if not self.db:
+            raise ValueError("Database not created. Call create_db() first.")
+        if not documents:
+            return []
+        
+        embeddings = self._embed_documents(documents, batch_size=batch_size, max_parallel=max_parallel)
+        if not self.db.index.is_trained and self.db.index.ntotal == 0:
+            # Size the quantized index for the documents it is built from and
+            # train it on a sample of their embeddings
+            self.db.index = create_index(self._index_type, embeddings.shape[1], len(embeddings))
+            train_index(self.db.index, embeddings)
+        return self.db.add_embeddings(
+            [(doc.page_content, vector) for doc, vector in zip(documents, embeddings.tolist())],
+            metadatas=[doc.metadata for doc in documents],
+            ids=[doc.id for doc in documents] if all(doc.id for doc in documents) else None
+        )
+
+    def rebuild_index(
+        self,
+        index_type: str,
+        *,
+        sample_size: int = TRAINING_SAMPLE_SIZE
+    ) -> 'VectorDBManager':
+        """Rebuild the loaded database's FAISS index as ``index_type``.
+        
+        The documents and their docstore ids stay as they are; only the index
+        and section sub-indexes are replaced. Quantized types are trained on
+        ``sample_size`` randomly sampled stored embeddings. Call :meth:`save`
+        to write the result.
+        
+        Args:
+            index_type: One of ``INDEX_TYPES``
+            sample_size: Maximum number of vectors used for training
+        """
+        if not self.db:
+            raise ValueError("Database not created. Call create_db() first.")
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type {index_type!r}; expected one of {INDEX_TYPES}")
+        
+        vectors = self._stored_vectors()
+        index = create_index(index_type, vectors.shape[1], len(vectors), sample_size)
+        train_index(index, vectors, sample_size)
+        index.add(vectors)
+        
+        self.db.index = index
+        self._index_type = index_type
+        self.section_indexes = SectionIndexes.build(self.db, index_type)
+        print(f"Rebuilt index as {index_type} with {index.ntotal} vectors")
+        return self
+
+    def needs_compaction(self, max_log_bytes: int = COMPACT_WAL_BYTES) -> bool:
+        """Whether the write-ahead log has grown past ``max_log_bytes``."""
+        return self._log.size() >= max_log_bytes
+
+    def compact(self) -> 'VectorDBManager':
+        """Fold the write-ahead log into the saved snapshot and truncate it.
+        
+        The snapshot is loaded (or started empty) without holding the writer
+        lock; only catching up on records logged meanwhile and writing the new
+        snapshot hold it.
+        """
+        if not self.db:
+            if (VECTOR_DB_DIR / f"{VECTOR_DB_NAME}.faiss").exists():
+                self.db = self._load_db()
+            else:
+                # Only logged resumes so far
+                self.create_db()
+        with self._log.writer_lock():
+            self._catch_up()
+            self.save()
+        return self
+
     def get_db(self) -> FAISS:
         return self.db
+
+    def save(self) -> None:
+        """Atomically write the database and its per-section sub-indexes to ``VECTOR_DB_DIR``.
+        
+        Vectors added since the last save are copied into their section's
+        sub-index and their documents into the keyword index first, so both
+        always cover the saved database.
+        Write-ahead log records the database contains are dropped afterwards.
+        """
+        if not self.db:
+            raise ValueError("Database not created. Call create_db() first.")
+        with self._log.writer_lock():
+            if self.section_indexes is None:
+                self.section_indexes = SectionIndexes.load(
+                    VECTOR_DB_DIR, VECTOR_DB_NAME, self.db, self._index_type
+                )
+            else:
+                self.section_indexes.sync(self.db)
+            if self.lexical_index is None:
+                self.lexical_index = LexicalIndex.load(VECTOR_DB_DIR, VECTOR_DB_NAME, self.db)
+            else:
+                self.lexical_index.sync(self.db)
+            save_snapshot(
+                self.db,
+                self.section_indexes,
+                VECTOR_DB_DIR,
+                VECTOR_DB_NAME,
+                self._applied_seq,
+                self.lexical_index
+            )
+            self._log.truncate_through(self._applied_seq)
+
+    def _load_db(self) -> FAISS:
+        db, self._applied_seq = load_snapshot(VECTOR_DB_DIR, VECTOR_DB_NAME, self._embeddings)
+        return db
+
+    def _stored_vectors(self) -> np.ndarray:
+        """Every vector in the database, in index order, at full precision.
+        
+        Indexes that store full vectors are read directly. Quantized ones only
+        hold approximations, so their documents are embedded again, which the
+        embedding cache answers without API calls for texts it has seen.
+        """
+        ntotal = self.db.index.ntotal
+        if is_lossless(self.db.index):
+            return self.db.index.reconstruct_n(0, ntotal)
+        documents = [
+            self.db.docstore.search(self.db.index_to_docstore_id[position])
+            for position in range(ntotal)
+        ]
+        return self._embed_documents(documents)
+
+    def _catch_up(self) -> None:
+        """Add write-ahead log records that ``db`` doesn't contain yet."""
+        for record in self._log.records(after_seq=self._applied_seq):
+            apply_record(self.db, record)
+            self._applied_seq = record.seq
+
+    def _embed_documents(
+        self,
+        documents: List[Document],
+        *,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_parallel: int = EMBEDDING_MAX_PARALLEL
+    ) -> np.ndarray:
+        """Embed documents in batches, up to ``max_parallel`` requests at a time."""
+        texts = [doc.page_content for doc in documents]
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        with ThreadPoolExecutor(max_workers=max(1, min(max_parallel, len(batches)))) as pool:
+            embedded_batches = list(pool.map(self._embeddings.embed_documents, batches))
+        
+        print(f"Embedded {len(texts)} documents in {len(batches)} batches")
+        return np.asarray(
+            [vector for batch in embedded_batches for vector in batch], dtype=np.float32
+        ).reshape(len(texts), -1)
         
     def _create_index(self, index_type: str) -> faiss.Index:
-        if index_type == "HNSW":
-            try:
-                return faiss.IndexHNSWFlat(self._embedding_size, 32)
-            except Exception as e:
-                print(f"Error creating HNSW index: {e}")
-                return faiss.IndexFlatL2(self._embedding_size)
-        else:
-            try:
-                return faiss.IndexFlatL2(self._embedding_size)
-            except Exception as e:
-                print(f"Error creating Flat index: {e}")
-                return faiss.IndexFlatL2(self._embedding_size)
-        
-    def _get_raw_resume_data(self) -> list[dict]:
-        resume_pdfs = os.listdir(RESUMES_DIR)
-        data: list[dict] = []
+        # Quantized types are recreated at their final size and trained by the first bulk add
+        try:
+            return create_index(index_type, self.embedding_size)
+        except Exception as e:
+            print(f"Error creating {index_type} index: {e}")
+            return faiss.IndexFlatL2(self.embedding_size)
+        
+    def _get_raw_resume_data(self) -> list[tuple[str, dict]]:
+        resume_pdfs = sorted(
+            pdf for pdf in os.listdir(RESUMES_DIR) if pdf.lower().endswith(".pdf")
+        )
+        data: list[tuple[str, dict]] = []
         for pdf in resume_pdfs:
             resume_data = run_resume_wizard(pdf)
-            data.append(resume_data)
+            data.append((pdf, resume_data))
         return data
         
     def _process_resume_data(self, resume_data: Dict[str, Any], pdf_file: str) -> List[Document]:
@@ -157,6 +522,8 @@ class VectorDBManager:
         """
         documents = []
         
+        identity = self._identity_metadata(resume_data, pdf_file)
+        
         # Convert skills dict to string representation
         skills_str = "Skills:\n"
         skills_data = resume_data.get("skills", {})
@@ -169,7 +536,7 @@ class VectorDBManager:
             documents.append(Document(
                 page_content=skills_str,
                 metadata={
-                    "source": pdf_file,
+                    **identity,
                     "section": "skills"
                 }
             ))
@@ -180,7 +547,7 @@ class VectorDBManager:
             documents.append(Document(
                 page_content=str(objective),
                 metadata={
-                    "source": pdf_file,
+                    **identity,
                     "section": "objective"
                 }
             ))
@@ -195,7 +562,7 @@ class VectorDBManager:
                 documents.append(Document(
                     page_content=content,
                     metadata={
-                        "source": pdf_file,
+                        **identity,
                         "section": "experience",
                         "position": exp.get("position"),
                         "company": exp.get("company")
@@ -212,17 +579,60 @@ class VectorDBManager:
                 documents.append(Document(
                     page_content=content,
                     metadata={
-                        "source": pdf_file,
+                        **identity,
                         "section": "projects",
-                        "name": proj.get("name")
+                        # Not "name", which is always the candidate's
+                        "project_name": proj.get("name")
                     }
                 ))
         
         return documents
+
+    @staticmethod
+    def _identity_metadata(resume_data: Dict[str, Any], pdf_file: str) -> Dict[str, Any]:
+        """Metadata identifying the candidate, shared by every document of a resume.
+
+        Name and email from the contact info extraction go on every document
+        so name/email filters and the candidate index can find them.
+        """
+        identity = {"source": pdf_file}
+        for field in ("name", "email"):
+            if resume_data.get(field):
+                identity[field] = resume_data[field]
+        return identity
     
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Build or rebuild the resume vector database")
+    parser.add_argument("--index-type", default="HNSW", choices=INDEX_TYPES)
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Rebuild the saved database's index as --index-type instead of re-ingesting every resume"
+    )
+    parser.add_argument("--sample-size", type=int, default=TRAINING_SAMPLE_SIZE)
+    parser.add_argument(
+        "--backfill-candidates",
+        action="store_true",
+        help="Add resumes missing from the structured candidate store without touching the index"
+    )
+    parser.add_argument(
+        "--backfill-identities",
+        action="store_true",
+        help="Set candidate name and email metadata on documents indexed without them"
+    )
+    args = parser.parse_args()
+    
     load_dotenv()
     openai_api_key = os.getenv("OPENAI_API_KEY")
-    vdb_manager = VectorDBManager(openai_api_key)
-    vdb = vdb_manager.create_db().add_docs_to_db().get_db()
-    vdb.save_local(str(VECTOR_DB_DIR), VECTOR_DB_NAME)
+    if args.backfill_candidates:
+        added = VectorDBManager(openai_api_key).backfill_candidate_store()
+        print(f"Added {added} resumes to the candidate store")
+    elif args.backfill_identities:
+        changed = VectorDBManager(openai_api_key).backfill_identities()
+        print(f"Updated candidate identity on {changed} documents")
+    elif args.rebuild:
+        VectorDBManager.rebuild_existing(openai_api_key, args.index_type, sample_size=args.sample_size)
+    else:
+        VectorDBManager.build_from_resumes(openai_api_key, args.index_type)
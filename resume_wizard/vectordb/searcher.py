@@ -1,15 +1,62 @@
 from __future__ import annotations
 
 import os
-from typing import Optional, TYPE_CHECKING, List, Dict, Union
+import threading
+from dataclasses import dataclass
+from typing import Optional, TYPE_CHECKING, List, Dict, Sequence, Set, Tuple, Union
 from enum import Enum
 
+import numpy as np
+
 if TYPE_CHECKING:
     from pathlib import Path
 
 from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
 from langchain_openai import OpenAIEmbeddings
 
+from resume_wizard.vectordb.section_index import SectionIndexes
+from resume_wizard.vectordb.candidate_index import DEFAULT_MIN_SIMILARITY
+from resume_wizard.vectordb.candidate_store import CandidateStore, candidate_store_path
+from resume_wizard.vectordb.candidate_ranking import AGGREGATIONS, rank_sources
+from resume_wizard.vectordb.flat_layout import MmapFlatIndex, MmapSectionIndexes
+from resume_wizard.vectordb.fusion import reciprocal_rank_fusion
+from resume_wizard.vectordb.job_matching import (
+    DEFAULT_MATCH_THRESHOLD,
+    MAX_REQUIREMENTS,
+    cosine_similarities,
+    rank_by_coverage,
+    split_requirements,
+)
+from resume_wizard.vectordb.lexical_index import LexicalIndex, corpus_statistics, tokenize
+from resume_wizard.vectordb.segment import IndexSegment
+from resume_wizard.vectordb.storage import load_snapshot, read_snapshot
+from resume_wizard.vectordb.embedding_cache import (
+    DEFAULT_QUERY_CACHE_SIZE,
+    DEFAULT_QUERY_CACHE_TTL,
+    CachedEmbeddings,
+    QueryEmbeddingCache,
+)
+
+# Delta segments kept before they are merged into one
+DEFAULT_MAX_DELTA_SEGMENTS = 16
+
+# Serve the saved vectors from the shared memory-mapped flat layout
+DEFAULT_MMAP_INDEX = os.getenv("RESUME_WIZARD_MMAP_INDEX", "0") == "1"
+
+# How `get_relevant_candidates` matches the prompt unless told otherwise
+SEARCH_MODES = ("vector", "hybrid", "lexical")
+DEFAULT_SEARCH_MODE = os.getenv("RESUME_WIZARD_SEARCH_MODE", "vector")
+
+# Results taken from each side of a hybrid search before fusing
+HYBRID_FETCH_K = 50
+
+# Section hits fetched per segment when ranking candidates
+DEFAULT_CANDIDATE_FETCH_K = int(os.getenv("RESUME_WIZARD_CANDIDATE_FETCH_K", "200"))
+
+# Sections fetched per requirement and segment to shortlist candidates for job matching
+DEFAULT_JOB_MATCH_FETCH_K = int(os.getenv("RESUME_WIZARD_JOB_MATCH_FETCH_K", "50"))
+
 class ResumeSection(Enum):
     BASIC_INFO = "basic_info"
     OBJECTIVE = "objective"
@@ -18,16 +65,91 @@ class ResumeSection(Enum):
     SKILLS = "skills"
     PROJECTS = "projects"
 
+@dataclass
+class SearchRequest:
+    """One search for `VectorDBSearcher.search_batch`, with the arguments of
+    `VectorDBSearcher.get_relevant_candidates`."""
+    prompt: str
+    section: Optional[Union[ResumeSection, str]] = None
+    source_file: Optional[str] = None
+    candidate_name: Optional[str] = None
+    candidate_email: Optional[str] = None
+    max_docs: int = 5
+    score_threshold: float = 0.5
+    ef_search: Optional[int] = None
+    nprobe: Optional[int] = None
+    mode: Optional[str] = None
+    candidate_filters: Sequence[str] = ()
+
+    @property
+    def search_mode(self) -> str:
+        return self.mode or DEFAULT_SEARCH_MODE
+
+    @property
+    def fetch_k(self) -> int:
+        """Vector results needed: ``max_docs``, or more for hybrid fusion."""
+        return self.max_docs if self.search_mode == "vector" else max(self.max_docs, HYBRID_FETCH_K)
+
+    def metadata_filter(self) -> Dict[str, str]:
+        metadata_filter = {}
+
+        # Add section filter if specified
+        if self.section:
+            section = self.section
+            metadata_filter["section"] = section.value if isinstance(section, ResumeSection) else section
+
+        # Add other filters if specified
+        if self.source_file:
+            metadata_filter["source"] = self.source_file
+        if self.candidate_name:
+            metadata_filter["name"] = self.candidate_name
+        if self.candidate_email:
+            metadata_filter["email"] = self.candidate_email
+        return metadata_filter
+
 class VectorDBSearcher:
     def __init__(
         self, 
         vector_db_dir: Path, 
         database_name: str, 
-        embeddings: OpenAIEmbeddings
+        embeddings: OpenAIEmbeddings,
+        *,
+        query_cache_size: int = DEFAULT_QUERY_CACHE_SIZE,
+        query_cache_ttl: float = DEFAULT_QUERY_CACHE_TTL,
+        disk_cache: bool = False,
+        max_delta_segments: int = DEFAULT_MAX_DELTA_SEGMENTS,
+        mmap_index: bool = DEFAULT_MMAP_INDEX
     ):
+        """
+        Args:
+            vector_db_dir: Directory holding the saved FAISS index
+            database_name: Index name used when it was saved
+            embeddings: Embeddings used to embed search queries
+            query_cache_size: Maximum number of query vectors kept in memory
+            query_cache_ttl: Seconds a cached query vector stays valid
+            disk_cache: If True, back the in-memory query cache with the shared
+                on-disk embedding cache. Ignored if ``embeddings`` is already a
+                `CachedEmbeddings`.
+            max_delta_segments: Number of delta segments from
+                `add_embedded_documents` kept before they are merged
+            mmap_index: If True, search the saved vectors read-only from the
+                memory-mapped flat layout, shared with every other process
+                that maps it, instead of loading a private copy of the
+                index. Searches become exact flat scans. A searcher never
+                saves the index, and a memory-mapped one can't be saved.
+        """
         self.vector_db_dir = vector_db_dir
         self.database_name = database_name
-        self.embeddings = embeddings
+        self.mmap_index = mmap_index
+        if disk_cache and not isinstance(embeddings, CachedEmbeddings):
+            embeddings = CachedEmbeddings(embeddings)
+        # Repeated queries skip the embeddings round-trip entirely
+        self.query_cache = QueryEmbeddingCache(
+            embeddings,
+            maxsize=query_cache_size,
+            ttl=query_cache_ttl
+        )
+        self.embeddings = self.query_cache
 
         # Enhanced metadata schema for resumes
         self.metadata_schema = {
@@ -36,16 +158,68 @@ class VectorDBSearcher:
             "name": [],    # Will be populated with candidate names
             "email": [],   # Will be populated with candidate emails
         }
-        self.database = self.load_database()
+        # Every file is read from the same snapshot, even if a compaction
+        # replaces it meanwhile
+        with read_snapshot(self.vector_db_dir, self.database_name):
+            db = self.load_database()
+            if isinstance(db.index, MmapFlatIndex):
+                section_indexes = MmapSectionIndexes(db.index.layout)
+                section_indexes.sync(db)
+            else:
+                section_indexes = SectionIndexes.load(self.vector_db_dir, self.database_name, db)
+            lexical_index = LexicalIndex.load(self.vector_db_dir, self.database_name, db)
+        base = IndexSegment(db, section_indexes, lexical_index)
+        # Searches read this tuple once and use it throughout, so swapping in a
+        # new tuple never blocks or disturbs a search in flight
+        self._segments: Tuple[IndexSegment, ...] = (base,)
+        # Bumped after every change to the searchable documents, so callers
+        # caching search results can tell when they went stale
+        self.index_version = 0
+        self._write_lock = threading.Lock()
+        self.max_delta_segments = max_delta_segments
+        self._candidate_store: Optional[CandidateStore] = None
+        self._update_metadata_schema()
+
+    @property
+    def database(self) -> FAISS:
+        """The FAISS store loaded from disk, without documents added since."""
+        return self._segments[0].db
+
+    @property
+    def document_count(self) -> int:
+        """Number of searchable documents, including ones added since loading."""
+        return sum(segment.ntotal for segment in self._segments)
+
+    @property
+    def candidate_store(self) -> Optional[CandidateStore]:
+        """The manager's structured candidate store, or None if it hasn't been created."""
+        if self._candidate_store is None:
+            path = candidate_store_path(self.vector_db_dir, self.database_name)
+            if path.exists():
+                self._candidate_store = CandidateStore(path)
+        return self._candidate_store
+
+    def candidate_sources(self, candidate_filters: Optional[Sequence[str]]) -> Optional[Set[str]]:
+        """Resumes matching every candidate filter, or None if there are no filters.
+
+        Raises:
+            ValueError: If a filter is invalid or there is no candidate store
+        """
+        if not candidate_filters:
+            return None
+        store = self.candidate_store
+        if store is None:
+            raise ValueError(
+                "Candidate filters need the candidate store; build it with "
+                "`python -m resume_wizard.vectordb.manager --backfill-candidates`"
+            )
+        return store.matching_sources(candidate_filters)
 
     def load_database(self) -> FAISS:
-        """Load the FAISS database and attach metadata schema."""
+        """Load the FAISS database with logged resumes replayed and attach metadata schema."""
         try:
-            db = FAISS.load_local(
-                folder_path=str(self.vector_db_dir),
-                index_name=self.database_name,
-                embeddings=self.embeddings,
-                allow_dangerous_deserialization=True,
+            db, _ = load_snapshot(
+                self.vector_db_dir, self.database_name, self.embeddings, mmap=self.mmap_index
             )
             # Attach metadata schema to loaded database
             db.metadata_schema = self.metadata_schema
@@ -53,6 +227,33 @@ class VectorDBSearcher:
         except Exception as e:
             raise RuntimeError(f"Failed to load database: {e}")
 
+    def add_embedded_documents(
+        self,
+        documents: Sequence[Document],
+        vectors: np.ndarray
+    ) -> None:
+        """Make documents that were just logged to the on-disk index searchable.
+
+        The documents become a new delta segment; the loaded index is not
+        touched or copied. Once there are more than ``max_delta_segments``
+        deltas they are merged into one, which copies only the deltas.
+
+        Args:
+            documents: Documents added to the index, in index order
+            vectors: Their embeddings, one row per document
+        """
+        if not documents:
+            return
+        with self._write_lock:
+            segment = IndexSegment.from_embeddings(documents, vectors, self.embeddings)
+            base, *deltas = self._segments
+            deltas.append(segment)
+            if len(deltas) > self.max_delta_segments:
+                deltas = [IndexSegment.merge(deltas, self.embeddings)]
+            self._segments = (base, *deltas)
+            self.index_version += 1
+            self._update_metadata_schema()
+
     def get_relevant_candidates(
         self,
         prompt: str,
@@ -63,6 +264,11 @@ class VectorDBSearcher:
         candidate_email: Optional[str] = None, # filter by candidate email
         max_docs: int = 5, # number of candidates to return
         score_threshold: float = 0.5, # minimum relevance score
+        ef_search: Optional[int] = None, # HNSW search effort
+        nprobe: Optional[int] = None, # IVF search effort
+        mode: Optional[str] = None, # vector, hybrid or lexical
+        candidate_filters: Sequence[str] = (), # e.g. "gpa>=3.5"
+        raise_errors: bool = False, # raise instead of returning no results
     ) -> List[Dict]:
         """Enhanced search with multiple filtering options.
 
@@ -74,49 +280,557 @@ class VectorDBSearcher:
             candidate_email: Search by candidate email
             max_docs: Maximum number of documents to return
             score_threshold: Minimum relevance score (0-1)
+            ef_search: HNSW candidate list size for this query, trading
+                latency for recall. None uses the server default; values
+                above the server cap are clamped to it.
+            nprobe: IVF inverted lists probed for this query, with the same
+                default and cap handling as ``ef_search``
+            mode: One of `SEARCH_MODES`, or None for `DEFAULT_SEARCH_MODE`:
+
+                - ``vector``: embedding similarity
+                - ``lexical``: BM25 keyword search, answered in-process
+                  without an embeddings request. Scores are relative to
+                  the best match.
+                - ``hybrid``: both, fused by reciprocal rank. The threshold
+                  applies to the vector scores before fusing; returned
+                  scores are fused scores scaled to (0, 1].
+            candidate_filters: Expressions over the structured candidate
+                store, such as ``gpa>=3.5``, ``skills ⊇ {python, aws}`` or
+                ``location=VA`` (see `parse_filter`). Only documents of
+                matching resumes are searched.
+            raise_errors: If True, a failed search (e.g. an embeddings
+                request timing out) raises instead of returning an empty
+                list, so callers can tell it from a search with no matches
 
         Returns:
             List[Dict]: List of relevant documents with their metadata
         """
+        return self.search_batch([SearchRequest(
+            prompt,
+            section=section,
+            source_file=source_file,
+            candidate_name=candidate_name,
+            candidate_email=candidate_email,
+            max_docs=max_docs,
+            score_threshold=score_threshold,
+            ef_search=ef_search,
+            nprobe=nprobe,
+            mode=mode,
+            candidate_filters=candidate_filters,
+        )], raise_errors=raise_errors)[0]
+
+    def search_batch(
+        self,
+        requests: Sequence[SearchRequest],
+        *,
+        raise_errors: bool = False
+    ) -> List[List[Dict]]:
+        """Run several searches together, with the results `get_relevant_candidates` gives each.
+
+        Every prompt that needs a vector is embedded in one embeddings
+        request (cached prompts aside). Searches are then grouped, one group
+        over the whole index and one per section for section-only searches,
+        split further by search effort and candidate filters, and each
+        segment is searched once per group with the group's whole query
+        matrix.
+
+        Args:
+            requests: The searches to run
+            raise_errors: If True, re-raise a failure while embedding or
+                searching instead of returning empty results for the
+                searches it affected
+
+        Returns:
+            List[List[Dict]]: Results of each search, in request order
+
+        Raises:
+            ValueError: If a request has an unknown mode or an invalid
+                candidate filter
+        """
+        for request in requests:
+            if request.search_mode not in SEARCH_MODES:
+                raise ValueError(f"mode must be one of {SEARCH_MODES}, got {request.mode!r}")
+        # Resumes each request is restricted to, looked up once per distinct set of filters
+        matches: Dict[Tuple[str, ...], Optional[Set[str]]] = {}
+        for request in requests:
+            key = tuple(request.candidate_filters)
+            if key not in matches:
+                matches[key] = self.candidate_sources(key)
+        sources = [matches[tuple(request.candidate_filters)] for request in requests]
+
+        results: List[List[Dict]] = [[] for _ in requests]
+        pending = []
+        for row, request in enumerate(requests):
+            if not request.prompt.strip() and (request.metadata_filter() or sources[row] is not None):
+                # Nothing to rank by, so answer from the metadata index without
+                # embedding the prompt or searching vectors
+                results[row] = self._filter_sources(request, sources[row])
+            else:
+                pending.append(row)
+
         try:
-            metadata_filter = {}
-
-            # Add section filter if specified
-            if section:
-                section_value = section.value if isinstance(section, ResumeSection) else section
-                metadata_filter["section"] = section_value
-
-            # Add other filters if specified
-            if source_file:
-                metadata_filter["source"] = source_file
-            if candidate_name:
-                metadata_filter["name"] = candidate_name
-            if candidate_email:
-                metadata_filter["email"] = candidate_email
-
-            # Perform search with filters
-            docs_and_scores = self.database.similarity_search_with_relevance_scores(
-                prompt,
-                k=max_docs,
-                filter=metadata_filter if metadata_filter else None
+            segments = self._segments
+            vector_rows = [row for row in pending if requests[row].search_mode != "lexical"]
+            vector_hits: Dict[int, List[Tuple[Document, float]]] = {}
+            if vector_rows:
+                query_vectors = np.asarray(
+                    self.embeddings.embed_queries([requests[row].prompt for row in vector_rows]),
+                    dtype=np.float32
+                )
+                vector_hits = dict(zip(
+                    vector_rows,
+                    self._vector_hits(
+                        segments,
+                        query_vectors,
+                        [requests[row] for row in vector_rows],
+                        [sources[row] for row in vector_rows]
+                    )
+                ))
+            for row in pending:
+                results[row] = self._finish_search(segments, requests[row], vector_hits.get(row), sources[row])
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Warning: Failed to retrieve relevant documents: {e}")
+        return results
+
+    def _filter_sources(self, request: SearchRequest, sources: Optional[Set[str]]) -> List[Dict]:
+        """Documents matching a request's filters, for requests without a prompt."""
+        if sources is None:
+            return self.filter_documents(
+                section=request.section,
+                source_file=request.source_file,
+                candidate_name=request.candidate_name,
+                candidate_email=request.candidate_email,
+                max_docs=request.max_docs
+            )
+        if request.source_file:
+            sources = sources & {request.source_file}
+        results: List[Dict] = []
+        for source in sorted(sources):
+            if len(results) >= request.max_docs:
+                break
+            results.extend(self.filter_documents(
+                section=request.section,
+                source_file=source,
+                candidate_name=request.candidate_name,
+                candidate_email=request.candidate_email,
+                max_docs=request.max_docs - len(results)
+            ))
+        return results
+
+    def _finish_search(
+        self,
+        segments: Sequence[IndexSegment],
+        request: SearchRequest,
+        vector_hits: Optional[List[Tuple[Document, float]]],
+        sources: Optional[Set[str]] = None
+    ) -> List[Dict]:
+        """Combine a search's vector hits with keyword hits as its mode asks and format them."""
+        metadata_filter = request.metadata_filter()
+        score_threshold = request.score_threshold
+        if request.search_mode == "lexical":
+            # Scored relative to the best match, so the threshold keeps
+            # documents scoring at least that fraction of it
+            docs_and_scores = self._keyword_hits(
+                segments, request.prompt, request.max_docs, metadata_filter, sources
+            )
+            if docs_and_scores:
+                best = docs_and_scores[0][1]
+                docs_and_scores = [(doc, score / best) for doc, score in docs_and_scores]
+        elif request.search_mode == "hybrid":
+            # The threshold applies to vector scores before fusing; keyword
+            # matches always take part
+            docs_and_scores = reciprocal_rank_fusion([
+                [(doc, score) for doc, score in vector_hits if score >= score_threshold],
+                self._keyword_hits(segments, request.prompt, request.fetch_k, metadata_filter, sources),
+            ])
+            score_threshold = 0.0
+        else:
+            docs_and_scores = vector_hits
+
+        # Format results with metadata, best across all segments first
+        results = []
+        for doc, score in docs_and_scores:
+            if score >= score_threshold:
+                results.append({
+                    "content": doc.page_content,
+                    "metadata": doc.metadata,
+                    "relevance_score": score
+                })
+
+        return results[:request.max_docs]
+
+    def _vector_hits(
+        self,
+        segments: Sequence[IndexSegment],
+        query_vectors: np.ndarray,
+        requests: Sequence[SearchRequest],
+        sources: Sequence[Optional[Set[str]]]
+    ) -> List[List[Tuple[Document, float]]]:
+        """Nearest documents for each request across segments, best first.
+
+        Requests restricted to some resumes by candidate filters search only
+        those resumes' documents.
+
+        Returns:
+            List[List[Tuple[Document, float]]]: Up to ``fetch_k`` documents
+                with relevance scores per request, in request order
+        """
+        filters = [request.metadata_filter() for request in requests]
+        groups: Dict[Tuple[Optional[str], Optional[int], Optional[int], Tuple[str, ...]], List[int]] = {}
+        for row, (request, metadata_filter) in enumerate(zip(requests, filters)):
+            # Section-only searches go to that section's sub-index instead of
+            # post-filtering a search over the whole index. With candidate
+            # filters the section is selected along with the resumes instead.
+            section = (
+                metadata_filter["section"]
+                if set(metadata_filter) == {"section"} and sources[row] is None else None
             )
+            key = (section, request.ef_search, request.nprobe, tuple(request.candidate_filters))
+            groups.setdefault(key, []).append(row)
+
+        hits: List[List[Tuple[Document, float]]] = [[] for _ in requests]
+        for (section, ef_search, nprobe, _), rows in groups.items():
+            ks = [requests[row].fetch_k for row in rows]
+            group_sources = sources[rows[0]]
+            for segment in segments:
+                if section is not None:
+                    found = segment.search_section_many(
+                        query_vectors[rows], section, ks, ef_search=ef_search, nprobe=nprobe
+                    )
+                else:
+                    found = segment.similarity_search_many(
+                        query_vectors[rows], ks, [filters[row] for row in rows],
+                        ef_search=ef_search, nprobe=nprobe, sources=group_sources
+                    )
+                for row, docs_and_scores in zip(rows, found):
+                    hits[row].extend(docs_and_scores)
+
+        for row, request in enumerate(requests):
+            hits[row].sort(key=lambda doc_and_score: doc_and_score[1], reverse=True)
+            del hits[row][request.fetch_k:]
+        return hits
+
+    def _keyword_hits(
+        self,
+        segments: Sequence[IndexSegment],
+        prompt: str,
+        k: int,
+        metadata_filter: Dict[str, str],
+        sources: Optional[Set[str]] = None
+    ) -> List[Tuple[Document, float]]:
+        """Best BM25 matches across segments, best first, scored on corpus-wide statistics."""
+        terms = list(dict.fromkeys(tokenize(prompt)))
+        if not terms:
+            return []
+        idf, avg_length = corpus_statistics([segment.lexical_index for segment in segments], terms)
+        docs_and_scores = [
+            doc_and_score
+            for segment in segments
+            for doc_and_score in segment.lexical_search(terms, idf, avg_length, k, metadata_filter, sources)
+        ]
+        docs_and_scores.sort(key=lambda doc_and_score: doc_and_score[1], reverse=True)
+        return docs_and_scores[:k]
+
+    def rank_candidates(
+        self,
+        prompt: str,
+        *,
+        max_candidates: int = 5,
+        aggregation: str = "weighted_sum",
+        section_weights: Optional[Dict[str, float]] = None,
+        sections_per_candidate: int = 3,
+        score_threshold: Optional[float] = None,
+        fetch_k: int = DEFAULT_CANDIDATE_FETCH_K,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        candidate_filters: Sequence[str] = (),
+    ) -> List[Dict]:
+        """Rank candidates by how well their resume sections match a query.
+
+        Each segment is searched once for its ``fetch_k`` nearest sections
+        and the hits are aggregated per resume by `rank_sources`, so a
+        candidate matching in skills, experience and projects outranks one
+        matching in a single section. Candidates with no section among the
+        nearest ``fetch_k`` aren't considered.
+
+        Args:
+            prompt: Search query
+            max_candidates: Maximum number of candidates to return
+            aggregation: How section scores combine per candidate:
+                ``weighted_sum`` or ``max``
+            section_weights: Per-section weights overriding
+                `DEFAULT_SECTION_WEIGHTS`
+            sections_per_candidate: Best-matching sections returned per candidate
+            score_threshold: Ignore section hits scoring below this, and
+                measure section scores from it. None measures them from the
+                weakest hit fetched.
+            fetch_k: Section hits fetched per segment, raised to at least
+                ``max_candidates`` times the number of sections
+            ef_search: HNSW search effort, as in `get_relevant_candidates`
+            nprobe: IVF search effort, as in `get_relevant_candidates`
+            candidate_filters: Only rank resumes matching these, as in
+                `get_relevant_candidates`
+
+        Returns:
+            List[Dict]: Best candidates first, each with its source file,
+                name, email, aggregate score and best sections in the shape
+                returned by `get_relevant_candidates`
+        """
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"aggregation must be one of {AGGREGATIONS}, got {aggregation!r}")
+        if not prompt.strip():
+            return []
+        allowed_sources = self.candidate_sources(candidate_filters)
+
+        try:
+            segments = self._segments
+            query_vector = self.embeddings.embed_query(prompt)
+            k = max(fetch_k, max_candidates * len(ResumeSection))
+            hits = [
+                segment.section_hits(query_vector, k, ef_search=ef_search, nprobe=nprobe, sources=allowed_sources)
+                for segment in segments
+            ]
+            scores, positions, sources, sections = (np.concatenate(parts) for parts in zip(*hits))
+            hit_segments = np.repeat(np.arange(len(segments)), [len(part[0]) for part in hits])
+            if score_threshold is not None:
+                keep = scores >= score_threshold
+                scores, positions, sources, sections, hit_segments = (
+                    scores[keep], positions[keep], sources[keep], sections[keep], hit_segments[keep]
+                )
 
-            # Format results with metadata
             results = []
-            for doc, score in docs_and_scores:
-                if score >= score_threshold:
-                    results.append({
+            for ranked in rank_sources(
+                sources,
+                sections,
+                scores,
+                aggregation=aggregation,
+                section_weights=section_weights,
+                limit=max_candidates,
+                hits_per_source=sections_per_candidate,
+                floor=score_threshold,
+            ):
+                best_sections = []
+                for hit in ranked.hits:
+                    doc = segments[hit_segments[hit]].document_at(positions[hit])
+                    best_sections.append({
                         "content": doc.page_content,
                         "metadata": doc.metadata,
-                        "relevance_score": score
+                        "relevance_score": float(scores[hit])
                     })
+                name, email = segments[hit_segments[ranked.hits[0]]].identity(ranked.source)
+                results.append({
+                    "source": ranked.source,
+                    "name": name,
+                    "email": email,
+                    "score": ranked.score,
+                    "sections": best_sections
+                })
+            return results
+
+        except Exception as e:
+            print(f"Warning: Failed to rank candidates: {e}")
+            return []
+
+    def match_job_description(
+        self,
+        job_description: str,
+        *,
+        max_candidates: int = 10,
+        match_threshold: float = DEFAULT_MATCH_THRESHOLD,
+        max_requirements: int = MAX_REQUIREMENTS,
+        fetch_k: int = DEFAULT_JOB_MATCH_FETCH_K,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        candidate_filters: Sequence[str] = (),
+    ) -> Dict:
+        """Rank candidates by how many of a job description's requirements they meet.
+
+        The description is split into requirement phrases, which are
+        embedded in one request. Each segment is searched once with all of
+        them to shortlist candidates: those with a section among the
+        ``fetch_k`` nearest to some requirement. Every section vector of
+        every shortlisted candidate is then compared with every requirement
+        in one similarity matrix, and candidates are ranked by the number of
+        requirements one of their sections meets.
+
+        Args:
+            job_description: Job description text
+            max_candidates: Maximum number of candidates to return
+            match_threshold: Cosine similarity at which a section meets a
+                requirement
+            max_requirements: Maximum number of requirement phrases used
+            fetch_k: Sections fetched per requirement and segment for the
+                shortlist
+            ef_search: HNSW search effort, as in `get_relevant_candidates`
+            nprobe: IVF search effort, as in `get_relevant_candidates`
+            candidate_filters: Only match resumes matching these, as in
+                `get_relevant_candidates`
 
-            return results[:max_docs]
+        Returns:
+            Dict: The ``requirements`` phrases and the best ``candidates``
+                first, each with its source file, name, email, ``coverage``
+                (fraction of requirements met), ``requirements_met``,
+                ``score`` (mean best similarity) and, for every requirement,
+                its best section as evidence
+        """
+        requirements = split_requirements(job_description, max_requirements)
+        if not requirements:
+            return {"requirements": [], "candidates": []}
+        allowed_sources = self.candidate_sources(candidate_filters)
+
+        try:
+            segments = self._segments
+            query_vectors = np.asarray(self.embeddings.embed_queries(requirements), dtype=np.float32)
+            shortlist: Dict[str, None] = {}
+            for segment in segments:
+                _, positions = segment.search_vectors(
+                    query_vectors, fetch_k, ef_search=ef_search, nprobe=nprobe,
+                    allowed=segment.source_mask(allowed_sources) if allowed_sources is not None else None
+                )
+                shortlist.update(dict.fromkeys(segment.sources_at(positions[positions >= 0]).tolist()))
+            shortlist.pop("", None)
+            sources = list(shortlist)
+            if not sources:
+                return {"requirements": requirements, "candidates": []}
+
+            parts = [segment.source_vectors(sources) for segment in segments]
+            positions, owners, vectors = (np.concatenate(part) for part in zip(*parts))
+            row_segments = np.repeat(np.arange(len(segments)), [len(part[0]) for part in parts])
+            ranking = rank_by_coverage(
+                cosine_similarities(vectors, query_vectors), owners, len(sources), match_threshold
+            )
+
+            candidates = []
+            for code in ranking.order[:max_candidates]:
+                evidence = []
+                for requirement, similarity, row in zip(requirements, ranking.best[code], ranking.evidence[code]):
+                    doc = segments[row_segments[row]].document_at(positions[row])
+                    evidence.append({
+                        "requirement": requirement,
+                        "similarity": float(similarity),
+                        "matched": bool(similarity >= match_threshold),
+                        "content": doc.page_content,
+                        "metadata": doc.metadata
+                    })
+                name, email = segments[row_segments[ranking.evidence[code, 0]]].identity(sources[code])
+                candidates.append({
+                    "source": sources[code],
+                    "name": name,
+                    "email": email,
+                    "coverage": float(ranking.covered[code] / len(requirements)),
+                    "requirements_met": int(ranking.covered[code]),
+                    "score": float(ranking.mean_similarity[code]),
+                    "requirements": evidence
+                })
+            return {"requirements": requirements, "candidates": candidates}
 
         except Exception as e:
-            print(f"Warning: Failed to retrieve relevant documents: {e}")
+            print(f"Warning: Failed to match job description: {e}")
+            return {"requirements": requirements, "candidates": []}
+
+    def filter_documents(
+        self,
+        *,
+        section: Optional[Union[ResumeSection, str]] = None,
+        source_file: Optional[str] = None,
+        candidate_name: Optional[str] = None,
+        candidate_email: Optional[str] = None,
+        max_docs: Optional[int] = None,
+    ) -> List[Dict]:
+        """Return every document whose metadata matches all the given filters.
+
+        Answered from the inverted metadata index in time proportional to the
+        number of matches, with no embedding call, so results are complete at
+        any corpus size. Documents come back in index order with a relevance
+        score of 1.0.
+
+        Args:
+            section: Only documents from this resume section
+            source_file: Only documents from this resume file
+            candidate_name: Only documents for this candidate name
+            candidate_email: Only documents for this candidate email
+            max_docs: Maximum number of documents to return, or None for all
+
+        Returns:
+            List[Dict]: Matching documents in the same shape as `get_relevant_candidates`
+        """
+        if isinstance(section, ResumeSection):
+            section = section.value
+        filters = {
+            field: value
+            for field, value in (
+                ("section", section),
+                ("source", source_file),
+                ("name", candidate_name),
+                ("email", candidate_email),
+            )
+            if value
+        }
+        if not filters:
             return []
 
+        results = []
+        for segment in self._segments:
+            remaining = None if max_docs is None else max_docs - len(results)
+            if remaining is not None and remaining <= 0:
+                break
+            for doc in segment.filter_documents(filters, remaining):
+                results.append({
+                    "content": doc.page_content,
+                    "metadata": doc.metadata,
+                    "relevance_score": 1.0
+                })
+        return results
+
+    def find_candidate_documents(
+        self,
+        query: str,
+        *,
+        max_candidates: int = 5,
+        max_docs: Optional[int] = None,
+        min_similarity: float = DEFAULT_MIN_SIMILARITY,
+    ) -> List[Dict]:
+        """Return the documents of the candidates whose name or email best matches ``query``.
+
+        Names and emails are matched through the fuzzy candidate index, so
+        partial names and small typos still resolve. No embedding call is made.
+        Resumes indexed before names and emails were stored on their documents
+        aren't found until
+        ``python -m resume_wizard.vectordb.manager --backfill-identities`` is run.
+
+        Args:
+            query: Full or partial candidate name or email
+            max_candidates: Maximum number of matching candidates to include
+            max_docs: Maximum number of documents to return, or None for all
+            min_similarity: Minimum trigram similarity for fuzzy matches
+
+        Returns:
+            List[Dict]: Documents of the best matching candidates first, each
+                scored with its candidate's match score
+        """
+        best: Dict[str, float] = {}
+        for segment in self._segments:
+            for source, score in segment.candidate_index.lookup(
+                query, limit=max_candidates, min_similarity=min_similarity
+            ):
+                best[source] = max(score, best.get(source, 0.0))
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))[:max_candidates]
+
+        results = []
+        for source, score in ranked:
+            for result in self.filter_documents(source_file=source):
+                result["relevance_score"] = score
+                results.append(result)
+        return results[:max_docs] if max_docs is not None else results
+
+    def _update_metadata_schema(self) -> None:
+        for field in ("source", "name", "email"):
+            self.metadata_schema[field] = sorted({
+                value for segment in self._segments for value in segment.metadata_values(field)
+            })
+
     def search_by_section(
         self,
         section: ResumeSection, # specifically get candidates from this section
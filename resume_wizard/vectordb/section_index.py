@@ -0,0 +1,333 @@
+"""Per-section FAISS sub-indexes for pre-filtered section search.
+
+The main index holds every section of every resume. A search restricted to
+one section through LangChain's ``filter`` still walks the whole index and
+throws away neighbours from other sections, so it costs as much as a full
+search and misses results when another section dominates the nearest
+``fetch_k``. `SectionIndexes` keeps one small index per section whose ids are
+positions in the main index, so a section search only touches that
+section's vectors and maps straight back to the main docstore.
+
+Sub-indexes store vectors the way the main index does rather than as a
+float32 copy, so quantized main indexes keep their memory savings:
+
+- IVF main indexes get no copies at all. A section is one bit per
+  main-index position, and its searches run on the main index restricted to
+  those positions with a FAISS selector.
+- ``HNSW-SQ`` sections are 8-bit quantized with the main index's trained
+  value ranges.
+- ``Flat`` and ``HNSW`` sections hold full vectors, as the main index does.
+
+Sub-indexes are saved next to the main index as
+``<name>.section.<section>.faiss`` (``.npy`` for the bitmaps of an IVF main
+index) with a ``<name>.sections.json`` manifest recording how many
+main-index vectors they cover.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import faiss
+import numpy as np
+from langchain_community.vectorstores import FAISS
+
+from resume_wizard.vectordb.docstore import iter_indexed_metadata
+from resume_wizard.vectordb.index_types import DEFAULT_IVF_NPROBE, HNSW_M, search_parameters
+
+# Sections smaller than this use an exact flat index even when the main index is HNSW
+HNSW_MIN_SECTION_SIZE = 10_000
+
+# Bumped when sub-indexes are stored differently; older saves are rebuilt
+_MANIFEST_FORMAT = 2
+
+
+class SelectedSection:
+    """A section of an IVF main index, searched in place through a selector.
+
+    Holds one bit per main-index position instead of the section's vectors.
+    A search probes the same inverted lists a full search would and only
+    scores the section's entries.
+    """
+
+    def __init__(self, main_index: faiss.Index, bits: Optional[np.ndarray] = None):
+        self.main_index = main_index
+        # Little-endian bitmap over main-index positions, as IDSelectorBitmap reads it
+        self.bits = np.zeros(0, dtype=np.uint8) if bits is None else bits
+        self.ntotal = int(np.unpackbits(self.bits).sum())
+
+    def add(self, positions: np.ndarray) -> None:
+        """Add main-index ``positions`` to the section."""
+        positions = np.asarray(positions, dtype=np.int64)
+        if not len(positions):
+            return
+        needed = int(positions.max()) // 8 + 1
+        if needed > len(self.bits):
+            # Grow geometrically so one-resume syncs don't copy the bitmap each time
+            grown = np.zeros(max(needed, 2 * len(self.bits)), dtype=np.uint8)
+            grown[:len(self.bits)] = self.bits
+            self.bits = grown
+        touched = np.unique(positions // 8)
+        before = int(np.unpackbits(self.bits[touched]).sum())
+        np.bitwise_or.at(self.bits, positions // 8, (1 << (positions % 8)).astype(np.uint8))
+        self.ntotal += int(np.unpackbits(self.bits[touched]).sum()) - before
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        params: Optional[faiss.SearchParameters] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Search the main index for the section's nearest ``k`` positions."""
+        bits = self.bits
+        selector = faiss.IDSelectorBitmap(len(bits), faiss.swig_ptr(bits))
+        params = params or faiss.SearchParameters()
+        params.sel = selector
+        return self.main_index.search(queries, k, params=params)
+
+
+class SectionIndexes:
+    """One FAISS index per resume section, keyed by the section name."""
+
+    def __init__(self, dim: int, index_type: Optional[str] = "HNSW"):
+        self.dim = dim
+        self.index_type = index_type
+        self.indexes: Dict[str, Union[faiss.Index, SelectedSection]] = {}
+        # Number of main-index positions already distributed to sub-indexes
+        self.covered = 0
+        self._last_id: Optional[str] = None
+
+    @classmethod
+    def build(cls, db: FAISS, index_type: Optional[str] = "HNSW") -> "SectionIndexes":
+        """Build sub-indexes covering every vector already in ``db``."""
+        sections = cls(db.index.d, index_type)
+        sections.sync(db)
+        return sections
+
+    def sync(self, db: FAISS) -> int:
+        """Add main-index vectors added since the last sync to their section's sub-index.
+
+        Returns:
+            int: Number of vectors added
+        """
+        start, end = self.covered, db.index.ntotal
+        if start >= end:
+            return 0
+        by_section: Dict[str, List[int]] = {}
+        for position, _, metadata in iter_indexed_metadata(db, start, end):
+            section = metadata.get("section")
+            if section:
+                by_section.setdefault(section, []).append(position)
+        self.extend(db.index, start, by_section)
+        self.covered = end
+        self._last_id = db.index_to_docstore_id[end - 1]
+        return end - start
+
+    def extend(self, main_index, start: int, by_section: Dict[str, List[int]]) -> None:
+        """Add main-index positions to their sections' sub-indexes.
+
+        Args:
+            main_index: Index the positions belong to
+            start: Lowest position being added
+            by_section: Positions grouped by section name
+        """
+        if _is_ivf(main_index):
+            for section, positions in by_section.items():
+                selected = self.indexes.setdefault(section, SelectedSection(main_index))
+                selected.main_index = main_index
+                selected.add(positions)
+            return
+        if not by_section:
+            return
+        end = max(max(positions) for positions in by_section.values()) + 1
+        vectors = main_index.reconstruct_n(start, end - start)
+        for section, positions in by_section.items():
+            ids = np.asarray(positions, dtype=np.int64)
+            section_vectors = np.ascontiguousarray(vectors[ids - start], dtype=np.float32)
+            if section not in self.indexes:
+                self.indexes[section] = self._create_index(main_index, len(ids))
+            self.indexes[section].add_with_ids(section_vectors, ids)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the sub-indexes, in bytes."""
+        return sum(
+            index.bits.nbytes if isinstance(index, SelectedSection)
+            else len(faiss.serialize_index(index))
+            for index in self.indexes.values()
+        )
+
+    def search(
+        self,
+        section: str,
+        query_vector: np.ndarray,
+        k: int,
+        *,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Search one section.
+
+        ``ef_search`` and ``nprobe`` set the search effort of HNSW and IVF
+        sub-indexes; see `search_parameters`.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Distances and main-index positions,
+                nearest first, with -1 positions for missing results
+        """
+        distances, positions = self.search_many(
+            section, np.asarray(query_vector).reshape(1, -1), k, ef_search=ef_search, nprobe=nprobe
+        )
+        return distances[0], positions[0]
+
+    def search_many(
+        self,
+        section: str,
+        query_vectors: np.ndarray,
+        k: int,
+        *,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Search one section for a matrix of query vectors in a single call.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Distances and main-index positions,
+                one row per query, as in `search`
+        """
+        queries = np.ascontiguousarray(query_vectors, dtype=np.float32).reshape(-1, self.dim)
+        index = self.indexes.get(section)
+        if index is None or index.ntotal == 0 or k <= 0:
+            return (
+                np.empty((len(queries), 0), dtype=np.float32),
+                np.empty((len(queries), 0), dtype=np.int64),
+            )
+        searched = index
+        if isinstance(index, SelectedSection):
+            searched = index.main_index
+            # Only the section's share of each probed list is scored, so probe
+            # more lists for the same recall, within the server cap
+            nprobe = int((nprobe or DEFAULT_IVF_NPROBE) * searched.ntotal / index.ntotal)
+        return index.search(
+            queries, min(k, index.ntotal), params=search_parameters(searched, ef_search, nprobe)
+        )
+
+    def save(self, folder_path: Path | str, index_name: str) -> None:
+        """Write every sub-index and the manifest next to the main index."""
+        folder = Path(folder_path)
+        current = set()
+        for section, index in self.indexes.items():
+            path = folder / _section_file(index_name, section, index)
+            if isinstance(index, SelectedSection):
+                np.save(path, index.bits)
+            else:
+                faiss.write_index(index, str(path))
+            current.add(path.name)
+        # Drop files left by sections that no longer exist, e.g. after a rebuild
+        for pattern in (f"{index_name}.section.*.faiss", f"{index_name}.section.*.npy"):
+            for path in folder.glob(pattern):
+                if path.name not in current:
+                    path.unlink()
+        manifest = {
+            "format": _MANIFEST_FORMAT,
+            "dim": self.dim,
+            "index_type": self.index_type,
+            "covered": self.covered,
+            # Docstore id of the last covered vector, to detect a rebuilt main index
+            "last_id": self._last_id,
+            "sections": {section: index.ntotal for section, index in self.indexes.items()},
+        }
+        (folder / f"{index_name}.sections.json").write_text(json.dumps(manifest, indent=2))
+
+    @classmethod
+    def load(
+        cls,
+        folder_path: Path | str,
+        index_name: str,
+        db: FAISS,
+        index_type: Optional[str] = "HNSW"
+    ) -> "SectionIndexes":
+        """Load saved sub-indexes for ``db``, rebuilding them if missing or stale.
+
+        Sub-indexes covering fewer vectors than ``db`` are brought up to date;
+        ones that don't match ``db`` at all are rebuilt from scratch.
+        """
+        folder = Path(folder_path)
+        manifest_path = folder / f"{index_name}.sections.json"
+        try:
+            manifest = json.loads(manifest_path.read_text())
+            covered = manifest["covered"]
+            if manifest.get("format") != _MANIFEST_FORMAT:
+                raise ValueError("section indexes were saved in an older format")
+            if (
+                manifest["dim"] != db.index.d
+                or covered > db.index.ntotal
+                or (covered and db.index_to_docstore_id.get(covered - 1) != manifest["last_id"])
+            ):
+                raise ValueError("section indexes don't match the main index")
+            sections = cls(manifest["dim"], manifest.get("index_type", index_type))
+            for section, count in manifest["sections"].items():
+                if _is_ivf(db.index):
+                    bits = np.load(folder / f"{index_name}.section.{section}.npy")
+                    index = SelectedSection(db.index, bits)
+                else:
+                    index = faiss.read_index(str(folder / f"{index_name}.section.{section}.faiss"))
+                if index.ntotal != count:
+                    raise ValueError(f"section index {section} is incomplete")
+                sections.indexes[section] = index
+            sections.covered = covered
+            sections._last_id = manifest["last_id"]
+        except FileNotFoundError:
+            return cls.build(db, index_type)
+        except Exception as e:
+            print(f"Warning: Rebuilding section indexes: {e}")
+            return cls.build(db, index_type)
+        sections.sync(db)
+        return sections
+
+    def _create_index(self, main_index, size: int) -> faiss.Index:
+        """Empty sub-index storing vectors the way ``main_index`` does.
+
+        An HNSW graph is only built for sections whose first batch has at
+        least `HNSW_MIN_SECTION_SIZE` vectors.
+        """
+        main = faiss.downcast_index(main_index) if isinstance(main_index, faiss.Index) else None
+        storage = faiss.downcast_index(main.storage) if isinstance(main, faiss.IndexHNSW) else None
+        quantized = isinstance(storage, faiss.IndexScalarQuantizer)
+        if isinstance(main, faiss.IndexHNSW) and size >= HNSW_MIN_SECTION_SIZE:
+            if quantized:
+                base = faiss.IndexHNSWSQ(self.dim, storage.sq.qtype, HNSW_M)
+                _copy_scalar_quantizer(faiss.downcast_index(base.storage), storage)
+                base.is_trained = True
+            else:
+                base = faiss.IndexHNSWFlat(self.dim, HNSW_M)
+            base.hnsw.efConstruction = main.hnsw.efConstruction
+            base.hnsw.efSearch = main.hnsw.efSearch
+        elif quantized:
+            base = faiss.IndexScalarQuantizer(self.dim, storage.sq.qtype, faiss.METRIC_L2)
+            _copy_scalar_quantizer(base, storage)
+        else:
+            base = faiss.IndexFlatL2(self.dim)
+        return faiss.IndexIDMap2(base)
+
+
+def _is_ivf(index) -> bool:
+    return isinstance(index, faiss.Index) and isinstance(faiss.downcast_index(index), faiss.IndexIVF)
+
+
+def _section_file(index_name: str, section: str, index) -> str:
+    suffix = "npy" if isinstance(index, SelectedSection) else "faiss"
+    return f"{index_name}.section.{section}.{suffix}"
+
+
+def _copy_scalar_quantizer(
+    index: faiss.IndexScalarQuantizer,
+    trained: faiss.IndexScalarQuantizer
+) -> None:
+    """Give ``index`` the value ranges ``trained`` was trained on.
+
+    Re-encoding a vector decoded from ``trained`` then gives back its
+    original code, so sections hold exactly the main index's vectors.
+    """
+    index.sq = trained.sq
+    index.is_trained = True
@@ -0,0 +1,495 @@
+"""Immutable slices of the searchable resume index.
+
+`VectorDBSearcher` serves searches from a tuple of segments: the base index
+loaded from disk, followed by small delta segments holding resumes added
+while the API is running. Segments are never modified after they are built.
+New documents become a new segment and the searcher swaps in a new tuple, so
+searches in flight keep reading the tuple they started with and never wait
+for a writer, and the base index is never copied.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Collection, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from resume_wizard.vectordb.candidate_index import CandidateIndex
+from resume_wizard.vectordb.docstore import INTERNED_FIELDS, iter_indexed_metadata
+from resume_wizard.vectordb.index_types import (
+    DEFAULT_HNSW_EF_SEARCH,
+    DEFAULT_IVF_NPROBE,
+    search_parameters
+)
+from resume_wizard.vectordb.lexical_index import LexicalIndex
+from resume_wizard.vectordb.section_index import SectionIndexes
+
+# Metadata fields with an inverted index for filter-only lookups
+INDEXED_METADATA_FIELDS = INTERNED_FIELDS
+
+# Neighbours fetched before metadata filtering, as in LangChain's FAISS
+_FILTER_FETCH_K = 20
+
+# Searches restricted to at most this many positions compare the query with
+# each of them directly instead of searching the index with a selector
+EXACT_SEARCH_MAX_POSITIONS = int(os.getenv("RESUME_WIZARD_EXACT_SEARCH_MAX_POSITIONS", "20000"))
+
+
+class IndexSegment:
+    """A FAISS store with its section sub-indexes, metadata, candidate and keyword indexes."""
+
+    def __init__(
+        self,
+        db: FAISS,
+        section_indexes: SectionIndexes,
+        lexical_index: Optional[LexicalIndex] = None
+    ):
+        self.db = db
+        self.section_indexes = section_indexes
+        self.metadata_index, self._identities, self._labels = self._build_metadata_index(db)
+        self._candidate_index: Optional[CandidateIndex] = None
+        self._candidate_index_lock = threading.Lock()
+        self._lexical_index = lexical_index
+        self._lexical_index_lock = threading.Lock()
+        self._relevance_score_fn = db._select_relevance_score_fn()
+
+    @property
+    def candidate_index(self) -> CandidateIndex:
+        """Fuzzy name and email index, built on first use.
+
+        It is the largest in-memory structure of a segment, so a searcher
+        that never looks candidates up never pays for it.
+        """
+        if self._candidate_index is None:
+            with self._candidate_index_lock:
+                if self._candidate_index is None:
+                    candidate_index = CandidateIndex()
+                    for source, (name, email) in self._identities.items():
+                        candidate_index.add(source, name, email)
+                    self._candidate_index = candidate_index
+        return self._candidate_index
+
+    @property
+    def lexical_index(self) -> LexicalIndex:
+        """BM25 keyword index, built on first use unless one was passed in."""
+        if self._lexical_index is None:
+            with self._lexical_index_lock:
+                if self._lexical_index is None:
+                    self._lexical_index = LexicalIndex.build(self.db)
+        return self._lexical_index
+
+    @property
+    def ntotal(self) -> int:
+        return self.db.index.ntotal
+
+    @classmethod
+    def from_embeddings(
+        cls,
+        documents: Sequence[Document],
+        vectors: np.ndarray,
+        embeddings: Embeddings
+    ) -> "IndexSegment":
+        """Build a small exact (flat) segment from already embedded documents."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        db = FAISS(
+            embedding_function=embeddings,
+            index=faiss.IndexFlatL2(vectors.shape[1]),
+            docstore=InMemoryDocstore(),
+            index_to_docstore_id={},
+        )
+        db.add_embeddings(
+            [(doc.page_content, vector) for doc, vector in zip(documents, vectors.tolist())],
+            metadatas=[doc.metadata for doc in documents],
+            ids=[doc.id for doc in documents] if all(doc.id for doc in documents) else None,
+        )
+        return cls(db, SectionIndexes.build(db, index_type="Flat"))
+
+    @classmethod
+    def merge(cls, segments: Sequence["IndexSegment"], embeddings: Embeddings) -> "IndexSegment":
+        """Combine several segments into one flat segment, keeping document order."""
+        documents: List[Document] = []
+        vectors: List[np.ndarray] = []
+        for segment in segments:
+            segment_documents, segment_vectors = segment.documents_and_vectors()
+            documents.extend(segment_documents)
+            vectors.append(segment_vectors)
+        return cls.from_embeddings(documents, np.vstack(vectors), embeddings)
+
+    def documents_and_vectors(self) -> Tuple[List[Document], np.ndarray]:
+        """Return every document and its vector in index order."""
+        documents = [
+            self.db.docstore.search(self.db.index_to_docstore_id[position])
+            for position in range(self.ntotal)
+        ]
+        return documents, self.db.index.reconstruct_n(0, self.ntotal)
+
+    def similarity_search(
+        self,
+        query_vector: List[float],
+        k: int,
+        metadata_filter: Optional[Dict[str, str]] = None,
+        *,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None
+    ) -> List[Tuple[Document, float]]:
+        """Nearest documents to a query vector with relevance scores, best first.
+
+        ``ef_search`` and ``nprobe`` set the search effort of an HNSW or IVF
+        index for this query only; see `search_parameters`.
+        """
+        if search_parameters(self.db.index, ef_search, nprobe) is None:
+            docs_and_distances = self.db.similarity_search_with_score_by_vector(
+                query_vector, k=k, filter=metadata_filter or None
+            )
+        else:
+            return self.similarity_search_many(
+                np.asarray(query_vector), [k], [metadata_filter], ef_search=ef_search, nprobe=nprobe
+            )[0]
+        return [(doc, self._relevance_score_fn(distance)) for doc, distance in docs_and_distances]
+
+    def search_vectors(
+        self,
+        query_vectors: np.ndarray,
+        k: int,
+        *,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        allowed: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Search the main index for a batch of query vectors in one call.
+
+        ``allowed`` restricts the search to some positions before any vector
+        is compared. Up to `EXACT_SEARCH_MAX_POSITIONS` of them are compared
+        with the queries directly, which is exact and cheaper than searching
+        the whole index; larger sets are searched with a FAISS selector.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Distances and positions, one row
+                per query, nearest first, with -1 positions for missing results
+        """
+        vectors = np.array(query_vectors, dtype=np.float32).reshape(-1, self.db.index.d)
+        if self.db._normalize_L2:
+            faiss.normalize_L2(vectors)
+        candidates = np.flatnonzero(allowed) if allowed is not None else None
+        k = min(k, self.ntotal if candidates is None else len(candidates))
+        if k <= 0:
+            return (
+                np.empty((len(vectors), 0), dtype=np.float32),
+                np.empty((len(vectors), 0), dtype=np.int64),
+            )
+        if candidates is not None and (
+            len(candidates) <= EXACT_SEARCH_MAX_POSITIONS or not isinstance(self.db.index, faiss.Index)
+        ):
+            distances, rows = faiss.knn(vectors, self.db.index.reconstruct_batch(candidates), k)
+            return distances, np.where(rows >= 0, candidates[rows], -1)
+
+        if candidates is not None:
+            # A selector discards most of what the index visits, so widen the
+            # search by the fraction allowed, within the server caps
+            widen = self.ntotal / len(candidates)
+            ef_search = int((ef_search or DEFAULT_HNSW_EF_SEARCH) * widen)
+            nprobe = int((nprobe or DEFAULT_IVF_NPROBE) * widen)
+        params = search_parameters(self.db.index, ef_search, nprobe)
+        if candidates is not None:
+            bitmap = np.packbits(allowed, bitorder="little")
+            selector = faiss.IDSelectorBitmap(len(allowed), faiss.swig_ptr(bitmap))
+            params = params or faiss.SearchParameters()
+            params.sel = selector
+        if params is None:
+            return self.db.index.search(vectors, k)
+        return self.db.index.search(vectors, k, params=params)
+
+    def section_hits(
+        self,
+        query_vector: List[float],
+        k: int,
+        *,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        sources: Optional[Collection[str]] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """The ``k`` documents nearest to a query, as arrays for vectorized aggregation.
+
+        ``sources`` restricts the search to those resumes' documents.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Relevance
+                scores, positions, source files and sections of the hits,
+                best first
+        """
+        distances, positions = self.search_vectors(
+            np.asarray(query_vector), k, ef_search=ef_search, nprobe=nprobe,
+            allowed=self.source_mask(sources) if sources is not None else None
+        )
+        found = positions[0] >= 0
+        distances, positions = distances[0][found], positions[0][found]
+        source_codes, section_codes, source_names, section_names = self._labels
+        return (
+            np.asarray(self._relevance_score_fn(distances.astype(np.float64))),
+            positions,
+            source_names[source_codes[positions]],
+            section_names[section_codes[positions]],
+        )
+
+    def sources_at(self, positions: np.ndarray) -> np.ndarray:
+        """Resume source file of each position."""
+        source_codes, _, source_names, _ = self._labels
+        return source_names[source_codes[np.asarray(positions, dtype=np.int64)]]
+
+    def source_vectors(self, sources: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Every document vector of some resumes, for scoring them outside the index.
+
+        Vectors of quantized indexes are their reconstructions.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Positions, the index
+                in ``sources`` of each position's resume, and the vectors
+        """
+        source_codes, _, source_names, _ = self._labels
+        wanted = np.isin(source_names, np.asarray(sources, dtype=object))
+        positions = np.flatnonzero(wanted[source_codes])
+        if not len(positions):
+            return positions, positions, np.empty((0, self.db.index.d), dtype=np.float32)
+        lookup = {source: i for i, source in enumerate(sources)}
+        owners = np.array([lookup[name] for name in source_names[source_codes[positions]]], dtype=np.int64)
+        return positions, owners, self.db.index.reconstruct_batch(positions)
+
+    def lexical_search(
+        self,
+        terms: List[str],
+        idf: np.ndarray,
+        avg_length: float,
+        k: int,
+        metadata_filter: Optional[Dict[str, str]] = None,
+        sources: Optional[Collection[str]] = None
+    ) -> List[Tuple[Document, float]]:
+        """Best keyword matches with their BM25 scores, best first.
+
+        Filters, and ``sources`` if given, are applied to every matching
+        document before the top ``k`` are taken, so filtered searches are
+        complete.
+        """
+        allowed = (
+            self._position_mask(metadata_filter or {}, sources)
+            if metadata_filter or sources is not None else None
+        )
+        scores, positions = self.lexical_index.search(terms, idf, avg_length, k, allowed)
+        return [
+            (self.document_at(position), float(score))
+            for score, position in zip(scores, positions)
+        ]
+
+    def document_at(self, position: int) -> Document:
+        return self.db.docstore.search(self.db.index_to_docstore_id[int(position)])
+
+    def similarity_search_many(
+        self,
+        query_vectors: np.ndarray,
+        ks: Sequence[int],
+        metadata_filters: Sequence[Optional[Dict[str, str]]],
+        *,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        sources: Optional[Collection[str]] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """`similarity_search` for a matrix of query vectors, with one index search.
+
+        Filtered queries fetch ``max(k, 20)`` neighbours before filtering,
+        like LangChain's ``similarity_search_with_score_by_vector``.
+
+        Args:
+            query_vectors: One query vector per row
+            ks: Number of documents to return for each query
+            metadata_filters: Filter for each query, or None
+            sources: Resumes to restrict every query to, or None. Their
+                documents matching each query's filter are selected before
+                the search, with one search per distinct filter.
+        """
+        if sources is not None:
+            return self._search_within(
+                query_vectors, ks, metadata_filters, sources, ef_search=ef_search, nprobe=nprobe
+            )
+        fetch_ks = [
+            k if not metadata_filter else max(k, _FILTER_FETCH_K)
+            for k, metadata_filter in zip(ks, metadata_filters)
+        ]
+        distances, positions = self.search_vectors(
+            query_vectors, max(fetch_ks, default=0), ef_search=ef_search, nprobe=nprobe
+        )
+        results = []
+        for row, (k, fetch_k, metadata_filter) in enumerate(zip(ks, fetch_ks, metadata_filters)):
+            matches = self.db._create_filter_func(metadata_filter) if metadata_filter else None
+            docs_and_scores = []
+            for distance, position in zip(distances[row, :fetch_k], positions[row, :fetch_k]):
+                if position < 0:
+                    continue
+                doc = self.document_at(position)
+                if matches is None or matches(doc.metadata):
+                    docs_and_scores.append((doc, self._relevance_score_fn(float(distance))))
+            results.append(docs_and_scores[:k])
+        return results
+
+    def _search_within(
+        self,
+        query_vectors: np.ndarray,
+        ks: Sequence[int],
+        metadata_filters: Sequence[Optional[Dict[str, str]]],
+        sources: Collection[str],
+        *,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """`similarity_search_many` restricted to some resumes, filtered before searching."""
+        query_vectors = np.asarray(query_vectors).reshape(len(ks), -1)
+        rows_by_filter: Dict[Tuple[Tuple[str, str], ...], List[int]] = {}
+        for row, metadata_filter in enumerate(metadata_filters):
+            rows_by_filter.setdefault(tuple(sorted((metadata_filter or {}).items())), []).append(row)
+
+        results: List[List[Tuple[Document, float]]] = [[] for _ in ks]
+        for metadata_filter, rows in rows_by_filter.items():
+            distances, positions = self.search_vectors(
+                query_vectors[rows], max(ks[row] for row in rows), ef_search=ef_search, nprobe=nprobe,
+                allowed=self._position_mask(dict(metadata_filter), sources)
+            )
+            for i, row in enumerate(rows):
+                results[row] = [
+                    (self.document_at(position), self._relevance_score_fn(float(distance)))
+                    for distance, position in zip(distances[i, :ks[row]], positions[i, :ks[row]])
+                    if position >= 0
+                ]
+        return results
+
+    def search_section(
+        self,
+        query_vector: List[float],
+        section: str,
+        k: int,
+        *,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None
+    ) -> List[Tuple[Document, float]]:
+        """Nearest documents within one section's sub-index, best first."""
+        return self.search_section_many(
+            np.asarray(query_vector), section, [k], ef_search=ef_search, nprobe=nprobe
+        )[0]
+
+    def search_section_many(
+        self,
+        query_vectors: np.ndarray,
+        section: str,
+        ks: Sequence[int],
+        *,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """`search_section` for a matrix of query vectors, with one sub-index search."""
+        distances, positions = self.section_indexes.search_many(
+            section, query_vectors, max(ks, default=0), ef_search=ef_search, nprobe=nprobe
+        )
+        return [
+            [
+                (self.document_at(position), self._relevance_score_fn(float(distance)))
+                for distance, position in zip(distances[row, :k], positions[row, :k])
+                if position >= 0
+            ]
+            for row, k in enumerate(ks)
+        ]
+
+    def filter_documents(self, filters: Dict[str, str], limit: Optional[int] = None) -> List[Document]:
+        """Documents whose metadata matches every filter, in index order."""
+        postings = [self.metadata_index[field].get(value, []) for field, value in filters.items()]
+        if not postings:
+            return []
+
+        # Walk the shortest posting list and check membership in the others
+        postings.sort(key=len)
+        others: List[Set[str]] = [set(ids) for ids in postings[1:]]
+        documents = []
+        for doc_id in postings[0]:
+            if all(doc_id in ids for ids in others):
+                documents.append(self.db.docstore.search(doc_id))
+                if limit is not None and len(documents) >= limit:
+                    break
+        return documents
+
+    def metadata_values(self, field: str) -> Iterable[str]:
+        return self.metadata_index[field].keys()
+
+    def _position_mask(
+        self,
+        metadata_filter: Dict[str, str],
+        sources: Optional[Collection[str]] = None
+    ) -> np.ndarray:
+        """Boolean mask of the positions whose metadata matches every filter.
+
+        If ``sources`` is given, positions must also belong to one of them.
+        """
+        source_codes, section_codes, source_names, section_names = self._labels
+        mask = np.ones(self.ntotal, dtype=bool)
+        if sources is not None:
+            sources = sources if isinstance(sources, (set, frozenset)) else set(sources)
+            wanted = np.fromiter((name in sources for name in source_names), dtype=bool, count=len(source_names))
+            mask &= wanted[source_codes]
+        for field, value in metadata_filter.items():
+            if field == "section":
+                mask &= np.isin(section_codes, np.flatnonzero(section_names == value))
+                continue
+            if field == "source":
+                sources = [value]
+            elif field in ("name", "email"):
+                # Name and email are the candidate's on every document of a
+                # resume; project titles are kept under project_name
+                slot = 0 if field == "name" else 1
+                sources = [source for source, identity in self._identities.items() if identity[slot] == value]
+            else:
+                raise ValueError(f"Unsupported keyword search filter: {field}")
+            mask &= np.isin(source_codes, np.flatnonzero(np.isin(source_names, sources)))
+        return mask
+
+    def source_mask(self, sources: Collection[str]) -> np.ndarray:
+        """Boolean mask of the positions belonging to some resumes."""
+        return self._position_mask({}, sources)
+
+    def identity(self, source: str) -> Tuple[Optional[str], Optional[str]]:
+        """Candidate name and email of a resume in this segment."""
+        return self._identities.get(source, (None, None))
+
+    @staticmethod
+    def _build_metadata_index(db: FAISS) -> Tuple[
+        Dict[str, Dict[str, List[str]]],
+        Dict[str, Tuple[Optional[str], Optional[str]]],
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    ]:
+        """Map each indexed metadata field and value to docstore ids, in index order.
+
+        Also returns each resume's candidate name and email, taken from its
+        first document, for the candidate index, and the source and section
+        of every position as codes into arrays of names, for `section_hits`.
+        """
+        index: Dict[str, Dict[str, List[str]]] = {field: {} for field in INDEXED_METADATA_FIELDS}
+        identities: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        codes: Dict[str, Dict[str, int]] = {"source": {"": 0}, "section": {"": 0}}
+        source_codes = np.zeros(db.index.ntotal, dtype=np.int32)
+        section_codes = np.zeros(db.index.ntotal, dtype=np.int32)
+        for position, doc_id, metadata in iter_indexed_metadata(db):
+            source = metadata.get("source")
+            if source and source not in identities:
+                identities[source] = (metadata.get("name"), metadata.get("email"))
+            for field, value in metadata.items():
+                index[field].setdefault(value, []).append(doc_id)
+            source_codes[position] = codes["source"].setdefault(source or "", len(codes["source"]))
+            section = metadata.get("section") or ""
+            section_codes[position] = codes["section"].setdefault(section, len(codes["section"]))
+        labels = (
+            source_codes,
+            section_codes,
+            np.array(list(codes["source"]), dtype=object),
+            np.array(list(codes["section"]), dtype=object),
+        )
+        return index, identities, labels
@@ -0,0 +1,503 @@
+"""Crash-safe persistence for the FAISS resume index.
+
+The saved index is a snapshot: ``<name>.faiss``, the ``<name>.docs.sqlite``
+document store (see `resume_wizard.vectordb.docstore`), the section sub-index
+files, the memory-mappable flat layout (see `resume_wizard.vectordb.flat_layout`),
+the BM25 keyword index (see `resume_wizard.vectordb.lexical_index`) and a
+``<name>.snapshot.json`` manifest. Snapshots saved before the
+document store existed have a pickled ``<name>.pkl`` instead and still load.
+
+Rewriting a snapshot costs as much as the whole corpus, so new resumes are
+not written into it. They are appended to ``<name>.wal``, a write-ahead log
+of embedded documents, and loading a database replays the log on top of the
+snapshot.
+
+- Appends are serialized by a writer lock (a thread lock plus ``flock`` on
+  ``<name>.lock``, so separate processes take turns too) and only hold it for
+  one fsynced write. Extraction and embedding run outside the lock.
+- Every record carries a sequence number and a CRC. A record cut short by a
+  crash is ignored by readers and truncated by the next writer.
+- `save_snapshot` writes the new snapshot into a staging directory, fsyncs it,
+  marks it complete and then moves each file into place with ``os.replace``.
+  The manifest is moved last and records the last log sequence the snapshot
+  contains. A crash before the staging directory is complete leaves the old
+  snapshot in use; a crash while moving files is finished by
+  `recover_snapshot` the next time the database is opened.
+- Saving, and finishing an interrupted save, hold the writer lock. Moving
+  files into place also holds ``<name>.snapshot.lock`` exclusively, while
+  readers share it for as long as they read snapshot files (see
+  `read_snapshot`), so a reader never pairs files from two snapshots.
+"""
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import shutil
+import struct
+import threading
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import faiss
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from resume_wizard.vectordb.docstore import open_docstore, write_docstore
+from resume_wizard.vectordb.flat_layout import (
+    FlatLayout,
+    MmapFlatIndex,
+    layout_exists,
+    write_flat_layout
+)
+from resume_wizard.vectordb.lexical_index import LexicalIndex
+
+# magic, payload length, sequence number, CRC32 of the payload
+_HEADER = struct.Struct("<4sIQI")
+_MAGIC = b"RWAL"
+# Length of the JSON part at the start of a payload; float32 vectors follow it
+_JSON_LENGTH = struct.Struct("<I")
+
+# Marks a staging directory whose files are complete and fsynced
+_READY_MARKER = "READY"
+
+
+class _WriterLock:
+    """Re-entrant writer lock for one log file, shared within the process.
+
+    Threads queue on an `RLock`; the outermost holder also takes ``flock`` on
+    the lock file so other processes wait as well.
+    """
+
+    def __init__(self, lock_path: Path):
+        self.lock_path = lock_path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        with self._lock:
+            if self._depth == 0:
+                self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.lock_path, "a+b")
+                fcntl.flock(self._file, fcntl.LOCK_EX)
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    fcntl.flock(self._file, fcntl.LOCK_UN)
+                    self._file.close()
+                    self._file = None
+
+
+_writer_locks: Dict[str, _WriterLock] = {}
+_writer_locks_guard = threading.Lock()
+
+
+class _SnapshotLock:
+    """Readers/installer lock on one snapshot, shared within the process.
+
+    Readers share ``flock`` on the lock file, re-entrantly within a thread;
+    installing a snapshot takes it exclusively, waiting for every reader.
+    """
+
+    def __init__(self, lock_path: Path):
+        self.lock_path = lock_path
+        self._local = threading.local()
+
+    @property
+    def reading(self) -> bool:
+        """Whether the calling thread holds the shared lock."""
+        return getattr(self._local, "depth", 0) > 0
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        if not self.reading:
+            self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+            self._local.file = open(self.lock_path, "a+b")
+            fcntl.flock(self._local.file, fcntl.LOCK_SH)
+            self._local.depth = 0
+        self._local.depth += 1
+        try:
+            yield
+        finally:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                fcntl.flock(self._local.file, fcntl.LOCK_UN)
+                self._local.file.close()
+                self._local.file = None
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        if self.reading:
+            raise RuntimeError("Can't replace a snapshot while reading it on the same thread")
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+_snapshot_locks: Dict[str, _SnapshotLock] = {}
+
+
+def _snapshot_lock(folder: Path, index_name: str) -> _SnapshotLock:
+    lock_path = folder / f"{index_name}.snapshot.lock"
+    with _writer_locks_guard:
+        key = str(lock_path.resolve())
+        if key not in _snapshot_locks:
+            _snapshot_locks[key] = _SnapshotLock(lock_path)
+        return _snapshot_locks[key]
+
+
+@dataclass
+class LogRecord:
+    """One append to the write-ahead log: documents and their embeddings."""
+    seq: int
+    documents: List[Document]
+    vectors: np.ndarray
+
+
+class WriteAheadLog:
+    """Append-only log of embedded documents not yet in the saved snapshot."""
+
+    def __init__(self, folder_path: Path | str, index_name: str):
+        self.folder = Path(folder_path)
+        self.path = self.folder / f"{index_name}.wal"
+        self.lock_path = self.folder / f"{index_name}.lock"
+        self.snapshot_path = self.folder / f"{index_name}.snapshot.json"
+        with _writer_locks_guard:
+            key = str(self.lock_path.resolve())
+            if key not in _writer_locks:
+                _writer_locks[key] = _WriterLock(self.lock_path)
+            self._writer_lock = _writer_locks[key]
+        # Size and last sequence of the log as this object last wrote or read it
+        self._known_size = -1
+        self._last_seq = 0
+
+    def writer_lock(self):
+        """Hold the single-writer lock. Re-entrant within a thread."""
+        return self._writer_lock.hold()
+
+    def append(self, documents: Sequence[Document], vectors: np.ndarray) -> int:
+        """Durably append documents and their vectors, returning the record's sequence number.
+
+        Every document must have an id, so replaying the record always
+        recreates the same docstore entries.
+        """
+        if any(not doc.id for doc in documents):
+            raise ValueError("Documents must have ids before they are logged")
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(documents):
+            raise ValueError("Expected one vector per document")
+
+        header = json.dumps({
+            "dim": int(vectors.shape[1]),
+            "documents": [
+                {"id": doc.id, "page_content": doc.page_content, "metadata": doc.metadata}
+                for doc in documents
+            ],
+        }).encode()
+        payload = _JSON_LENGTH.pack(len(header)) + header + vectors.tobytes()
+
+        with self.writer_lock():
+            end = self._valid_end()
+            seq = max(self._last_seq, self.snapshot_seq()) + 1
+            with open(self.path, "r+b" if self.path.exists() else "wb") as f:
+                f.truncate(end)  # drop a record torn by an earlier crash
+                f.seek(end)
+                f.write(_HEADER.pack(_MAGIC, len(payload), seq, zlib.crc32(payload)))
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+                self._known_size = f.tell()
+            self._last_seq = seq
+        return seq
+
+    def records(self, after_seq: int = 0) -> Iterator[LogRecord]:
+        """Yield complete records with a sequence number above ``after_seq``, oldest first."""
+        for seq, payload, _ in self._scan():
+            if seq <= after_seq:
+                continue
+            (json_length,) = _JSON_LENGTH.unpack_from(payload)
+            header = json.loads(payload[_JSON_LENGTH.size:_JSON_LENGTH.size + json_length])
+            documents = [Document(**doc) for doc in header["documents"]]
+            vectors = np.frombuffer(
+                payload, dtype=np.float32, offset=_JSON_LENGTH.size + json_length
+            ).reshape(len(documents), header["dim"])
+            yield LogRecord(seq, documents, vectors)
+
+    def last_seq(self) -> int:
+        """Sequence number of the newest record logged or snapshotted."""
+        last = self.snapshot_seq()
+        for seq, _, _ in self._scan():
+            last = max(last, seq)
+        return last
+
+    def snapshot_seq(self) -> int:
+        """Sequence number of the newest record contained in the saved snapshot."""
+        try:
+            return json.loads(self.snapshot_path.read_text()).get("wal_seq", 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def size(self) -> int:
+        """Size of the log file in bytes."""
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def truncate_through(self, seq: int) -> None:
+        """Drop records up to and including ``seq`` once a snapshot contains them."""
+        with self.writer_lock():
+            kept = [record for record in self._scan() if record[0] > seq]
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                for record_seq, payload, _ in kept:
+                    f.write(_HEADER.pack(_MAGIC, len(payload), record_seq, zlib.crc32(payload)))
+                    f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+                self._known_size = f.tell()
+            os.replace(tmp_path, self.path)
+            _fsync_dir(self.folder)
+
+    def _scan(self) -> Iterator[Tuple[int, bytes, int]]:
+        """Yield ``(seq, payload, end_offset)`` for each intact record, stopping at a torn one."""
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            while True:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return
+                magic, length, seq, crc = _HEADER.unpack(header)
+                if magic != _MAGIC:
+                    return
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    return
+                yield seq, payload, f.tell()
+
+    def _valid_end(self) -> int:
+        """Offset just past the last intact record. Call with the writer lock held."""
+        size = self.size()
+        if size == self._known_size:
+            return size
+        # Another process appended, or this is the first append: rescan
+        end, last = 0, 0
+        for seq, _, offset in self._scan():
+            end, last = offset, seq
+        self._last_seq = max(self._last_seq, last)
+        return end
+
+
+def recover_snapshot(folder_path: Path | str, index_name: str) -> None:
+    """Finish a snapshot save that was interrupted while moving files into place.
+
+    A staging directory without the ``READY`` marker is left alone: a save
+    may still be writing it, and the next save clears it if it was abandoned.
+    """
+    folder = Path(folder_path)
+    staging = _staging_dir(folder, index_name)
+    if not (staging / _READY_MARKER).exists():
+        return
+    with WriteAheadLog(folder, index_name).writer_lock():
+        # Another process may have finished it while this one waited
+        if (staging / _READY_MARKER).exists():
+            _install_staged(staging, folder, index_name)
+
+
+@contextmanager
+def read_snapshot(folder_path: Path | str, index_name: str) -> Iterator[None]:
+    """Keep the saved snapshot from being replaced while its files are read.
+
+    Finishes an interrupted save first. Hold it across every file a reader
+    opens (index, documents, sub-indexes), so they all come from one
+    snapshot. Re-entrant within a thread.
+    """
+    folder = Path(folder_path)
+    lock = _snapshot_lock(folder, index_name)
+    if not lock.reading:
+        recover_snapshot(folder, index_name)
+    with lock.shared():
+        yield
+
+
+def save_snapshot(
+    db: FAISS,
+    section_indexes,
+    folder_path: Path | str,
+    index_name: str,
+    wal_seq: int,
+    lexical_index: Optional[LexicalIndex] = None
+) -> None:
+    """Atomically replace the saved snapshot with ``db`` and its section sub-indexes.
+
+    Args:
+        db: Database to save
+        section_indexes: `SectionIndexes` covering ``db``
+        folder_path: Directory the snapshot lives in
+        index_name: Index name of the snapshot files
+        wal_seq: Last write-ahead log sequence number contained in ``db``
+        lexical_index: `LexicalIndex` covering ``db``, or None to build one
+
+    Raises:
+        TypeError: If ``db`` was loaded memory-mapped; those stores are read-only
+    """
+    if isinstance(db.index, MmapFlatIndex):
+        raise TypeError("Memory-mapped databases are read-only; save from a VectorDBManager")
+    folder = Path(folder_path)
+    with WriteAheadLog(folder, index_name).writer_lock():
+        recover_snapshot(folder, index_name)
+        # Holding the writer lock, any staging directory left is abandoned
+        staging = _staging_dir(folder, index_name)
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+
+        faiss.write_index(db.index, str(staging / f"{index_name}.faiss"))
+        write_docstore(db, staging / f"{index_name}.docs.sqlite")
+        write_flat_layout(db, staging, index_name)
+        section_indexes.save(staging, index_name)
+        (lexical_index or LexicalIndex.build(db)).save(staging, index_name)
+        (staging / f"{index_name}.snapshot.json").write_text(json.dumps({
+            "wal_seq": wal_seq,
+            "ntotal": db.index.ntotal,
+        }, indent=2))
+        for path in staging.iterdir():
+            _fsync_file(path)
+        (staging / _READY_MARKER).touch()
+        _fsync_dir(staging)
+
+        _install_staged(staging, folder, index_name)
+
+
+def load_snapshot(
+    folder_path: Path | str,
+    index_name: str,
+    embeddings: Embeddings,
+    *,
+    mmap: bool = False
+) -> Tuple[FAISS, int]:
+    """Load the saved snapshot and replay the write-ahead log on top of it.
+
+    Args:
+        folder_path: Directory the snapshot lives in
+        index_name: Index name of the snapshot files
+        embeddings: Embeddings attached to the loaded store
+        mmap: Serve the vectors read-only from the memory-mapped flat layout
+            (`MmapFlatIndex`) instead of reading the FAISS index into memory.
+            Falls back to a normal load for snapshots saved without one.
+
+    Returns:
+        Tuple[FAISS, int]: The database and the last log sequence number it contains
+    """
+    folder = Path(folder_path)
+    with read_snapshot(folder, index_name):
+        return _load_snapshot(folder, index_name, embeddings, mmap)
+
+
+def _load_snapshot(
+    folder: Path,
+    index_name: str,
+    embeddings: Embeddings,
+    mmap: bool
+) -> Tuple[FAISS, int]:
+    docs_path = folder / f"{index_name}.docs.sqlite"
+    if docs_path.exists():
+        docstore, index_to_docstore_id = open_docstore(docs_path)
+        if mmap and layout_exists(folder, index_name):
+            index = MmapFlatIndex(FlatLayout(folder, index_name))
+        else:
+            if mmap:
+                print("Warning: Snapshot has no flat layout to memory-map; loading it into memory")
+            index = faiss.read_index(str(folder / f"{index_name}.faiss"))
+        db = FAISS(
+            embedding_function=embeddings,
+            index=index,
+            docstore=docstore,
+            index_to_docstore_id=index_to_docstore_id,
+        )
+    else:
+        if mmap:
+            print("Warning: Snapshot has no flat layout to memory-map; loading it into memory")
+        db = FAISS.load_local(
+            folder_path=str(folder),
+            index_name=index_name,
+            embeddings=embeddings,
+            allow_dangerous_deserialization=True  # Safe because we're loading our own files
+        )
+    log = WriteAheadLog(folder, index_name)
+    applied = log.snapshot_seq()
+    for record in log.records(after_seq=applied):
+        apply_record(db, record)
+        applied = record.seq
+    return db, applied
+
+
+def apply_record(db: FAISS, record: LogRecord) -> None:
+    """Add a log record's documents to ``db`` under their logged ids."""
+    db.add_embeddings(
+        [(doc.page_content, vector.tolist()) for doc, vector in zip(record.documents, record.vectors)],
+        metadatas=[doc.metadata for doc in record.documents],
+        ids=[doc.id for doc in record.documents],
+    )
+
+
+def _staging_dir(folder: Path, index_name: str) -> Path:
+    return folder / f".{index_name}.staging"
+
+
+def _install_staged(staging: Path, folder: Path, index_name: str) -> None:
+    """Move a complete staging directory's files into place, manifest last.
+
+    Call with the writer lock held. Waits for readers of the current
+    snapshot to finish.
+    """
+    manifest = f"{index_name}.snapshot.json"
+    staged = {path.name for path in staging.iterdir()} - {_READY_MARKER}
+    with _snapshot_lock(folder, index_name).exclusive():
+        for name in sorted(staged - {manifest}):
+            os.replace(staging / name, folder / name)
+        if manifest in staged:
+            os.replace(staging / manifest, folder / manifest)
+        _fsync_dir(folder)
+    shutil.rmtree(staging, ignore_errors=True)
+
+    # The document store replaces the pickled docstore of older snapshots
+    if (folder / f"{index_name}.docs.sqlite").exists():
+        (folder / f"{index_name}.pkl").unlink(missing_ok=True)
+
+    # Drop sub-index files the new snapshot doesn't have, such as removed
+    # sections or files of another sub-index kind after a rebuild
+    if f"{index_name}.sections.json" not in staged:
+        return
+    for path in folder.glob(f"{index_name}.section.*"):
+        if path.name not in staged:
+            path.unlink()
+
+
+def _fsync_file(path: Path) -> None:
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+
+
+def _fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
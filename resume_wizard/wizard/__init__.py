@@ -1,3 +1,15 @@
-from .rezwiz import run_resume_wizard
+"""
+Resume wizard: extracts structured resume data from PDFs, section by section,
+with a persistent cache of finished extractions.
+"""
+from .rezwiz import run_resume_wizard, astream_resume_wizard, arun_resume_wizard
+from .cache import ExtractionCache, get_extraction_cache
+
+__all__ = [
+    "run_resume_wizard",
+    "astream_resume_wizard",
+    "arun_resume_wizard",
+    "ExtractionCache",
+    "get_extraction_cache"
+]
 
-__all__ = ["run_resume_wizard"]
\ No newline at end of file
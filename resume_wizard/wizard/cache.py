@@ -0,0 +1,295 @@
+"""Persistent, content-addressed cache of resume wizard extractions.
+
+Extractions are keyed by the SHA-256 of the PDF bytes together with a version
+stamp derived from the extraction engine, the model and every prompt and tool
+schema that engine uses. Editing a chain therefore changes the stamp, and
+entries written under an old stamp are purged the next time the cache is opened.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import zstandard
+from sqlalchemy import (
+    Column,
+    Float,
+    Integer,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    delete,
+    func,
+    select,
+    update,
+)
+
+from resume_wizard.ai.chains._settings import CLAUDE_MODEL, CLAUDE_MAX_TOKENS
+from resume_wizard.ai.chains.contact_info.chain import CONTACT_INFO_PROMPT
+from resume_wizard.ai.chains.contact_info.tools import create_contact_info_tools
+from resume_wizard.ai.chains.objective.chain import OBJECTIVE_PROMPT
+from resume_wizard.ai.chains.objective.tools import create_objective_tools
+from resume_wizard.ai.chains.skills.chain import SKILLS_PROMPT
+from resume_wizard.ai.chains.skills.tools import create_skills_tools
+from resume_wizard.ai.chains.education.chain import EDUCATION_PROMPT
+from resume_wizard.ai.chains.education.tools import create_education_tools
+from resume_wizard.ai.chains.experience.chain import EXPERIENCE_PROMPT
+from resume_wizard.ai.chains.experience.tools import create_experience_tools
+from resume_wizard.ai.chains.projects.chain import PROJECTS_PROMPT
+from resume_wizard.ai.chains.projects.tools import create_project_tools
+from resume_wizard.ai.chains.consolidated.chain import CONSOLIDATED_PROMPT
+from resume_wizard.ai.chains.consolidated.tools import create_consolidated_tools
+
+EXTRACTION_CACHE_DIR = Path(__file__).parent / "extraction_cache"
+EXTRACTION_CACHE_NAME = "extractions.sqlite"
+
+# Bump when the way tool calls are turned into `ResumeAnalysisSchema` changes.
+EXTRACTION_SCHEMA_VERSION = 1
+
+DEFAULT_MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+# "sections" runs one chain per resume section, "single_pass" extracts every
+# section from one conversation.
+EXTRACTION_ENGINES = ("sections", "single_pass")
+
+_metadata = MetaData()
+
+_extractions = Table(
+    "extractions",
+    _metadata,
+    Column("pdf_sha256", String(64), primary_key=True),
+    Column("version", String(64), primary_key=True),
+    Column("payload", LargeBinary, nullable=False),
+    Column("size", Integer, nullable=False),
+    Column("created_at", Float, nullable=False),
+    Column("last_accessed", Float, nullable=False, index=True),
+    Column("hits", Integer, nullable=False, default=0),
+)
+
+
+def extraction_version(engine: str = "sections") -> str:
+    """Return the version stamp for an engine's current prompts and model.
+
+    Args:
+        engine: One of ``EXTRACTION_ENGINES``
+
+    Returns:
+        str: Hex digest covering the model and every prompt and tool schema the engine uses
+    """
+    if engine == "sections":
+        stamp = {
+            "schema_version": EXTRACTION_SCHEMA_VERSION,
+            "model": CLAUDE_MODEL,
+            "max_tokens": CLAUDE_MAX_TOKENS,
+            "prompts": [
+                CONTACT_INFO_PROMPT,
+                OBJECTIVE_PROMPT,
+                SKILLS_PROMPT,
+                EDUCATION_PROMPT,
+                EXPERIENCE_PROMPT,
+                PROJECTS_PROMPT,
+            ],
+            "tools": [
+                create_contact_info_tools(None),
+                create_objective_tools(None),
+                create_skills_tools(None),
+                create_education_tools(None),
+                create_experience_tools(None),
+                create_project_tools(None),
+            ],
+        }
+    elif engine == "single_pass":
+        stamp = {
+            "engine": engine,
+            "schema_version": EXTRACTION_SCHEMA_VERSION,
+            "model": CLAUDE_MODEL,
+            "max_tokens": CLAUDE_MAX_TOKENS,
+            "prompts": [CONSOLIDATED_PROMPT],
+            "tools": create_consolidated_tools(None),
+        }
+    else:
+        raise ValueError(f"Unknown extraction engine: {engine}")
+    encoded = json.dumps(stamp, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def hash_pdf(pdf_path: Path | str) -> str:
+    """Return the SHA-256 hex digest of a PDF file's bytes."""
+    digest = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """SQLite-backed cache of `ResumeAnalysisSchema.model_dump()` dicts.
+
+    Payloads are stored as zstd-compressed JSON. The total compressed size is
+    bounded by ``max_bytes``; when a write pushes the cache over the bound the
+    least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        cache_path: Path | str = EXTRACTION_CACHE_DIR / EXTRACTION_CACHE_NAME,
+        *,
+        max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+        versions: Optional[Dict[str, str]] = None,
+    ):
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.versions = versions or {
+            engine: extraction_version(engine) for engine in EXTRACTION_ENGINES
+        }
+
+        self._engine = create_engine(f"sqlite:///{self.cache_path}")
+        _metadata.create_all(self._engine)
+        self._compressor = zstandard.ZstdCompressor(level=10)
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidated = self.invalidate_stale()
+
+    def get(
+        self,
+        pdf_sha256: str,
+        engine: str = "sections"
+    ) -> Optional[Dict[str, Any]]:
+        """Return the cached extraction for a PDF digest, or None on a miss."""
+        key = (
+            (_extractions.c.pdf_sha256 == pdf_sha256)
+            & (_extractions.c.version == self.versions[engine])
+        )
+        with self._lock, self._engine.begin() as conn:
+            payload = conn.execute(select(_extractions.c.payload).where(key)).scalar()
+            if payload is None:
+                self.misses += 1
+                return None
+            conn.execute(
+                update(_extractions)
+                .where(key)
+                .values(last_accessed=time.time(), hits=_extractions.c.hits + 1)
+            )
+            self.hits += 1
+        return json.loads(self._decompressor.decompress(payload))
+
+    def put(
+        self,
+        pdf_sha256: str,
+        resume_data: Dict[str, Any],
+        engine: str = "sections"
+    ) -> None:
+        """Store an extraction, evicting least recently used entries if needed."""
+        version = self.versions[engine]
+        payload = self._compressor.compress(json.dumps(resume_data).encode("utf-8"))
+        now = time.time()
+        with self._lock, self._engine.begin() as conn:
+            conn.execute(
+                delete(_extractions).where(
+                    (_extractions.c.pdf_sha256 == pdf_sha256)
+                    & (_extractions.c.version == version)
+                )
+            )
+            conn.execute(
+                _extractions.insert().values(
+                    pdf_sha256=pdf_sha256,
+                    version=version,
+                    payload=payload,
+                    size=len(payload),
+                    created_at=now,
+                    last_accessed=now,
+                    hits=0,
+                )
+            )
+            self._evict(conn)
+
+    def invalidate_stale(self) -> int:
+        """Delete entries not written under any engine's current version.
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self._lock, self._engine.begin() as conn:
+            result = conn.execute(
+                delete(_extractions).where(
+                    _extractions.c.version.not_in(list(self.versions.values()))
+                )
+            )
+        return result.rowcount
+
+    def clear(self) -> None:
+        """Remove every cached extraction."""
+        with self._lock, self._engine.begin() as conn:
+            conn.execute(delete(_extractions))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry counts, storage use and hit/miss counters."""
+        with self._engine.connect() as conn:
+            entries, total_bytes = conn.execute(
+                select(func.count(), func.coalesce(func.sum(_extractions.c.size), 0))
+            ).one()
+        lookups = self.hits + self.misses
+        return {
+            "versions": self.versions,
+            "entries": entries,
+            "total_bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidated": self.invalidated,
+        }
+
+    def _evict(self, conn) -> None:
+        total = conn.execute(
+            select(func.coalesce(func.sum(_extractions.c.size), 0))
+        ).scalar()
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute(
+            select(
+                _extractions.c.pdf_sha256,
+                _extractions.c.version,
+                _extractions.c.size,
+            ).order_by(_extractions.c.last_accessed)
+        )
+        for pdf_sha256, version, size in rows.all():
+            if total <= self.max_bytes:
+                break
+            conn.execute(
+                delete(_extractions).where(
+                    (_extractions.c.pdf_sha256 == pdf_sha256)
+                    & (_extractions.c.version == version)
+                )
+            )
+            total -= size
+            self.evictions += 1
+
+
+_default_cache: Optional[ExtractionCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """Return the process-wide extraction cache, opening it on first use."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ExtractionCache()
+        return _default_cache
+
+
+if __name__ == "__main__":
+    print(json.dumps(get_extraction_cache().stats(), indent=2))
@@ -2,17 +2,26 @@ from __future__ import annotations
 
 import os
 import json
-from typing import TYPE_CHECKING, Generator, Dict, Any
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, AsyncGenerator, Generator, Dict, Any, List, Optional, TextIO
 from dotenv import load_dotenv
 from langchain_anthropic.chat_models import ChatAnthropic
-from resume_wizard.ai.chains.contact_info.chain import extract_contact_info, create_contact_info_chain
-from resume_wizard.ai.chains.objective.chain import extract_objective, create_objective_chain
-from resume_wizard.ai.chains.skills.chain import extract_skills, create_skills_chain
-from resume_wizard.ai.chains.education.chain import extract_education, create_education_chain
-from resume_wizard.ai.chains.experience.chain import extract_experience, create_experience_chain
-from resume_wizard.ai.chains.projects.chain import extract_projects, create_projects_chain
+from resume_wizard.ai.chains.contact_info.chain import extract_contact_info, aextract_contact_info, create_contact_info_chain
+from resume_wizard.ai.chains.objective.chain import extract_objective, aextract_objective, create_objective_chain
+from resume_wizard.ai.chains.skills.chain import extract_skills, aextract_skills, create_skills_chain
+from resume_wizard.ai.chains.education.chain import extract_education, aextract_education, create_education_chain
+from resume_wizard.ai.chains.experience.chain import extract_experience, aextract_experience, create_experience_chain
+from resume_wizard.ai.chains.projects.chain import extract_projects, aextract_projects, create_projects_chain
+from resume_wizard.ai.chains.consolidated.chain import extract_all_sections, aextract_all_sections, create_consolidated_chain
 from resume_wizard.pdf_parsers import parse_single_pdf
 from resume_wizard.ai.tools import _ResumeParsingTools, _ResumeParserHelper
+from resume_wizard.ai.tool_loop import format_tool_event, print_tool_event
+from resume_wizard.globals import get_absolute_path_to_resume
+from .cache import EXTRACTION_ENGINES, get_extraction_cache, hash_pdf
 import sys
 from io import StringIO
 from contextlib import contextmanager
@@ -23,8 +32,36 @@ if TYPE_CHECKING:
 # Rebuild the model at module level
 _ResumeParsingTools.model_rebuild()
 
-def format_conversation(conversation: str) -> str:
+# Sections extracted for every resume. No section reads another's output, so
+# they can run in any order or concurrently.
+SECTIONS = [
+    ("Contact Info", create_contact_info_chain, extract_contact_info),
+    ("Objective", create_objective_chain, extract_objective),
+    ("Skills", create_skills_chain, extract_skills),
+    ("Education", create_education_chain, extract_education),
+    ("Experience", create_experience_chain, extract_experience),
+    ("Projects", create_projects_chain, extract_projects)
+]
+
+# Async counterparts of the extract functions in SECTIONS, used by `astream_resume_wizard`
+ASYNC_EXTRACTORS = {
+    "Contact Info": aextract_contact_info,
+    "Objective": aextract_objective,
+    "Skills": aextract_skills,
+    "Education": aextract_education,
+    "Experience": aextract_experience,
+    "Projects": aextract_projects
+}
+
+# How many sections run at once when the caller doesn't say. Every section by
+# default, so the API and the vector DB ingest overlap their model calls; set
+# to 1 for the original one-after-another behaviour.
+DEFAULT_SECTION_CONCURRENCY = int(os.getenv("RESUME_WIZARD_SECTION_CONCURRENCY", str(len(SECTIONS))))
+
+def format_conversation(conversation: Optional[str]) -> str:
     """Format the conversation to be more readable."""
+    if not conversation:
+        return ""
     lines = conversation.split('\n')
     formatted_lines = []
     for line in lines:
@@ -43,26 +80,127 @@ def format_conversation(conversation: str) -> str:
 
 @contextmanager
 def capture_output():
-    """Capture stdout and stderr"""
-    new_out, new_err = StringIO(), StringIO()
-    old_out, old_err = sys.stdout, sys.stderr
-    try:
-        sys.stdout, sys.stderr = new_out, new_err
-        yield sys.stdout, sys.stderr
-    finally:
-        sys.stdout, sys.stderr = old_out, old_err
+    """Capture stdout and stderr written by the calling thread"""
+    _install_output_routers()
+    with _stdout_router.capture() as out, _stderr_router.capture() as err:
+        yield out, err
+
+class _ThreadOutputRouter:
+    """Stand-in for sys.stdout/sys.stderr that sends each thread's writes to its own buffer.
+    
+    Installed once for the whole process (see `_install_output_routers`) and
+    never swapped back, so concurrent wizards capturing on different threads,
+    or across generator yields, can't restore each other's streams. Threads
+    that aren't capturing write to the original stream, which also answers
+    everything else a stream is asked (``fileno``, ``isatty``, ``encoding``...).
+    """
+
+    def __init__(self, fallback: TextIO):
+        self.fallback = fallback
+        # Captures open on each thread, innermost last
+        self._buffers: Dict[int, List[StringIO]] = {}
+
+    @contextmanager
+    def capture(self) -> Generator[StringIO, None, None]:
+        buffer = StringIO()
+        stack = self._buffers.setdefault(threading.get_ident(), [])
+        stack.append(buffer)
+        try:
+            yield buffer
+        finally:
+            stack.remove(buffer)
+            if not stack:
+                self._buffers.pop(threading.get_ident(), None)
 
-def run_resume_wizard(resume_file_name: str, stream: bool = False) -> dict | Generator[str, None, None]:
+    def _target(self) -> TextIO:
+        stack = self._buffers.get(threading.get_ident())
+        return stack[-1] if stack else self.fallback
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def writelines(self, lines) -> None:
+        self._target().writelines(lines)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self.fallback, name)
+
+_stdout_router = _ThreadOutputRouter(sys.stdout)
+_stderr_router = _ThreadOutputRouter(sys.stderr)
+_routers_lock = threading.Lock()
+
+def _install_output_routers() -> None:
+    """Make the routers sys.stdout/sys.stderr, wrapping whatever streams are there now."""
+    with _routers_lock:
+        if sys.stdout is not _stdout_router:
+            _stdout_router.fallback = sys.stdout
+            sys.stdout = _stdout_router
+        if sys.stderr is not _stderr_router:
+            _stderr_router.fallback = sys.stderr
+            sys.stderr = _stderr_router
+
+def run_resume_wizard(
+    resume_file_name: str,
+    stream: bool = False,
+    *,
+    use_cache: bool = True,
+    concurrency: int | None = None,
+    engine: str = "sections"
+) -> dict | Generator[str, None, None]:
     """Run the resume wizard on a PDF file.
     
     Args:
         resume_file_name: Name of the PDF file to process
         stream: If True, yield status updates as they happen
+        use_cache: If True, reuse a cached extraction of an identical PDF and
+            cache fresh extractions
+        concurrency: Maximum number of sections to extract at once. Values
+            above 1 run the section chains on a thread pool and stream each
+            section's output as it completes. Defaults to
+            ``DEFAULT_SECTION_CONCURRENCY``.
+        engine: ``"sections"`` runs one chain per resume section.
+            ``"single_pass"`` binds every section's tools to one model and
+            extracts the whole resume from a single conversation, sending the
+            resume text once instead of six times. ``concurrency`` is ignored.
         
     Returns:
         If stream=False: The processed resume data as a dict
         If stream=True: A generator yielding status updates
     """
+    if engine not in EXTRACTION_ENGINES:
+        raise ValueError(f"Unknown extraction engine: {engine}")
+    if concurrency is None:
+        concurrency = DEFAULT_SECTION_CONCURRENCY
+    updates = _stream_resume_wizard(resume_file_name, use_cache, concurrency, engine)
+    if stream:
+        return updates
+
+    while True:
+        try:
+            print(next(updates))
+        except StopIteration as done:
+            return done.value
+
+def _stream_resume_wizard(
+    resume_file_name: str,
+    use_cache: bool,
+    concurrency: int,
+    engine: str
+) -> Generator[str, None, dict]:
+    """Yield the wizard's status updates and return the resume data."""
+    cache = get_extraction_cache() if use_cache else None
+    if cache is not None:
+        pdf_sha256 = hash_pdf(get_absolute_path_to_resume(resume_file_name))
+        cached = cache.get(pdf_sha256, engine)
+        if cached is not None:
+            yield "\n♻️ Using cached extraction for this resume\n"
+            yield "\n✨ Final Resume Data:\n"
+            yield json.dumps(cached, indent=2)
+            return cached
+
     document: Document = parse_single_pdf(resume_file_name)[0]
     load_dotenv()
 
@@ -70,60 +208,285 @@ def run_resume_wizard(resume_file_name: str, stream: bool = False) -> dict | Gen
     helper = _ResumeParserHelper()
     tools = _ResumeParsingTools(parser_helper=helper)
 
-    sections = [
-        ("Contact Info", create_contact_info_chain, extract_contact_info),
-        ("Objective", create_objective_chain, extract_objective),
-        ("Skills", create_skills_chain, extract_skills),
-        ("Education", create_education_chain, extract_education),
-        ("Experience", create_experience_chain, extract_experience),
-        ("Projects", create_projects_chain, extract_projects)
-    ]
-
-    for section_name, create_chain, extract_func in sections:
-        status = f"\n{'='*20} Processing {section_name} {'='*20}\n"
-        if stream:
-            yield status
-        else:
-            print(status)
+    if engine == "single_pass":
+        yield f"\n{'='*20} Processing All Sections (single pass) {'='*20}\n"
 
-        # Capture all output during chain creation and execution
         with capture_output() as (out, err):
-            chain = create_chain(os.getenv("ANTHROPIC_API_KEY"), tools)
-            conversation = extract_func(chain, document.page_content, tools)
-            
-            # Get any output that was captured
+            chain = create_consolidated_chain(os.getenv("ANTHROPIC_API_KEY"), tools)
+            conversation = extract_all_sections(chain, document.page_content, tools, on_event=print_tool_event)
             stdout = out.getvalue()
             stderr = err.getvalue()
-            
-            if stream and (stdout or stderr):
+
+        if stdout:
+            yield stdout
+        if stderr:
+            yield stderr
+
+        yield format_conversation(conversation) + "\n"
+    elif concurrency > 1:
+        yield from _run_sections_concurrently(document.page_content, helper, concurrency)
+    else:
+        for section_name, create_chain, extract_func in SECTIONS:
+            yield f"\n{'='*20} Processing {section_name} {'='*20}\n"
+
+            # Capture all output during chain creation and execution
+            with capture_output() as (out, err):
+                chain = create_chain(os.getenv("ANTHROPIC_API_KEY"), tools)
+                conversation = extract_func(chain, document.page_content, tools, on_event=print_tool_event)
+                
+                # Get any output that was captured
+                stdout = out.getvalue()
+                stderr = err.getvalue()
+                
+            if stdout:
                 yield stdout
-                if stderr:
-                    yield stderr
+            if stderr:
+                yield stderr
 
-        formatted = format_conversation(conversation)
-        if stream:
-            yield formatted + "\n"
-        else:
-            print(formatted)
+            yield format_conversation(conversation) + "\n"
 
     # Build the final resume schema
     with capture_output() as (out, err):
-        resume_data = tools.build_resume()
+        resume_data = tools.build_resume().model_dump()
         stdout = out.getvalue()
         stderr = err.getvalue()
         
-        if stream and (stdout or stderr):
-            yield stdout
-            if stderr:
-                yield stderr
+    if stdout:
+        yield stdout
+    if stderr:
+        yield stderr
 
-    final_status = "\n✨ Final Resume Data:\n"
-    if stream:
-        yield final_status
-        yield json.dumps(resume_data.model_dump(), indent=2)
+    if cache is not None:
+        cache.put(pdf_sha256, resume_data, engine)
+
+    yield "\n✨ Final Resume Data:\n"
+    yield json.dumps(resume_data, indent=2)
+    return resume_data
+
+
+def _extract_section_isolated(
+    create_chain,
+    extract_func,
+    resume_text: str
+) -> tuple[_ResumeParserHelper, str, str, str, float]:
+    """Run one section chain against its own helper so concurrent sections never share state."""
+    started = time.perf_counter()
+    section_helper = _ResumeParserHelper()
+    section_tools = _ResumeParsingTools(parser_helper=section_helper)
+    with capture_output() as (out, err):
+        chain = create_chain(os.getenv("ANTHROPIC_API_KEY"), section_tools)
+        conversation = extract_func(chain, resume_text, section_tools, on_event=print_tool_event)
+    return section_helper, conversation, out.getvalue(), err.getvalue(), time.perf_counter() - started
+
+def _run_sections_concurrently(
+    resume_text: str,
+    helper: _ResumeParserHelper,
+    concurrency: int
+) -> Generator[str, None, None]:
+    """Extract every section on a thread pool, yielding output as each one finishes.
+    
+    Section results are merged into ``helper`` in ``SECTIONS`` order once all
+    have finished, so the final data doesn't depend on completion order.
+    """
+    section_names = ", ".join(name for name, _, _ in SECTIONS)
+    yield f"\n{'='*20} Processing {section_names} (up to {concurrency} at once) {'='*20}\n"
+
+    section_helpers: Dict[str, _ResumeParserHelper] = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {
+            # Run each section in a copy of this context so callbacks and
+            # tracing configured by the caller still see its model calls
+            pool.submit(
+                contextvars.copy_context().run,
+                _extract_section_isolated,
+                create_chain,
+                extract_func,
+                resume_text
+            ): section_name
+            for section_name, create_chain, extract_func in SECTIONS
+        }
+        try:
+            for future in as_completed(futures):
+                section_name = futures[future]
+                section_helper, conversation, stdout, stderr, elapsed = future.result()
+                section_helpers[section_name] = section_helper
+
+                yield f"\n{'='*20} Finished {section_name} ({elapsed:.1f}s) {'='*20}\n"
+                if stdout:
+                    yield stdout
+                if stderr:
+                    yield stderr
+                yield format_conversation(conversation) + "\n"
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    for section_name, _, _ in SECTIONS:
+        helper.merge(section_helpers[section_name])
+
+
+async def astream_resume_wizard(
+    resume_file_name: str,
+    *,
+    use_cache: bool = True,
+    concurrency: int | None = None,
+    engine: str = "sections"
+) -> AsyncGenerator[str, None]:
+    """Async version of ``run_resume_wizard(..., stream=True)``.
+    
+    Model calls are awaited and file, PDF and cache work runs in a worker
+    thread, so the event loop stays free to serve other requests while a
+    resume is processed. Tool-loop events are collected per section and
+    yielded when the section finishes; stdout is never swapped.
+    
+    Args:
+        resume_file_name: Name of the PDF file to process
+        use_cache: If True, reuse a cached extraction of an identical PDF and
+            cache fresh extractions
+        concurrency: Maximum number of sections awaited at once. Defaults to
+            ``DEFAULT_SECTION_CONCURRENCY``.
+        engine: ``"sections"`` or ``"single_pass"``, as for `run_resume_wizard`
+        
+    Yields:
+        str: Status updates, ending with the resume data as a JSON string
+    """
+    if engine not in EXTRACTION_ENGINES:
+        raise ValueError(f"Unknown extraction engine: {engine}")
+    if concurrency is None:
+        concurrency = DEFAULT_SECTION_CONCURRENCY
+    async for update in _astream_resume_wizard(resume_file_name, use_cache, concurrency, engine, {}):
+        yield update
+
+async def arun_resume_wizard(
+    resume_file_name: str,
+    *,
+    use_cache: bool = True,
+    concurrency: int | None = None,
+    engine: str = "sections"
+) -> dict:
+    """Async version of ``run_resume_wizard(..., stream=False)``.
+    
+    Returns:
+        dict: The processed resume data
+    """
+    if engine not in EXTRACTION_ENGINES:
+        raise ValueError(f"Unknown extraction engine: {engine}")
+    if concurrency is None:
+        concurrency = DEFAULT_SECTION_CONCURRENCY
+    result: Dict[str, Any] = {}
+    async for _ in _astream_resume_wizard(resume_file_name, use_cache, concurrency, engine, result):
+        pass
+    return result["resume_data"]
+
+async def _astream_resume_wizard(
+    resume_file_name: str,
+    use_cache: bool,
+    concurrency: int,
+    engine: str,
+    result: Dict[str, Any]
+) -> AsyncGenerator[str, None]:
+    """Yield the wizard's status updates, storing the resume data in ``result["resume_data"]``."""
+    # Opening the cache creates the SQLite file and purges stale entries, so
+    # like its lookups and writes it stays off the event loop
+    cache = await asyncio.to_thread(get_extraction_cache) if use_cache else None
+    if cache is not None:
+        pdf_sha256 = await asyncio.to_thread(hash_pdf, get_absolute_path_to_resume(resume_file_name))
+        cached = await asyncio.to_thread(cache.get, pdf_sha256, engine)
+        if cached is not None:
+            result["resume_data"] = cached
+            yield "\n♻️ Using cached extraction for this resume\n"
+            yield "\n✨ Final Resume Data:\n"
+            yield json.dumps(cached, indent=2)
+            return
+
+    document: Document = (await asyncio.to_thread(parse_single_pdf, resume_file_name))[0]
+    load_dotenv()
+
+    helper = _ResumeParserHelper()
+    tools = _ResumeParsingTools(parser_helper=helper)
+
+    if engine == "single_pass":
+        yield f"\n{'='*20} Processing All Sections (single pass) {'='*20}\n"
+        events = []
+        chain = create_consolidated_chain(os.getenv("ANTHROPIC_API_KEY"), tools)
+        conversation = await aextract_all_sections(
+            chain,
+            document.page_content,
+            tools,
+            on_event=lambda event, data: events.append(format_tool_event(event, data))
+        )
+        if events:
+            yield "\n".join(events) + "\n"
+        yield format_conversation(conversation) + "\n"
     else:
-        print(final_status)
-        print(json.dumps(resume_data.model_dump(), indent=2))
+        async for update in _arun_sections(document.page_content, helper, concurrency):
+            yield update
+
+    resume_data = tools.build_resume().model_dump()
+    if cache is not None:
+        await asyncio.to_thread(cache.put, pdf_sha256, resume_data, engine)
+
+    result["resume_data"] = resume_data
+    yield "\n✨ Final Resume Data:\n"
+    yield json.dumps(resume_data, indent=2)
+
+async def _aextract_section_isolated(
+    section_name: str,
+    create_chain,
+    resume_text: str,
+    semaphore: asyncio.Semaphore
+) -> tuple[str, _ResumeParserHelper, str, str, float]:
+    """Await one section chain against its own helper once a semaphore slot is free."""
+    async with semaphore:
+        started = time.perf_counter()
+        section_helper = _ResumeParserHelper()
+        section_tools = _ResumeParsingTools(parser_helper=section_helper)
+        events = []
+        chain = create_chain(os.getenv("ANTHROPIC_API_KEY"), section_tools)
+        conversation = await ASYNC_EXTRACTORS[section_name](
+            chain,
+            resume_text,
+            section_tools,
+            on_event=lambda event, data: events.append(format_tool_event(event, data))
+        )
+    output = "\n".join(events) + "\n" if events else ""
+    return section_name, section_helper, conversation, output, time.perf_counter() - started
+
+async def _arun_sections(
+    resume_text: str,
+    helper: _ResumeParserHelper,
+    concurrency: int
+) -> AsyncGenerator[str, None]:
+    """Await every section, at most ``concurrency`` at a time, yielding output as each one finishes.
+    
+    As in `_run_sections_concurrently`, results are merged into ``helper`` in
+    ``SECTIONS`` order so the final data doesn't depend on completion order.
+    """
+    section_names = ", ".join(name for name, _, _ in SECTIONS)
+    yield f"\n{'='*20} Processing {section_names} (up to {concurrency} at once) {'='*20}\n"
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    tasks = [
+        asyncio.create_task(
+            _aextract_section_isolated(section_name, create_chain, resume_text, semaphore)
+        )
+        for section_name, create_chain, _ in SECTIONS
+    ]
+    section_helpers: Dict[str, _ResumeParserHelper] = {}
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            section_name, section_helper, conversation, output, elapsed = await next_done
+            section_helpers[section_name] = section_helper
+
+            yield f"\n{'='*20} Finished {section_name} ({elapsed:.1f}s) {'='*20}\n"
+            if output:
+                yield output
+            yield format_conversation(conversation) + "\n"
+    finally:
+        # Stop outstanding sections if the consumer goes away or one fails
+        for task in tasks:
+            task.cancel()
 
-    if not stream:
-        return resume_data.model_dump()
\ No newline at end of file
+    for section_name, _, _ in SECTIONS:
+        helper.merge(section_helpers[section_name])